@@ -0,0 +1,385 @@
+"""
+Global many-to-many assignment of bench employees across open requirements.
+
+Running /search per requirement ranks every requirement independently, so the
+same strong employee can top several shortlists. This module scores every
+requirement against the whole active bench with the same fit formula used by
+search_employees (skills, experience, certifications, availability weights),
+keeps only the top-k candidates per requirement, and solves one global
+assignment that maximizes the total fit score.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_ingestion import (
+    AVAILABILITY_SCORES,
+    FIT_WEIGHTS,
+    load_search_tables,
+)
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy is optional - fall back to the numpy solver below
+    linear_sum_assignment = None
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+DEFAULT_TOP_K = 25  # Candidates kept per requirement after pruning
+DEFAULT_MIN_SCORE = 0  # Edges below this overall fit are never assigned
+
+_SEPARATOR = "\x1f"  # Joins skill/cert names so substring checks stay per-item
+_MISSING_EDGE = 1e6  # Cost of a pruned (requirement, employee) pair
+
+
+# ---------------------------
+# CANDIDATE POOL
+# ---------------------------
+def build_candidate_pool(employees, skills, certs, bench_df):
+    """
+    Build one row per active bench employee with pre-joined lowercase
+    skill and certification blobs, so each requirement can be scored with
+    vectorized string checks instead of per-employee DataFrame filters.
+    """
+    statuses = bench_df["status"]
+    if statuses.index.has_duplicates:
+        statuses = statuses[~statuses.index.duplicated(keep="first")]
+    active_ids = statuses.index[statuses == "active"]
+
+    pool = employees[employees["employee_id"].isin(active_ids)][
+        ["employee_id", "name", "experience_years"]
+    ].drop_duplicates("employee_id")
+
+    skill_blob = (
+        skills.assign(_name=skills["skill_name"].astype(str).str.lower())
+        .groupby("employee_id")["_name"]
+        .agg(_SEPARATOR.join)
+    )
+    cert_names = certs.assign(_name=certs["certificate_name"].astype(str).str.lower())
+    cert_blob = cert_names.groupby("employee_id")["_name"].agg(_SEPARATOR.join)
+    cert_count = cert_names.groupby("employee_id").size()
+
+    pool = pool.set_index("employee_id")
+    pool["skill_blob"] = skill_blob.reindex(pool.index).fillna("")
+    pool["cert_blob"] = cert_blob.reindex(pool.index).fillna("")
+    pool["cert_count"] = cert_count.reindex(pool.index).fillna(0).astype(int)
+    pool["experience_years"] = pd.to_numeric(
+        pool["experience_years"], errors="coerce"
+    ).fillna(0.0)
+
+    # Reverse lookup for "employee cert is a substring of the required cert"
+    holders = cert_names.groupby("_name")["employee_id"].apply(set).to_dict()
+
+    logger.info(f"Candidate pool: {len(pool)} active bench employees")
+    return pool.reset_index(), holders
+
+
+# ---------------------------
+# SCORE MATRIX
+# ---------------------------
+class _MatchCache:
+    """Memoizes per-token boolean vectors shared across requirements."""
+
+    def __init__(self, pool, cert_holders):
+        self.pool = pool
+        self.cert_holders = cert_holders
+        self.employee_ids = pool["employee_id"].to_numpy()
+        self._skills = {}
+        self._certs = {}
+
+    def skill(self, token):
+        if token not in self._skills:
+            self._skills[token] = (
+                self.pool["skill_blob"].str.contains(token, regex=False).to_numpy()
+            )
+        return self._skills[token]
+
+    def cert(self, token):
+        # Same rule as calculate_cert_matches: req in emp_cert or emp_cert in req
+        if token not in self._certs:
+            met = self.pool["cert_blob"].str.contains(token, regex=False).to_numpy()
+            holders = set()
+            for name, ids in self.cert_holders.items():
+                if name in token:
+                    holders |= ids
+            if holders:
+                met = met | np.isin(self.employee_ids, list(holders))
+            self._certs[token] = met
+        return self._certs[token]
+
+
+def score_requirement(requirement, cache):
+    """
+    Overall fit score (0-100) of every pool employee for one requirement,
+    using the same breakdown and weights as search_employees.
+    """
+    pool = cache.pool
+    n = len(pool)
+
+    skills = [s.lower().strip() for s in requirement.get("required_skills") or [] if s]
+    if skills:
+        matched = np.zeros(n, dtype=np.int32)
+        for skill in skills:
+            matched += cache.skill(skill)
+        skills_pct = np.floor(matched / len(skills) * 100)
+    else:
+        skills_pct = np.zeros(n)
+
+    required_exp = float(requirement.get("min_experience") or 0)
+    if required_exp > 0:
+        exp_pct = np.minimum(pool["experience_years"].to_numpy() / required_exp * 100, 100)
+    else:
+        exp_pct = np.full(n, 80.0)
+
+    certs = [c.lower().strip() for c in requirement.get("required_certs") or [] if c]
+    if certs:
+        met = np.zeros(n, dtype=np.int32)
+        for cert in certs:
+            met += cache.cert(cert)
+        certs_pct = np.floor(met / len(certs) * 100)
+    else:
+        certs_pct = np.minimum(pool["cert_count"].to_numpy() * 15, 60)
+
+    avail_pct = AVAILABILITY_SCORES["active"]
+
+    return np.floor(
+        skills_pct * FIT_WEIGHTS["skills"]
+        + exp_pct * FIT_WEIGHTS["experience"]
+        + certs_pct * FIT_WEIGHTS["certifications"]
+        + avail_pct * FIT_WEIGHTS["availability"]
+    )
+
+
+def build_sparse_scores(requirements, pool, cert_holders, top_k=DEFAULT_TOP_K, min_score=DEFAULT_MIN_SCORE):
+    """
+    Score every requirement against the pool and keep the top-k employees
+    per requirement.
+
+    Returns:
+        List of (requirement_index, pool_index, score) edges
+    """
+    cache = _MatchCache(pool, cert_holders)
+    edges = []
+    n = len(pool)
+    if n == 0:
+        return edges
+
+    k = min(top_k, n)
+    for r_idx, requirement in enumerate(requirements):
+        scores = score_requirement(requirement, cache)
+        top = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+        for e_idx in top:
+            score = float(scores[e_idx])
+            if score > 0 and score >= min_score:
+                edges.append((r_idx, int(e_idx), score))
+    return edges
+
+
+# ---------------------------
+# SOLVERS
+# ---------------------------
+def _solve_dense(cost):
+    """
+    Min-cost rectangular assignment (rows <= cols) via shortest augmenting
+    paths, vectorized over columns. Same algorithm as scipy's
+    linear_sum_assignment, used when scipy isn't installed.
+    """
+    n_rows, n_cols = cost.shape
+    u = np.zeros(n_rows)
+    v = np.zeros(n_cols)
+    col4row = np.full(n_rows, -1, dtype=np.int64)
+    row4col = np.full(n_cols, -1, dtype=np.int64)
+
+    for cur_row in range(n_rows):
+        shortest = np.full(n_cols, np.inf)
+        path = np.full(n_cols, -1, dtype=np.int64)
+        remaining = np.ones(n_cols, dtype=bool)
+        visited_rows = np.zeros(n_rows, dtype=bool)
+        min_val = 0.0
+        i = cur_row
+        sink = -1
+
+        while sink == -1:
+            visited_rows[i] = True
+            reduced = min_val + cost[i] - u[i] - v
+            improve = remaining & (reduced < shortest)
+            path[improve] = i
+            shortest[improve] = reduced[improve]
+
+            candidates = np.where(remaining, shortest, np.inf)
+            lowest = candidates.min()
+            if not np.isfinite(lowest):
+                raise ValueError("Assignment problem is infeasible")
+            # Prefer a free column on ties so the path terminates early
+            ties = np.flatnonzero((candidates == lowest) & (row4col == -1))
+            j = int(ties[0]) if len(ties) else int(candidates.argmin())
+
+            min_val = lowest
+            remaining[j] = False
+            if row4col[j] == -1:
+                sink = j
+            else:
+                i = int(row4col[j])
+
+        # Update dual variables
+        u[cur_row] += min_val
+        others = np.flatnonzero(visited_rows)
+        others = others[others != cur_row]
+        u[others] += min_val - shortest[col4row[others]]
+        scanned = ~remaining
+        v[scanned] -= min_val - shortest[scanned]
+
+        # Augment along the path back to cur_row
+        j = sink
+        while True:
+            i = int(path[j])
+            row4col[j] = i
+            col4row[i], j = j, col4row[i]
+            if i == cur_row:
+                break
+
+    return np.arange(n_rows), col4row
+
+
+def _solve_component(slots, columns, edge_scores):
+    """
+    Solve one connected component. Each requirement slot gets its own
+    zero-cost dummy column, so leaving a slot unfilled is always allowed
+    and pruned pairs are never chosen.
+    """
+    col_index = {c: i for i, c in enumerate(columns)}
+    n_rows = len(slots)
+    cost = np.full((n_rows, len(columns) + n_rows), _MISSING_EDGE)
+    cost[np.arange(n_rows), len(columns) + np.arange(n_rows)] = 0.0
+
+    for row, r_idx in enumerate(slots):
+        for e_idx, score in edge_scores[r_idx].items():
+            cost[row, col_index[e_idx]] = -score / 100.0
+
+    solver = linear_sum_assignment or _solve_dense
+    rows, cols = solver(cost)
+
+    pairs = []
+    for row, col in zip(rows, cols):
+        if col < len(columns):
+            r_idx = slots[row]
+            e_idx = columns[col]
+            pairs.append((r_idx, e_idx, edge_scores[r_idx][e_idx]))
+    return pairs
+
+
+def _components(n_requirements, edges):
+    """Group requirements that share candidates (union-find on edges)."""
+    parent = list(range(n_requirements))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    owner = {}
+    for r_idx, e_idx, _ in edges:
+        if e_idx in owner:
+            a, b = find(r_idx), find(owner[e_idx])
+            if a != b:
+                parent[a] = b
+        else:
+            owner[e_idx] = r_idx
+
+    groups = {}
+    for r_idx in range(n_requirements):
+        groups.setdefault(find(r_idx), []).append(r_idx)
+    return list(groups.values())
+
+
+def solve_assignment(n_requirements, edges, capacities=None):
+    """
+    Maximize total fit score subject to each employee being assigned at most
+    once and each requirement receiving at most `capacities[r]` employees.
+
+    Returns:
+        List of (requirement_index, pool_index, score) assignments
+    """
+    capacities = capacities or [1] * n_requirements
+    edge_scores = [dict() for _ in range(n_requirements)]
+    for r_idx, e_idx, score in edges:
+        edge_scores[r_idx][e_idx] = score
+
+    assignments = []
+    for group in _components(n_requirements, edges):
+        columns = sorted({e for r in group for e in edge_scores[r]})
+        if not columns:
+            continue
+        slots = [r for r in group for _ in range(max(int(capacities[r]), 0))]
+        if slots:
+            assignments.extend(_solve_component(slots, columns, edge_scores))
+    return assignments
+
+
+# ---------------------------
+# PUBLIC ENTRY POINT
+# ---------------------------
+def assign_requirements(
+    requirements: List[Dict],
+    top_k: int = DEFAULT_TOP_K,
+    min_score: float = DEFAULT_MIN_SCORE,
+    capacities: Optional[Dict[str, int]] = None,
+):
+    """
+    Globally assign active bench employees to open requirements.
+
+    Args:
+        requirements: Dicts with requirement_id, required_skills,
+            required_certs and min_experience
+        top_k: Candidates kept per requirement before solving
+        min_score: Minimum overall fit score for an assignment
+        capacities: Optional headcount per requirement_id (default 1)
+
+    Returns:
+        Dict with assignments and unfilled requirement IDs
+    """
+    capacities = capacities or {}
+    bench_df, employees, skills, certs, _ = load_search_tables()
+    pool, cert_holders = build_candidate_pool(employees, skills, certs, bench_df)
+
+    edges = build_sparse_scores(requirements, pool, cert_holders, top_k, min_score)
+    slot_counts = [int(capacities.get(r["requirement_id"], 1)) for r in requirements]
+    solved = solve_assignment(len(requirements), edges, slot_counts)
+
+    assignments = []
+    filled = {}
+    for r_idx, e_idx, score in sorted(solved, key=lambda x: (x[0], -x[2])):
+        requirement_id = requirements[r_idx]["requirement_id"]
+        employee = pool.iloc[e_idx]
+        filled[requirement_id] = filled.get(requirement_id, 0) + 1
+        assignments.append(
+            {
+                "requirement_id": requirement_id,
+                "employee_id": str(employee["employee_id"]),
+                "name": str(employee["name"]),
+                "overall_fit_score": int(score),
+            }
+        )
+
+    unfilled = [
+        r["requirement_id"]
+        for r, slots in zip(requirements, slot_counts)
+        if filled.get(r["requirement_id"], 0) < slots
+    ]
+
+    logger.info(
+        f"✓ Assigned {len(assignments)} employees across {len(requirements)} requirements "
+        f"({len(edges)} candidate edges, {len(unfilled)} unfilled)"
+    )
+    return {
+        "assignments": assignments,
+        "unfilled_requirements": unfilled,
+        "total_fit_score": int(sum(a["overall_fit_score"] for a in assignments)),
+    }
@@ -0,0 +1,238 @@
+"""
+Live in-memory bench-status index for the search path.
+
+Search used to read bench_status.csv, so an employee allocated through
+PUT /candidate/{id}/select kept appearing in shortlists until the file was
+re-exported. This index holds employee_id -> status in a dict (O(1) per
+candidate), seeded from bench.bench_status and kept current two ways:
+
+- the select endpoint applies its own change directly after committing;
+- a background thread polls `WHERE last_updated >= :watermark - overlap`
+  every BENCHMATCH_BENCH_POLL_INTERVAL seconds, picking up changes made by
+  other workers or outside the API (see
+  migrations/002_bench_status_last_updated.sql). Rows in the
+  BENCHMATCH_BENCH_POLL_OVERLAP window are re-read on every poll, so a row
+  committed late with an earlier timestamp (or one in the same clock tick)
+  is not skipped; re-reading an unchanged row is a no-op.
+
+If the database can't be reached the index is seeded from the CSV/snapshot
+bench table and re-seeded from SQL once it comes back.
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import text
+
+from db import get_engine
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+POLL_INTERVAL = float(os.getenv("BENCHMATCH_BENCH_POLL_INTERVAL", "5"))
+# Seconds before the watermark re-read by every poll (late commits, clock ticks)
+POLL_OVERLAP = float(os.getenv("BENCHMATCH_BENCH_POLL_OVERLAP", "30"))
+# "sql" seeds and polls bench.bench_status; "csv" keeps the file-based behaviour
+BENCH_SOURCE = os.getenv("BENCHMATCH_BENCH_SOURCE", "sql")
+
+SELECT_ALL = """
+    SELECT employee_id, status, last_updated
+    FROM bench.bench_status
+"""
+SELECT_CHANGED = """
+    SELECT employee_id, status, last_updated
+    FROM bench.bench_status
+    WHERE last_updated >= :since
+    ORDER BY last_updated
+"""
+
+
+def _poll_since(watermark, overlap=POLL_OVERLAP):
+    """The watermark moved back by `overlap` seconds, in the watermark's own type."""
+    if isinstance(watermark, str):
+        # SQLite stand-in: timestamps are 'YYYY-MM-DD HH:MM:SS.fff' text
+        since = datetime.fromisoformat(watermark) - timedelta(seconds=overlap)
+        return since.isoformat(sep=" ", timespec="milliseconds")
+    return watermark - timedelta(seconds=overlap)
+
+
+class BenchStatusIndex:
+    """Thread-safe employee_id -> bench status map with a change watermark."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._status = {}
+        self._frame = None
+        self.source = None
+        self.watermark = None
+        # Bumped on every change; lets callers cache derived structures
+        self.generation = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------------------------
+    # READS
+    # ---------------------------
+    def status(self, employee_id):
+        """Bench status of an employee, or None if not on the bench table."""
+        return self._status.get(employee_id)
+
+    def __contains__(self, employee_id):
+        return employee_id in self._status
+
+    def __len__(self):
+        return len(self._status)
+
+    def counts(self):
+        """Employees per status (for logging)."""
+        with self._lock:
+            return pd.Series(list(self._status.values()), dtype=object).value_counts().to_dict()
+
+    def as_frame(self):
+        """Statuses as a DataFrame indexed by employee_id (cached per generation)."""
+        with self._lock:
+            if self._frame is None:
+                self._frame = pd.DataFrame(
+                    {"status": list(self._status.values())},
+                    index=pd.Index(list(self._status.keys()), name="employee_id"),
+                )
+            return self._frame
+
+    def version(self):
+        """Changes whenever a status changes; part of the search data version."""
+        return f"{self.source}:{self.generation}:{self.watermark}:{len(self._status)}"
+
+    # ---------------------------
+    # UPDATES
+    # ---------------------------
+    def _replace(self, statuses, source, watermark):
+        with self._lock:
+            changed = statuses != self._status or source != self.source
+            self._status = statuses
+            self.source = source
+            self.watermark = watermark
+            if changed:
+                self._frame = None
+                self.generation += 1
+
+    def apply(self, employee_id, status, updated_at=None):
+        """
+        Apply one status change (from the select endpoint or a poll).
+        Returns True if the status changed.
+        """
+        with self._lock:
+            changed = self._status.get(employee_id) != status
+            if changed:
+                # Copy-on-write so concurrent readers never see a dict mid-resize
+                statuses = dict(self._status)
+                statuses[employee_id] = status
+                self._status = statuses
+                self._frame = None
+                self.generation += 1
+            if updated_at is not None and (self.watermark is None or updated_at > self.watermark):
+                self.watermark = updated_at
+            return changed
+
+    def load_from_csv(self):
+        from data_ingestion import load_search_tables
+
+        bench_df = load_search_tables(live_bench=False)[0]
+        statuses = bench_df["status"]
+        # First row wins for duplicated employee_ids, as in the CSV lookup
+        statuses = statuses[~statuses.index.duplicated(keep="first")]
+        self._replace(dict(zip(statuses.index, statuses)), "csv", None)
+        logger.info(f"🔹 Bench-status index seeded from CSV ({len(self)} employees)")
+
+    def load_from_sql(self):
+        with get_engine().connect() as conn:
+            rows = conn.execute(text(SELECT_ALL)).fetchall()
+        statuses = {}
+        watermark = None
+        for employee_id, status, updated_at in rows:
+            statuses.setdefault(employee_id, status)
+            if updated_at is not None and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+        self._replace(statuses, "sql", watermark)
+        logger.info(f"🔹 Bench-status index seeded from bench.bench_status ({len(self)} employees)")
+
+    def ensure_loaded(self):
+        if self.source is not None:
+            return
+        with _load_lock:
+            if self.source is not None:
+                return
+            if BENCH_SOURCE == "sql":
+                try:
+                    self.load_from_sql()
+                    return
+                except Exception as e:
+                    logger.warning(f"Bench-status index falling back to CSV: {e}")
+            self.load_from_csv()
+
+    def poll(self):
+        """
+        Apply rows changed since the watermark (minus the overlap window).
+        Returns the number of statuses that changed. A CSV-seeded index is
+        re-seeded from SQL instead.
+        """
+        if BENCH_SOURCE != "sql":
+            return 0
+        if self.source != "sql":
+            self.load_from_sql()
+            return len(self)
+        if self.watermark is None:
+            # Nothing timestamped yet; re-read the (small) table
+            self.load_from_sql()
+            return 0
+        with get_engine().connect() as conn:
+            rows = conn.execute(text(SELECT_CHANGED), {"since": _poll_since(self.watermark)}).fetchall()
+        # First row wins for duplicated employee_ids, as when seeding, so
+        # re-reading them every poll doesn't flip the status back and forth
+        latest = {}
+        for employee_id, status, updated_at in rows:
+            first = latest.setdefault(employee_id, [status, updated_at])
+            first[1] = max(first[1], updated_at)
+        # Rows re-read from the overlap window are usually unchanged no-ops
+        changed = sum(self.apply(employee_id, status, updated_at) for employee_id, (status, updated_at) in latest.items())
+        if changed:
+            logger.info(f"🔄 Bench-status index applied {changed} changes")
+        return changed
+
+    # ---------------------------
+    # BACKGROUND POLLER
+    # ---------------------------
+    def _run(self):
+        while not self._stop.wait(POLL_INTERVAL):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning(f"Bench-status poll failed: {e}")
+
+    def start(self):
+        if POLL_INTERVAL <= 0 or BENCH_SOURCE != "sql":
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bench-status-poll", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(5)
+
+
+_load_lock = threading.Lock()
+bench_index = BenchStatusIndex()
+
+
+def get_bench_index():
+    """The process-wide index, seeded on first use."""
+    bench_index.ensure_loaded()
+    return bench_index
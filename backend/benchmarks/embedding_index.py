@@ -0,0 +1,143 @@
+"""
+Memory / latency / recall benchmark for the compact vector index.
+
+Builds vector_index.QuantizedIndex variants (truncated dimension x storage
+dtype) over the employee vectors and reports, per variant, first-pass memory
+per employee, query latency (p50/p95) and recall@k against exact full-precision
+search. With --source chroma the vectors come from the live `employees`
+collection and its own HNSW query() results are scored the same way, so the
+variants can be compared with what /search uses today.
+
+--source synthetic generates clustered vectors whose variance decays with the
+dimension index (roughly how Matryoshka embeddings spread their signal); use it
+for relative comparisons only - recall on real embeddings is what matters.
+
+Usage:
+    python benchmarks/embedding_index.py [--source synthetic|chroma] [--count 20000]
+        [--dims 768,512,256,128] [--dtypes float32,float16,int8] [--k 35]
+        [--queries 200] [--rescore 4]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import vector_index  # noqa: E402
+
+
+def synthetic_vectors(count, dim=768, clusters=64, seed=0):
+    rng = np.random.default_rng(seed)
+    decay = 1.0 / np.sqrt(np.arange(1, dim + 1))
+    centers = rng.standard_normal((clusters, dim)) * decay
+    labels = rng.integers(0, clusters, count)
+    vectors = centers[labels] + 0.5 * rng.standard_normal((count, dim)) * decay
+    return [f"SYN_{i:06d}" for i in range(count)], vectors.astype(np.float32)
+
+
+def chroma_vectors():
+    from data_ingestion import get_collection
+
+    collection = get_collection()
+    data = collection.get(include=["embeddings"])
+    return data["ids"], np.asarray(data["embeddings"], dtype=np.float32), collection
+
+
+def make_queries(vectors, n, seed=1):
+    """Perturbed copies of stored vectors stand in for embedded requirements."""
+    rng = np.random.default_rng(seed)
+    picks = vectors[rng.integers(0, len(vectors), n)]
+    noise = rng.standard_normal(picks.shape).astype(np.float32) * picks.std(axis=0)
+    return picks + noise
+
+
+def recall(found, truth):
+    return len(set(found) & set(truth)) / max(len(truth), 1)
+
+
+def run_variant(ids, vectors, queries, truth, dim, dtype, k, rescore):
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "index"
+        vector_index.build_index(ids, vectors, directory=directory, dim=dim, dtype=dtype)
+        index = vector_index.QuantizedIndex(directory)
+
+        latencies, recalls = [], []
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            rows, _ = index.search(query, k, rescore_factor=rescore)
+            latencies.append(time.perf_counter() - start)
+            recalls.append(recall(rows.tolist(), expected))
+
+        return {
+            "variant": f"{dtype}/{index.dim}d",
+            "bytes_per_employee": index.bytes_per_vector(),
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p95_ms": float(np.percentile(latencies, 95)) * 1000,
+            "recall": statistics.mean(recalls),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--source", choices=["synthetic", "chroma"], default="synthetic")
+    parser.add_argument("--count", type=int, default=20000, help="Synthetic employees")
+    parser.add_argument("--dims", default="768,512,256,128")
+    parser.add_argument("--dtypes", default="float32,float16,int8")
+    parser.add_argument("--k", type=int, default=35, help="Retrieval window (search uses max(top_n*6, 35))")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--rescore", type=int, default=vector_index.RESCORE_FACTOR)
+    args = parser.parse_args()
+
+    collection = None
+    if args.source == "chroma":
+        ids, vectors, collection = chroma_vectors()
+    else:
+        ids, vectors = synthetic_vectors(args.count)
+    k = min(args.k, len(ids))
+    queries = make_queries(vectors, args.queries)
+
+    # Ground truth: exact cosine search over the full-precision vectors
+    full = vector_index._normalize(vectors)
+    truth = []
+    for query in queries:
+        sims = full @ vector_index._normalize(query)
+        truth.append(np.argpartition(-sims, k - 1)[:k].tolist())
+
+    print(f"{len(ids)} employees, {vectors.shape[1]}-d, {len(queries)} queries, recall@{k}")
+    print(f"{'variant':<16}{'bytes/emp':>10}{'p50 ms':>10}{'p95 ms':>10}{'recall':>9}")
+
+    if collection is not None:
+        latencies, recalls = [], []
+        position = {emp_id: row for row, emp_id in enumerate(ids)}
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            result = collection.query(query_embeddings=[query.tolist()], n_results=k, include=["distances"])
+            latencies.append(time.perf_counter() - start)
+            recalls.append(recall([position[i] for i in result["ids"][0]], expected))
+        print(
+            f"{'chroma hnsw':<16}{vectors.shape[1] * 4:>10}"
+            f"{statistics.median(latencies) * 1000:>10.2f}"
+            f"{float(np.percentile(latencies, 95)) * 1000:>10.2f}"
+            f"{statistics.mean(recalls):>9.3f}"
+        )
+
+    for dtype in args.dtypes.split(","):
+        for dim in (int(d) for d in args.dims.split(",")):
+            row = run_variant(ids, vectors, queries, truth, dim, dtype, k, args.rescore)
+            print(
+                f"{row['variant']:<16}{row['bytes_per_employee']:>10}"
+                f"{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['recall']:>9.3f}"
+            )
+    print(f"(full-precision rescoring vectors stay on disk: {vectors.shape[1] * 4} bytes/employee, "
+          f"only the first-pass shortlist of {args.rescore}x{k} rows is read per query)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Import-time benchmark for the API module.
+
+Imports `main` in fresh interpreters and fails if the median wall time exceeds
+the budget, or if a heavy client library (chromadb, nomic, llama_index) is
+imported eagerly. Run it from backend/ before merging startup changes.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--budget 2.0] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Must only be imported on first use, never by `import main`
+LAZY_MODULES = ["chromadb", "nomic", "llama_index"]
+
+CHECK_LAZY = (
+    "import sys, main; "
+    f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+)
+
+
+def time_import(env):
+    """Wall time of `import main` in a fresh interpreter."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def slowest_imports(env, top):
+    """Top modules by cumulative import time from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+        if match:
+            rows.append((int(match.group(2)), match.group(4)))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.0, help="Median seconds allowed")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    env = dict(os.environ, BENCHMATCH_WARMUP="off")
+
+    eager = subprocess.run(
+        [sys.executable, "-c", CHECK_LAZY],
+        cwd=BACKEND_DIR, env=env, check=True,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    ).stdout.strip().splitlines()[-1:]
+    eager = [m for m in (eager[0].split(",") if eager else []) if m]
+
+    timings = [time_import(env) for _ in range(args.runs)]
+    median = statistics.median(timings)
+
+    print(f"import main: median {median:.3f}s over {args.runs} runs "
+          f"(min {min(timings):.3f}s, max {max(timings):.3f}s, budget {args.budget:.3f}s)")
+    print("\nSlowest imports (cumulative):")
+    for micros, module in slowest_imports(env, args.top):
+        print(f"  {micros / 1000:8.1f} ms  {module}")
+
+    failed = False
+    if eager:
+        print(f"\n✗ Heavy modules imported eagerly: {', '.join(eager)}")
+        failed = True
+    if median > args.budget:
+        print(f"\n✗ Import time {median:.3f}s exceeds budget {args.budget:.3f}s")
+        failed = True
+    if not failed:
+        print("\n✓ Import time within budget")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
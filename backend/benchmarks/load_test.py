@@ -0,0 +1,352 @@
+"""
+Concurrent load test for the FastAPI service, offline by default.
+
+test_api.py calls each endpoint once against a live server and Azure SQL.
+This harness instead boots `main.app` in-process with local stand-ins:
+
+- bench.* tables in the SQLite stand-in (local_db.py), seeded from the sample
+  CSVs (--data) or from a synthetic dataset (--employees, see synthetic_data.py);
+- the deterministic fake embedder and fake Ollama (fake_providers.py), with
+  optional per-call latency (--embed-latency / --llm-latency);
+- the compact vector index (BENCHMATCH_VECTOR_INDEX=quantized), built by
+  ingest() at start-up, so no Chroma is needed.
+
+--concurrency async clients then drive a weighted mix of requests through
+httpx's ASGI transport (sync endpoints run in the app's thread pool as under
+uvicorn) for --duration seconds or --requests total:
+
+    create     POST /requirements
+    search     POST /search (for a newly created requirement when one is
+               waiting, so its shortlist is stored; otherwise ad hoc)
+    shortlist  GET /shortlist/{id} (half of them conditional, If-None-Match)
+    breakdown  GET /breakdown/{id}/{employee}
+    list       GET /requirements
+    select     PUT /candidate/{item}/select
+
+It reports throughput, p50/p95/p99/max latency and error rate per endpoint.
+A search answered with {"status": "failed"} counts as an error. Runs are
+seeded, so the request sequence of each client is the same from run to run.
+Use --url to point the same workload at a running server instead.
+
+Usage:
+    python benchmarks/load_test.py [--employees 2000 | --data data]
+        [--concurrency 16] [--duration 30 | --requests 2000]
+        [--mix create=2,search=3,shortlist=4,breakdown=2,list=1,select=1]
+        [--prime 20] [--seed 0] [--json results.json] [--url http://localhost:8001]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import synthetic_data  # noqa: E402
+from search_benchmark import make_queries, offline_env  # noqa: E402
+
+DEFAULT_MIX = "create=2,search=3,shortlist=4,breakdown=2,list=1,select=1"
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise SystemExit(f"Unknown operation '{name}' in --mix; expected {sorted(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ---------------------------
+# SHARED WORKLOAD STATE
+# ---------------------------
+class Workload:
+    """IDs created during the run that later requests read or act on."""
+
+    def __init__(self, seed):
+        self.queries = make_queries(500, seed)
+        self.pending = []      # created requirements without a shortlist yet
+        self.searched = []     # requirements with a stored shortlist
+        self.candidates = {}   # requirement_id -> [employee_id]
+        self.items = []        # unselected shortlist_item_ids
+        self.etags = {}
+        self.samples = {}      # endpoint -> [(seconds, ok)]
+        self.errors = {}       # endpoint -> {message: count}
+
+    def record(self, endpoint, seconds, ok, message=None):
+        self.samples.setdefault(endpoint, []).append((seconds, ok))
+        if not ok:
+            bucket = self.errors.setdefault(endpoint, {})
+            bucket[message] = bucket.get(message, 0) + 1
+
+    def store_shortlist(self, requirement_id, stored):
+        self.searched.append(requirement_id)
+        self.candidates[requirement_id] = [c["employee_id"] for c in stored]
+        self.items.extend(c["shortlist_item_id"] for c in stored[:1])
+
+
+async def timed(workload, endpoint, request):
+    start = time.perf_counter()
+    try:
+        response = await request
+    except Exception as e:
+        workload.record(endpoint, time.perf_counter() - start, False, type(e).__name__)
+        return None
+    seconds = time.perf_counter() - start
+    ok = response.status_code < 400
+    message = None if ok else f"HTTP {response.status_code}"
+    body = None
+    if ok and response.status_code != 304 and response.headers.get("content-type", "").startswith("application/json"):
+        body = response.json()
+        if isinstance(body, dict) and body.get("status") == "failed":
+            ok, message = False, f"failed: {str(body.get('error'))[:80]}"
+    workload.record(endpoint, seconds, ok, message)
+    return (response, body) if ok else None
+
+
+# ---------------------------
+# OPERATIONS
+# ---------------------------
+def requirement_body(query, rng):
+    return {
+        "client_name": rng.choice(synthetic_data.CLIENTS),
+        "role_title": query["role_title"],
+        "required_skills": query["required_skills"],
+        "minimum_experience": query["min_experience"],
+        "mandatory_certifications": query["required_certs"],
+        "availability_date": "2026-12-01",
+        "requirement_summary": query["requirement_summary"],
+    }
+
+
+async def op_create(client, workload, rng):
+    query = rng.choice(workload.queries)
+    result = await timed(workload, "POST /requirements", client.post("/requirements", json=requirement_body(query, rng)))
+    if result:
+        workload.pending.append((result[1]["requirement_id"], query))
+
+
+async def op_search(client, workload, rng):
+    requirement_id, query = workload.pending.pop() if workload.pending else (None, rng.choice(workload.queries))
+    body = {
+        "requirement_id": requirement_id,
+        "role_title": query["role_title"],
+        "required_skills": query["required_skills"],
+        "required_certs": query["required_certs"],
+        "min_experience": query["min_experience"],
+        "requirement_summary": query["requirement_summary"],
+        "top_n": 5,
+    }
+    result = await timed(workload, "POST /search", client.post("/search", json=body))
+    if result and requirement_id:
+        workload.store_shortlist(requirement_id, result[1].get("stored_candidates") or [])
+
+
+async def op_shortlist(client, workload, rng):
+    if not workload.searched:
+        return await op_search(client, workload, rng)
+    requirement_id = rng.choice(workload.searched)
+    headers = {}
+    if requirement_id in workload.etags and rng.random() < 0.5:
+        headers["If-None-Match"] = workload.etags[requirement_id]
+    result = await timed(workload, "GET /shortlist", client.get(f"/shortlist/{requirement_id}", headers=headers))
+    if result and result[0].headers.get("etag"):
+        workload.etags[requirement_id] = result[0].headers["etag"]
+
+
+async def op_breakdown(client, workload, rng):
+    choices = [r for r in workload.searched[-50:] if workload.candidates.get(r)]
+    if not choices:
+        return await op_search(client, workload, rng)
+    requirement_id = rng.choice(choices)
+    employee_id = rng.choice(workload.candidates[requirement_id])
+    await timed(workload, "GET /breakdown", client.get(f"/breakdown/{requirement_id}/{employee_id}"))
+
+
+async def op_list(client, workload, rng):
+    await timed(workload, "GET /requirements", client.get("/requirements", params={"limit": 50}))
+
+
+async def op_select(client, workload, rng):
+    if not workload.items:
+        return await op_search(client, workload, rng)
+    item = workload.items.pop(rng.randrange(len(workload.items)))
+    await timed(workload, "PUT /candidate/select", client.put(f"/candidate/{item}/select", json={"hired_by": "load-test"}))
+
+
+OPERATIONS = {
+    "create": op_create,
+    "search": op_search,
+    "shortlist": op_shortlist,
+    "breakdown": op_breakdown,
+    "list": op_list,
+    "select": op_select,
+}
+
+
+# ---------------------------
+# DRIVER
+# ---------------------------
+async def prime(client, workload, count, seed):
+    """Create and search `count` requirements so reads and selects have targets."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        await op_create(client, workload, rng)
+        await op_search(client, workload, rng)
+    workload.samples.clear()
+    workload.errors.clear()
+
+
+async def client_loop(client, workload, mix, rng, deadline, budget):
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline and budget["left"] > 0:
+        budget["left"] -= 1
+        await OPERATIONS[rng.choices(names, weights)[0]](client, workload, rng)
+
+
+async def drive(client, args):
+    workload = Workload(args.seed)
+    await prime(client, workload, args.prime, args.seed)
+
+    mix = parse_mix(args.mix)
+    deadline = time.perf_counter() + (args.duration if args.requests is None else float("inf"))
+    budget = {"left": args.requests if args.requests is not None else float("inf")}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client_loop(client, workload, mix, random.Random(args.seed * 1000 + i), deadline, budget)
+        for i in range(args.concurrency)
+    ))
+    return workload, time.perf_counter() - start
+
+
+def summarize(workload, elapsed):
+    rows = []
+    all_samples = []
+    for endpoint, samples in sorted(workload.samples.items()):
+        all_samples.extend(samples)
+        rows.append(summarize_samples(endpoint, samples, elapsed))
+    rows.append(summarize_samples("TOTAL", all_samples, elapsed))
+    return rows
+
+
+def summarize_samples(endpoint, samples, elapsed):
+    latencies = np.array([s for s, _ in samples]) * 1000 if samples else np.zeros(1)
+    errors = sum(1 for _, ok in samples if not ok)
+    return {
+        "endpoint": endpoint,
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+        "max_ms": round(float(latencies.max()), 2),
+    }
+
+
+def print_report(rows, workload, elapsed, args):
+    print(f"\n{args.concurrency} clients, {elapsed:.1f}s, mix {args.mix}")
+    print(
+        f"{'endpoint':<22}{'requests':>9}{'errors':>8}{'err %':>7}{'req/s':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    )
+    for row in rows:
+        print(
+            f"{row['endpoint']:<22}{row['requests']:>9}{row['errors']:>8}"
+            f"{row['error_rate'] * 100:>7.1f}{row['throughput_rps']:>9.1f}"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}"
+        )
+    for endpoint, messages in sorted(workload.errors.items()):
+        for message, count in sorted(messages.items(), key=lambda kv: -kv[1])[:3]:
+            print(f"  {endpoint}: {count}x {message}")
+
+
+def configure_local(args, tmp):
+    """Point the app at temporary local stand-ins; must run before importing main."""
+    if args.data:
+        data_dir = Path(args.data).resolve()
+    else:
+        data_dir = synthetic_data.write(synthetic_data.generate(args.employees, args.seed), tmp / "data")
+    os.environ.update(offline_env(tmp, data_dir, args.embed_latency, args.llm_latency))
+    os.environ.update({
+        "BENCHMATCH_DB_URL": f"sqlite:///{tmp / 'load_test.db'}",
+        # Bench status from the SQLite table, so selects go through the live index
+        "BENCHMATCH_BENCH_SOURCE": "sql",
+    })
+    return data_dir
+
+
+async def run_local(args):
+    import httpx
+
+    with tempfile.TemporaryDirectory(prefix="benchmatch_load_") as tmp:
+        data_dir = configure_local(args, Path(tmp))
+        os.chdir(BACKEND_DIR)
+
+        import db
+        import local_db
+        from data_ingestion import ingest
+
+        setup_start = time.perf_counter()
+        local_db.seed_from_csvs(db.get_engine(), data_dir)
+        ingest()
+        print(f"Seeded SQLite stand-in and built index from {data_dir} in {time.perf_counter() - setup_start:.1f}s")
+
+        from main import app
+
+        logging.getLogger().setLevel(getattr(logging, args.log_level))
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=120) as client:
+                return await drive(client, args)
+
+
+async def run_remote(args):
+    import httpx
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=120) as client:
+        return await drive(client, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--employees", type=int, default=2000, help="Synthetic dataset size")
+    parser.add_argument("--data", help="Use these CSVs (e.g. data) instead of synthetic data")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests instead")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights")
+    parser.add_argument("--prime", type=int, default=20, help="Requirements created and searched up front")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="Seconds per fake embed call")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per fake LLM call")
+    parser.add_argument("--url", help="Load a running server instead of the in-process app")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+    parse_mix(args.mix)
+
+    logging.basicConfig(level=getattr(logging, args.log_level))
+    workload, elapsed = asyncio.run(run_remote(args) if args.url else run_local(args))
+    rows = summarize(workload, elapsed)
+    print_report(rows, workload, elapsed, args)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "elapsed": elapsed, "endpoints": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
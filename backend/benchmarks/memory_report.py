@@ -0,0 +1,115 @@
+"""
+Memory report for the employee snapshot tables: bytes per employee before
+and after the explicit dtypes in table_schema.py.
+
+"before" is what plain pd.read_csv produces (one string object per text cell),
+"after" is the same CSVs loaded through load_csvs() / load_bench_status()
+(categories, shared employee_id key, parsed dates). Sizes are deep
+memory_usage, index included.
+
+Usage:
+    python benchmarks/memory_report.py [--data data] [--employees 100000]
+        [--seed 0] [--json report.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+FILES = {
+    "employees": "employees.csv",
+    "skills": "skills.csv",
+    "certifications": "certifications.csv",
+    "projects": "project_history.csv",
+    "bench_status": "bench_status.csv",
+}
+
+
+def measure(data_dir):
+    # DATA_DIR is read at import time
+    os.environ["BENCHMATCH_DATA_DIR"] = str(data_dir)
+    from data_ingestion import load_bench_status, load_csvs
+    from table_schema import memory_bytes
+
+    employees, skills, certs, projects = load_csvs()
+    lean = {
+        "employees": employees,
+        "skills": skills,
+        "certifications": certs,
+        "projects": projects,
+        "bench_status": load_bench_status().reset_index(),
+    }
+    rows = {}
+    for name, filename in FILES.items():
+        raw = pd.read_csv(Path(data_dir) / filename)
+        rows[name] = {
+            "rows": len(raw),
+            "before_bytes": memory_bytes(raw),
+            "after_bytes": memory_bytes(lean[name]),
+        }
+    return len(employees), rows
+
+
+def print_report(employees, rows):
+    print(f"\n{employees} employees")
+    print(f"{'table':<16}{'rows':>9}{'before MB':>12}{'after MB':>11}{'B/emp before':>14}{'B/emp after':>13}{'saved':>8}")
+    totals = {"before_bytes": 0, "after_bytes": 0}
+    per = max(employees, 1)
+    for name, row in rows.items():
+        totals["before_bytes"] += row["before_bytes"]
+        totals["after_bytes"] += row["after_bytes"]
+        saved = 1 - row["after_bytes"] / row["before_bytes"] if row["before_bytes"] else 0.0
+        print(
+            f"{name:<16}{row['rows']:>9}{row['before_bytes'] / 1e6:>12.2f}{row['after_bytes'] / 1e6:>11.2f}"
+            f"{row['before_bytes'] / per:>14.0f}{row['after_bytes'] / per:>13.0f}{saved:>8.0%}"
+        )
+    saved = 1 - totals["after_bytes"] / totals["before_bytes"] if totals["before_bytes"] else 0.0
+    print(
+        f"{'TOTAL':<16}{'':>9}{totals['before_bytes'] / 1e6:>12.2f}{totals['after_bytes'] / 1e6:>11.2f}"
+        f"{totals['before_bytes'] / per:>14.0f}{totals['after_bytes'] / per:>13.0f}{saved:>8.0%}"
+    )
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--data", default=str(BACKEND_DIR / "data"), help="Directory with the CSVs")
+    parser.add_argument("--employees", type=int, help="Measure a synthetic dataset of this size instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="benchmatch_memory_") as tmp:
+        data_dir = args.data
+        if args.employees:
+            import synthetic_data
+
+            data_dir = Path(tmp) / "data"
+            synthetic_data.write(synthetic_data.generate(args.employees, args.seed), data_dir)
+        employees, rows = measure(data_dir)
+
+    totals = print_report(employees, rows)
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "employees": employees,
+            "tables": rows,
+            "bytes_per_employee": {
+                "before": totals["before_bytes"] / max(employees, 1),
+                "after": totals["after_bytes"] / max(employees, 1),
+            },
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Ranking and latency regression suite for search_employees, pinned to the
+engine version.
+
+benchmarks/golden/ranking.json holds golden requirements, the shortlist each
+one produced (employee IDs and overall fit scores, in rank order), per-stage
+latency budgets and the engine version they were recorded with. A check run
+rebuilds the same synthetic dataset (synthetic_data.py), ingests it offline
+with the fake embedder / LLM (see search_benchmark.py) and re-runs every
+requirement:
+
+- rankings: top-k overlap and Kendall rank correlation against the golden
+  shortlist must stay at or above --min-overlap / --min-tau (default 1.0,
+  i.e. identical order); fit-score drift is reported;
+- latency: the p95 of each trace stage (load, prefilter, embed, vector_query,
+  rerank, llm, enrich) and of the whole search, over --repeat passes, must
+  stay within the recorded budget;
+- version: the golden file must have been recorded with the engine version in
+  backend/ENGINE_VERSION, which shortlists and match history are stamped with.
+
+When a ranking change is intentional, re-record with --update. If any
+shortlist changed, the minor engine version is bumped (1.0 -> 1.1) in
+ENGINE_VERSION and in the golden file; if only latency moved, the budgets
+are refreshed and the version stays. Exit status is non-zero on failure, so
+the suite can gate CI.
+
+Usage:
+    python benchmarks/ranking_regression.py            # check
+    python benchmarks/ranking_regression.py --update   # re-record (bumps on change)
+        [--repeat 5] [--skip-latency] [--headroom 3.0]
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import synthetic_data  # noqa: E402
+from search_benchmark import RESULT_PREFIX, offline_env  # noqa: E402
+
+GOLDEN_PATH = BENCH_DIR / "golden" / "ranking.json"
+ENGINE_VERSION_PATH = BACKEND_DIR / "ENGINE_VERSION"
+DEFAULT_DATASET = {"employees": 2000, "seed": 0}
+DEFAULT_TOP_N = 10
+# Budgets never drop below this, so sub-millisecond stages don't flap
+BUDGET_FLOOR_MS = 5.0
+
+# Used only when recording a golden file for the first time
+DEFAULT_REQUIREMENTS = [
+    {"id": "python-backend", "role_title": "Backend Developer", "required_skills": ["Python", "Docker"],
+     "min_experience": 4, "requirement_summary": "Python microservices on Docker"},
+    {"id": "react-frontend", "role_title": "Frontend Developer", "required_skills": ["React", "TypeScript"],
+     "min_experience": 3, "requirement_summary": "React SPA with TypeScript"},
+    {"id": "fullstack-node", "role_title": "Full Stack Developer", "required_skills": ["JavaScript", "Node", "SQL"],
+     "min_experience": 5},
+    {"id": "ml-engineer", "role_title": "AI Engineer", "required_skills": ["Machine Learning", "Python", "PyTorch"],
+     "min_experience": 6, "requirement_summary": "Train and deploy LLM based models"},
+    {"id": "data-engineer-azure", "role_title": "Data Engineer", "required_skills": ["Spark", "Airflow"],
+     "required_certs": ["Azure Data Engineer"], "min_experience": 5},
+    {"id": "devops-k8s-hard", "role_title": "DevOps Engineer", "required_skills": ["Kubernetes", "Terraform"],
+     "required_certs": ["Certified Kubernetes Administrator"], "min_experience": 4,
+     "hard_constraints": ["skills", "certifications"]},
+    {"id": "cloud-architect-aws", "role_title": "Cloud Architect", "required_skills": ["AWS", "Solution Architecture"],
+     "required_certs": ["AWS Certified Solutions Architect"], "min_experience": 8},
+    {"id": "pm-hard-experience", "role_title": "Project Manager", "required_skills": ["Project Management", "Agile"],
+     "required_certs": ["Project Management Professional"], "min_experience": 9,
+     "hard_constraints": ["experience"]},
+    {"id": "qa-automation", "role_title": "QA Engineer", "required_skills": ["Selenium", "Test Automation"],
+     "min_experience": 2},
+    {"id": "security-analyst", "role_title": "Security Analyst", "required_skills": ["SIEM", "Incident Response"],
+     "required_certs": ["CompTIA Security+"], "min_experience": 3},
+    {"id": "summary-only", "role_title": "Data Analyst", "required_skills": [],
+     "requirement_summary": "Dashboards in Power BI and Tableau for sales KPIs"},
+    {"id": "no-match-hard", "role_title": "Mainframe Developer", "required_skills": ["COBOL"],
+     "min_experience": 10, "hard_constraints": ["skills"]},
+]
+
+
+# ---------------------------
+# RANKING COMPARISON
+# ---------------------------
+def overlap(expected, actual, k):
+    if not expected and not actual:
+        return 1.0
+    return len(set(expected[:k]) & set(actual[:k])) / max(len(expected[:k]), len(actual[:k]), 1)
+
+
+def kendall_tau(expected, actual):
+    """Kendall tau-a over the employees both shortlists contain (1.0 if < 2)."""
+    common = [e for e in expected if e in set(actual)]
+    if len(common) < 2:
+        return 1.0
+    position = {e: i for i, e in enumerate(actual)}
+    concordant = discordant = 0
+    for a, b in itertools.combinations(common, 2):
+        if position[a] < position[b]:
+            concordant += 1
+        else:
+            discordant += 1
+    return (concordant - discordant) / (concordant + discordant)
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+# ---------------------------
+# WORKER (fresh process)
+# ---------------------------
+def run_worker(args):
+    import logging
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    import tracing
+    from data_ingestion import ingest, search_employees
+
+    spec = json.loads(Path(args.spec).read_text())
+    ingest()
+
+    shortlists, stage_ms = {}, {}
+    for attempt in range(spec["repeat"] + 1):
+        for requirement in spec["requirements"]:
+            params = {k: v for k, v in requirement.items() if k != "id"}
+            with tracing.start_trace() as trace:
+                results = search_employees(**params, top_n=spec["top_n"], debug=False)
+            total_ms = trace.total() * 1000
+            if attempt == 0:
+                # First pass builds caches and indexes; it only records rankings
+                shortlists[requirement["id"]] = [
+                    [str(r["employee_id"]), int(r["overall_fit_score"])] for r in results
+                ]
+                continue
+            for name, stage in trace.summary().items():
+                stage_ms.setdefault(name, []).append(total_ms if name == "total" else stage["ms"])
+
+    print(RESULT_PREFIX + json.dumps({"shortlists": shortlists, "stage_ms": stage_ms}), flush=True)
+
+
+def run_suite(golden, repeat):
+    """Rebuild the golden dataset, run every requirement, return the worker result."""
+    dataset = golden["dataset"]
+    with tempfile.TemporaryDirectory(prefix="benchmatch_ranking_") as tmp:
+        tmp = Path(tmp)
+        synthetic_data.write(synthetic_data.generate(dataset["employees"], dataset["seed"]), tmp / "data")
+        spec = tmp / "spec.json"
+        spec.write_text(json.dumps({
+            "requirements": golden["requirements"],
+            "top_n": golden["top_n"],
+            "repeat": repeat,
+        }))
+        env = {**os.environ, **offline_env(tmp, tmp / "data")}
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", "--spec", str(spec)],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+        )
+        for line in proc.stdout.splitlines():
+            if line.startswith(RESULT_PREFIX):
+                return json.loads(line[len(RESULT_PREFIX):])
+        raise RuntimeError(f"Ranking worker failed:\n{proc.stderr[-4000:]}")
+
+
+# ---------------------------
+# CHECK / UPDATE
+# ---------------------------
+def compare_rankings(golden, result, min_overlap, min_tau):
+    failures, changed = [], []
+    print(f"{'requirement':<24}{'overlap':>9}{'tau':>7}{'max |Δfit|':>12}")
+    for requirement in golden["requirements"]:
+        rid = requirement["id"]
+        expected = golden["shortlists"].get(rid, [])
+        actual = result["shortlists"].get(rid, [])
+        expected_ids, actual_ids = [e for e, _ in expected], [e for e, _ in actual]
+        k = golden["top_n"]
+        row_overlap = overlap(expected_ids, actual_ids, k)
+        tau = kendall_tau(expected_ids, actual_ids)
+        expected_fit = dict(expected)
+        drift = max((abs(fit - expected_fit[e]) for e, fit in actual if e in expected_fit), default=0)
+        print(f"{rid:<24}{row_overlap:>9.2f}{tau:>7.2f}{drift:>12}")
+        if expected != actual:
+            changed.append(rid)
+        if row_overlap < min_overlap or tau < min_tau:
+            failures.append(f"{rid}: overlap {row_overlap:.2f} (min {min_overlap}), tau {tau:.2f} (min {min_tau})")
+    return failures, changed
+
+
+def stage_p95(result):
+    return {name: round(percentile(values, 95), 2) for name, values in result["stage_ms"].items()}
+
+
+def compare_latency(golden, result):
+    failures = []
+    measured = stage_p95(result)
+    print(f"\n{'stage':<16}{'p95 ms':>9}{'budget ms':>11}")
+    for name, budget in golden["latency_budgets_ms"].items():
+        p95 = measured.get(name)
+        if p95 is None:
+            continue
+        flag = "" if p95 <= budget else "  OVER"
+        print(f"{name:<16}{p95:>9.1f}{budget:>11.1f}{flag}")
+        if p95 > budget:
+            failures.append(f"stage {name}: p95 {p95:.1f} ms > budget {budget:.1f} ms")
+    return failures
+
+
+def bump_version(version):
+    major, _, minor = version.partition(".")
+    return f"{major}.{int(minor or 0) + 1}"
+
+
+def record(golden, result, headroom, bump):
+    version = ENGINE_VERSION_PATH.read_text().strip()
+    if bump:
+        version = bump_version(version)
+        ENGINE_VERSION_PATH.write_text(version + "\n")
+    golden = {
+        **golden,
+        "engine_version": version,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "shortlists": result["shortlists"],
+        "latency_budgets_ms": {
+            name: max(BUDGET_FLOOR_MS, math.ceil(p95 * headroom))
+            for name, p95 in stage_p95(result).items()
+        },
+    }
+    GOLDEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+    GOLDEN_PATH.write_text(json.dumps(golden, indent=2) + "\n")
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--update", action="store_true", help="Re-record goldens (bumps the version on change)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over the requirements")
+    parser.add_argument("--min-overlap", type=float, default=1.0)
+    parser.add_argument("--min-tau", type=float, default=1.0)
+    parser.add_argument("--skip-latency", action="store_true", help="Check rankings only")
+    parser.add_argument("--headroom", type=float, default=3.0, help="Budget = recorded p95 x headroom")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--spec", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args)
+
+    engine_version = ENGINE_VERSION_PATH.read_text().strip()
+    if GOLDEN_PATH.exists():
+        golden = json.loads(GOLDEN_PATH.read_text())
+    elif args.update:
+        golden = {
+            "engine_version": engine_version,
+            "dataset": DEFAULT_DATASET,
+            "top_n": DEFAULT_TOP_N,
+            "requirements": DEFAULT_REQUIREMENTS,
+            "shortlists": {},
+            "latency_budgets_ms": {},
+        }
+    else:
+        print(f"No golden file at {GOLDEN_PATH}; record one with --update")
+        return 1
+
+    result = run_suite(golden, args.repeat)
+    failures, changed = compare_rankings(golden, result, args.min_overlap, args.min_tau)
+
+    if args.update:
+        bump = bool(golden["shortlists"]) and bool(changed)
+        version = record(golden, result, args.headroom, bump)
+        if bump:
+            print(f"\n{len(changed)} shortlist(s) changed: engine version {engine_version} -> {version}")
+        else:
+            print(f"\nRecorded goldens and latency budgets for engine version {version}")
+        return 0
+
+    if golden["engine_version"] != engine_version:
+        failures.append(
+            f"golden file recorded for engine {golden['engine_version']} but ENGINE_VERSION is "
+            f"{engine_version}; re-record with --update"
+        )
+    if not args.skip_latency:
+        failures.extend(compare_latency(golden, result))
+
+    if failures:
+        print(f"\n✗ {len(failures)} regression(s) against engine {golden['engine_version']}:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print(f"\n✓ Rankings and latency match engine {engine_version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
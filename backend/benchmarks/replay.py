@@ -0,0 +1,277 @@
+"""
+Replay captured /search traffic against two engine configurations.
+
+Reads capture files written by traffic_capture.py (BENCHMATCH_CAPTURE=1) and
+runs every captured request through search_employees() twice - once per
+configuration, each in its own process, one after the other - then reports:
+
+- latency: p50/p95/p99/mean per configuration and the B - A delta, plus
+  mean per-stage time from the search trace;
+- rankings: identical shortlists, mean top-k overlap, mean Kendall tau and
+  changed top-1 between A and B, with the requests that moved most;
+- drift from production: how often A reproduces the captured ranks, counted
+  only for entries whose data version matches the replay's.
+
+A configuration is a backend directory (--a-dir / --b-dir, default this
+checkout - point one at a `git worktree` of another commit) plus BENCHMATCH_*
+overrides (--a / --b, e.g. "BENCHMATCH_VECTOR_INDEX=quantized
+BENCHMATCH_VECTOR_DIM=128"). By default both read the live data and index of
+their directory. --offline N instead runs both against a fresh synthetic
+dataset of N employees with the fake embedder and LLM, ingested separately
+per side so index settings can differ (captured employee IDs won't exist
+there, so only A-vs-B comparisons are meaningful).
+
+Usage:
+    python benchmarks/replay.py captures/search.jsonl
+        [--a "ENV=VAL ..."] [--b "ENV=VAL ..."] [--a-dir DIR] [--b-dir DIR]
+        [--offline 2000] [--limit 500] [--unique] [--json report.json]
+"""
+
+import argparse
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+RESULT_PREFIX = "REPLAY_RESULT "
+
+
+def load_entries(paths, limit=None, unique=False):
+    # traffic_capture imports only fast_json, so this works from any checkout
+    sys.path.insert(0, str(BACKEND_DIR))
+    from traffic_capture import read_capture
+
+    entries, seen = [], set()
+    for path in paths:
+        for entry in read_capture(path):
+            if unique:
+                if entry.get("key") in seen:
+                    continue
+                seen.add(entry.get("key"))
+            entries.append(entry)
+            if limit and len(entries) >= limit:
+                return entries
+    return entries
+
+
+def parse_overrides(text):
+    overrides = {}
+    for item in shlex.split(text or ""):
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"Expected NAME=VALUE, got '{item}'")
+        overrides[name] = value
+    return overrides
+
+
+# ---------------------------
+# WORKER (runs inside one configuration's backend directory)
+# ---------------------------
+def run_worker(args):
+    import logging
+
+    sys.path.insert(0, os.getcwd())
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    import tracing
+    from data_ingestion import get_data_version, ingest, search_employees
+
+    if args.ingest:
+        ingest()
+    requests = json.loads(Path(args.requests).read_text())
+
+    def run(params):
+        with tracing.start_trace() as trace:
+            results = search_employees(**params, debug=False)
+        return results, trace
+
+    # Warm caches and indexes so the first request isn't an outlier
+    if requests:
+        run(requests[0])
+
+    replies = []
+    for params in requests:
+        results, trace = run(params)
+        summary = trace.summary()
+        replies.append({
+            "ranks": [[str(r["employee_id"]), int(r["overall_fit_score"])] for r in results],
+            "ms": summary.pop("total")["ms"],
+            "stages": {name: stage["ms"] for name, stage in summary.items()},
+        })
+    print(RESULT_PREFIX + json.dumps({"data_version": get_data_version(), "replies": replies}), flush=True)
+
+
+def run_side(label, backend_dir, overrides, requests_file, offline, workdir):
+    env = {**os.environ}
+    ingest = False
+    if offline:
+        from search_benchmark import offline_env
+
+        side_dir = Path(workdir) / label
+        env.update(offline_env(side_dir, Path(workdir) / "data"))
+        ingest = True
+    env.update(overrides)
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--worker", "--requests", str(requests_file)]
+    if ingest:
+        cmd.append("--ingest")
+    print(f"▶ Replaying on {label}: {backend_dir} {' '.join(f'{k}={v}' for k, v in overrides.items())}", flush=True)
+    proc = subprocess.run(cmd, cwd=backend_dir, env=env, capture_output=True, text=True)
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"Replay worker for {label} failed:\n{proc.stderr[-4000:]}")
+
+
+# ---------------------------
+# REPORT
+# ---------------------------
+def latency_stats(replies):
+    ms = [r["ms"] for r in replies]
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": statistics.mean(ms),
+    }
+
+
+def stage_means(replies):
+    stages = {}
+    for reply in replies:
+        for name, ms in reply["stages"].items():
+            stages.setdefault(name, []).append(ms)
+    return {name: statistics.mean(values) for name, values in stages.items()}
+
+
+def compare(entries, a, b):
+    from ranking_regression import kendall_tau, overlap
+
+    rows = []
+    for entry, ra, rb in zip(entries, a["replies"], b["replies"]):
+        ids_a, ids_b = [e for e, _ in ra["ranks"]], [e for e, _ in rb["ranks"]]
+        k = entry["request"].get("top_n") or max(len(ids_a), len(ids_b), 1)
+        rows.append({
+            "request": entry["request"],
+            "identical": ra["ranks"] == rb["ranks"],
+            "overlap": overlap(ids_a, ids_b, k),
+            "tau": kendall_tau(ids_a, ids_b),
+            "top1_changed": ids_a[:1] != ids_b[:1],
+            "delta_ms": rb["ms"] - ra["ms"],
+        })
+    return rows
+
+
+def production_agreement(entries, side):
+    """(matching, comparable) captured entries reproduced exactly by a side."""
+    comparable = [
+        (entry, reply) for entry, reply in zip(entries, side["replies"])
+        if entry.get("data_version") == side["data_version"]
+    ]
+    matching = sum(1 for entry, reply in comparable if entry["ranks"] == reply["ranks"])
+    return matching, len(comparable)
+
+
+def describe(request):
+    skills = ", ".join(request.get("required_skills") or []) or "-"
+    return f"{request.get('role_title') or '?'} [{skills}] exp>={request.get('min_experience', 0)}"
+
+
+def print_report(entries, a, b, rows, args):
+    stats_a, stats_b = latency_stats(a["replies"]), latency_stats(b["replies"])
+    print(f"\nReplayed {len(entries)} captured searches")
+    print(f"{'':<14}{'A':>10}{'B':>10}{'B - A':>10}{'%':>8}")
+    for key in ("p50_ms", "p95_ms", "p99_ms", "mean_ms"):
+        delta = stats_b[key] - stats_a[key]
+        pct = 100 * delta / stats_a[key] if stats_a[key] else 0.0
+        print(f"{key:<14}{stats_a[key]:>10.1f}{stats_b[key]:>10.1f}{delta:>+10.1f}{pct:>+8.1f}")
+
+    means_a, means_b = stage_means(a["replies"]), stage_means(b["replies"])
+    print("\nmean stage ms")
+    for name in dict.fromkeys(list(means_a) + list(means_b)):
+        va, vb = means_a.get(name, 0.0), means_b.get(name, 0.0)
+        print(f"  {name:<12}{va:>10.1f}{vb:>10.1f}{vb - va:>+10.1f}")
+
+    identical = sum(r["identical"] for r in rows)
+    print(
+        f"\nRankings B vs A: {identical}/{len(rows)} identical, "
+        f"mean overlap {statistics.mean(r['overlap'] for r in rows):.3f}, "
+        f"mean tau {statistics.mean(r['tau'] for r in rows):.3f}, "
+        f"top-1 changed {sum(r['top1_changed'] for r in rows)}"
+    )
+    changed = sorted((r for r in rows if not r["identical"]), key=lambda r: (r["overlap"], r["tau"]))
+    for row in changed[:args.show]:
+        print(f"  overlap {row['overlap']:.2f} tau {row['tau']:+.2f}  {describe(row['request'])}")
+
+    if not args.offline:
+        matching, comparable = production_agreement(entries, a)
+        skipped = len(entries) - comparable
+        print(
+            f"\nA reproduces captured ranks for {matching}/{comparable} requests "
+            f"({skipped} skipped: captured on a different data version)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("captures", nargs="*", help="Capture JSONL files")
+    parser.add_argument("--a", default="", help="BENCHMATCH_* overrides for configuration A")
+    parser.add_argument("--b", default="", help="BENCHMATCH_* overrides for configuration B")
+    parser.add_argument("--a-dir", default=str(BACKEND_DIR), help="Backend directory for A")
+    parser.add_argument("--b-dir", default=str(BACKEND_DIR), help="Backend directory for B")
+    parser.add_argument("--offline", type=int, metavar="EMPLOYEES", help="Use a synthetic dataset + fake providers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit", type=int, help="Replay at most this many entries")
+    parser.add_argument("--unique", action="store_true", help="Replay each distinct request once")
+    parser.add_argument("--show", type=int, default=10, help="Changed rankings to list")
+    parser.add_argument("--json", help="Also write the full comparison to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--requests", help=argparse.SUPPRESS)
+    parser.add_argument("--ingest", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args)
+    if not args.captures:
+        parser.error("at least one capture file is required")
+
+    entries = load_entries(args.captures, args.limit, args.unique)
+    if not entries:
+        print("No captured searches found")
+        return 1
+
+    with tempfile.TemporaryDirectory(prefix="benchmatch_replay_") as tmp:
+        requests_file = Path(tmp) / "requests.json"
+        requests_file.write_text(json.dumps([e["request"] for e in entries]))
+        if args.offline:
+            import synthetic_data
+
+            synthetic_data.write(synthetic_data.generate(args.offline, args.seed), Path(tmp) / "data")
+        a = run_side("A", args.a_dir, parse_overrides(args.a), requests_file, args.offline, tmp)
+        b = run_side("B", args.b_dir, parse_overrides(args.b), requests_file, args.offline, tmp)
+
+    rows = compare(entries, a, b)
+    print_report(entries, a, b, rows, args)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "entries": len(entries),
+            "latency": {"A": latency_stats(a["replies"]), "B": latency_stats(b["replies"])},
+            "stages": {"A": stage_means(a["replies"]), "B": stage_means(b["replies"])},
+            "rankings": rows,
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
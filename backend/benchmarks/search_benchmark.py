@@ -0,0 +1,210 @@
+"""
+Offline ingest + search benchmark at increasing dataset sizes.
+
+For every --employees scale this generates a synthetic dataset
+(benchmarks/synthetic_data.py), then runs a fresh interpreter that ingests it
+and fires seeded search_employees() queries against it. The run is fully
+offline and reproducible:
+
+- BENCHMATCH_EMBEDDER=fake / BENCHMATCH_LLM=fake swap Nomic and Ollama for
+  the deterministic providers in fake_providers.py (add latency with
+  --embed-latency / --llm-latency to approximate the real services);
+- BENCHMATCH_VECTOR_INDEX=quantized keeps vectors in the compact index, so no
+  Chroma server or collection is needed;
+- data, snapshot, index pointer and compact index all live in a temporary
+  directory; bench status is read from the generated CSV.
+
+Reported per scale: ingest throughput (employees/s), cold first-query
+latency, p50/p95/p99 search latency, mean per-stage time from the search
+trace (load, prefilter, embed, vector_query, rerank, enrich, llm, ...) and
+peak RSS of the worker.
+
+Usage:
+    python benchmarks/search_benchmark.py [--employees 1000,10000,100000]
+        [--queries 200] [--top-n 5] [--hard-constraints skills,experience]
+        [--seed 0] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import synthetic_data  # noqa: E402
+
+RESULT_PREFIX = "BENCHMARK_RESULT "
+
+
+def make_queries(count, seed):
+    """Seeded requirements shaped like the /search form: role, skills, experience, certs."""
+    rng = np.random.default_rng(seed + 1)
+    roles = list(synthetic_data.ROLE_SKILLS)
+    queries = []
+    for _ in range(count):
+        role = roles[rng.integers(len(roles))]
+        pool = synthetic_data.ROLE_SKILLS[role]
+        skills = list(rng.choice(pool, size=min(len(pool), 1 + rng.integers(3)), replace=False))
+        certs = []
+        if rng.random() < 0.3:
+            certs = [synthetic_data.CERTIFICATIONS[rng.integers(len(synthetic_data.CERTIFICATIONS))][0]]
+        queries.append({
+            "role_title": role,
+            "required_skills": [str(s) for s in skills],
+            "required_certs": certs,
+            "min_experience": int(rng.integers(0, 9)),
+            "requirement_summary": f"Looking for a {role} with {', '.join(skills)} experience",
+        })
+    return queries
+
+
+def offline_env(workdir, data_dir, embed_latency=0.0, llm_latency=0.0):
+    """BENCHMATCH_* settings for an offline run with all state under `workdir`."""
+    workdir = Path(workdir)
+    return {
+        "BENCHMATCH_DATA_DIR": str(data_dir),
+        "BENCHMATCH_SNAPSHOT_DIR": str(workdir / "snapshots"),
+        "BENCHMATCH_VECTOR_INDEX": "quantized",
+        "BENCHMATCH_VECTOR_INDEX_DIR": str(workdir / "vector_index"),
+        "BENCHMATCH_INDEX_POINTER": str(workdir / "ACTIVE_INDEX.json"),
+        "BENCHMATCH_INGEST_RUNS_DIR": str(workdir / "ingest_runs"),
+        "BENCHMATCH_BENCH_SOURCE": "csv",
+        "BENCHMATCH_EMBEDDER": "fake",
+        "BENCHMATCH_LLM": "fake",
+        "BENCHMATCH_FAKE_EMBED_LATENCY": str(embed_latency),
+        "BENCHMATCH_FAKE_LLM_LATENCY": str(llm_latency),
+        "BENCHMATCH_PRECOMPUTE": "0",
+        "BENCHMATCH_WARMUP": "off",
+    }
+
+
+# ---------------------------
+# WORKER (fresh process per scale)
+# ---------------------------
+def run_worker(args):
+    import logging
+    import resource
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    import tracing
+    from data_ingestion import ingest, search_employees
+
+    start = time.perf_counter()
+    ingest()
+    ingest_seconds = time.perf_counter() - start
+
+    hard = [c for c in args.hard_constraints.split(",") if c]
+    queries = make_queries(args.queries + 1, args.seed)
+
+    def run(query):
+        with tracing.start_trace() as trace:
+            results = search_employees(**query, top_n=args.top_n, debug=False, hard_constraints=hard)
+        return trace.total(), trace, results
+
+    # First query pays for snapshot mapping, index loading and the eligibility build
+    cold_seconds, _, _ = run(queries[0])
+    latencies, stages, returned = [], {}, []
+    for query in queries[1:]:
+        seconds, trace, results = run(query)
+        latencies.append(seconds)
+        returned.append(len(results))
+        for name, stage in trace.summary().items():
+            if name != "total":
+                stages.setdefault(name, []).append(stage["ms"])
+
+    latencies_ms = np.array(latencies) * 1000
+    result = {
+        "employees": args.employees,
+        "ingest_seconds": round(ingest_seconds, 2),
+        "ingest_per_second": round(args.employees / ingest_seconds, 1),
+        "cold_ms": round(cold_seconds * 1000, 2),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 2),
+        "mean_results": round(float(np.mean(returned)), 2),
+        "stage_mean_ms": {name: round(float(np.mean(v)), 2) for name, v in stages.items()},
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+# ---------------------------
+# DRIVER
+# ---------------------------
+def run_scale(n, args):
+    with tempfile.TemporaryDirectory(prefix=f"benchmatch_{n}_") as tmp:
+        tmp = Path(tmp)
+        start = time.perf_counter()
+        synthetic_data.write(synthetic_data.generate(n, args.seed), tmp / "data")
+        generate_seconds = time.perf_counter() - start
+
+        env = {**os.environ, **offline_env(tmp, tmp / "data", args.embed_latency, args.llm_latency)}
+        cmd = [
+            sys.executable, __file__, "--worker",
+            "--employees", str(n),
+            "--queries", str(args.queries),
+            "--top-n", str(args.top_n),
+            "--hard-constraints", args.hard_constraints,
+            "--seed", str(args.seed),
+        ]
+        proc = subprocess.run(cmd, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+        for line in proc.stdout.splitlines():
+            if line.startswith(RESULT_PREFIX):
+                result = json.loads(line[len(RESULT_PREFIX):])
+                result["generate_seconds"] = round(generate_seconds, 2)
+                return result
+        raise RuntimeError(f"Worker for {n} employees failed:\n{proc.stderr[-4000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--employees", default="1000,10000,100000", help="Comma-separated scales")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--hard-constraints", default="", help="e.g. skills,experience")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="Seconds per fake embed call")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per fake LLM call")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        args.employees = int(args.employees)
+        return run_worker(args)
+
+    results = []
+    print(
+        f"{'employees':>10}{'ingest s':>10}{'emp/s':>10}{'cold ms':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'RSS MB':>9}  slowest stages (mean ms)"
+    )
+    for n in (int(s) for s in args.employees.split(",")):
+        row = run_scale(n, args)
+        results.append(row)
+        top = sorted(row["stage_mean_ms"].items(), key=lambda kv: -kv[1])[:4]
+        print(
+            f"{n:>10}{row['ingest_seconds']:>10.1f}{row['ingest_per_second']:>10.0f}"
+            f"{row['cold_ms']:>10.1f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+            f"{row['p99_ms']:>9.1f}{row['peak_rss_mb']:>9.0f}  "
+            + ", ".join(f"{name}={ms:.1f}" for name, ms in top),
+            flush=True,
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Whole-table vs streamed ingest on the local SQLite stand-in.
+
+Generates a synthetic dataset, seeds it into a SQLite stand-in of the bench
+schema (local_db.py) and runs ingest() twice, each in a fresh process with
+the fake embedder and quantized index:
+
+- csv: BENCHMATCH_INGEST_SOURCE=csv, the four tables loaded whole;
+- sql: BENCHMATCH_INGEST_SOURCE=sql, tables streamed in
+  BENCHMATCH_INGEST_CHUNK_ROWS chunks and merge-joined (streaming_loader.py).
+
+Reports ingest time and peak RSS of each, and checks that both index the same
+employees with the same embedded content and publish snapshots with the same
+rows. Within one employee, SQL returns skill, certification and project rows
+by primary key (string order) rather than file order, so the content check
+compares each field's items as a set: the ", "-joined skill and certification
+lists item by item, the space-joined project descriptions word by word.
+
+Usage:
+    python benchmarks/streaming_ingest.py [--employees 20000] [--chunk-rows 2000]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+RESULT_PREFIX = "STREAMING_RESULT "
+# build_employee_text fields joined from several child rows, and their separator
+LIST_FIELDS = {"Skills": ", ", "Certifications": ", ", "Experience": None}
+
+
+def normalized_text(text):
+    """Embedded text with the order of each field's child-row items ignored."""
+    fields = []
+    for line in text.splitlines():
+        label, _, value = line.partition(": ")
+        if label in LIST_FIELDS:
+            value = sorted(value.split(LIST_FIELDS[label]))
+        fields.append([label, value])
+    return fields
+
+
+def run_worker():
+    import logging
+    import resource
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    import snapshot
+    from data_ingestion import build_employee_text, ingest
+
+    start = time.perf_counter()
+    ingest()
+    seconds = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    tables = snapshot.load_snapshot()
+    profiles = tables["employee_profiles"]
+    texts = sorted(
+        (str(row["employee_id"]), normalized_text(build_employee_text(row)))
+        for _, row in profiles.iterrows()
+    )
+    print(RESULT_PREFIX + json.dumps({
+        "seconds": seconds,
+        "peak_rss_mb": peak_mb,
+        "employees": len(texts),
+        "text_digest": hashlib.sha1(json.dumps(texts).encode()).hexdigest(),
+        "rows": {name: len(df) for name, df in tables.items()},
+    }), flush=True)
+
+
+def run_side(source, workdir, data_dir, db_url, chunk_rows):
+    from search_benchmark import offline_env
+
+    env = {
+        **os.environ,
+        **offline_env(Path(workdir) / source, data_dir),
+        "BENCHMATCH_DB_URL": db_url,
+        "BENCHMATCH_INGEST_SOURCE": source,
+        "BENCHMATCH_INGEST_CHUNK_ROWS": str(chunk_rows),
+    }
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--worker"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"{source} ingest failed:\n{proc.stderr[-4000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--employees", type=int, default=20000)
+    parser.add_argument("--chunk-rows", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker()
+
+    import synthetic_data
+
+    with tempfile.TemporaryDirectory(prefix="benchmatch_streaming_") as tmp:
+        tmp = Path(tmp)
+        data_dir = tmp / "data"
+        synthetic_data.write(synthetic_data.generate(args.employees, args.seed), data_dir)
+
+        db_url = f"sqlite:///{tmp / 'stream.db'}"
+        from local_db import create_local_engine, seed_from_csvs
+
+        seed_from_csvs(create_local_engine(db_url), data_dir)
+
+        results = {
+            source: run_side(source, tmp, data_dir, db_url, args.chunk_rows) for source in ("csv", "sql")
+        }
+
+    print(f"\n{args.employees} employees, chunks of {args.chunk_rows} rows")
+    print(f"{'source':<8}{'ingest s':>10}{'peak RSS MB':>13}{'indexed':>9}")
+    for source, result in results.items():
+        print(f"{source:<8}{result['seconds']:>10.1f}{result['peak_rss_mb']:>13.0f}{result['employees']:>9}")
+
+    csv, sql = results["csv"], results["sql"]
+    same_text = csv["text_digest"] == sql["text_digest"]
+    same_rows = csv["rows"] == sql["rows"]
+    print(f"\nEmbedded content identical: {'yes' if same_text else 'NO'}")
+    print(f"Snapshot rows identical: {'yes' if same_rows else 'NO ' + json.dumps(results)}")
+    return 0 if same_text and same_rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
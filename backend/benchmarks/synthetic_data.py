@@ -0,0 +1,250 @@
+"""
+Synthetic BenchMatch dataset generator.
+
+Writes employees.csv, skills.csv, certifications.csv, project_history.csv and
+bench_status.csv with the same columns and ID formats as backend/data/, at any
+scale, so ingest and search can be benchmarked far beyond the 100-employee
+sample. Everything is vectorized numpy and seeded: the same --employees and
+--seed always produce byte-identical files.
+
+Distributions follow the sample data: roles come with role-specific skill
+pools, experience is lognormal (median ~6 years), skills / certifications /
+projects per employee are Poisson, skill level tracks experience, and bench
+status is ~50% active / 17% inactive / 17% terminated / 16% on_leave with a few
+duplicate bench rows per employee, like the sample table.
+
+Usage:
+    python benchmarks/synthetic_data.py --employees 100000 --out /tmp/bench_100k [--seed 0]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# role -> skills drawn for it (first one is the usual primary skill)
+ROLE_SKILLS = {
+    "Software Engineer": ["Python", "Java", "SQL", "Docker", "Git", "REST APIs"],
+    "Backend Developer": ["Node", "Python", "Java", "PostgreSQL", "Docker", "Microservices"],
+    "Frontend Developer": ["React", "JavaScript", "TypeScript", "CSS", "Frontend", "Redux"],
+    "Full Stack Developer": ["JavaScript", "React", "Node", "TypeScript", "SQL", "MongoDB"],
+    "Mobile Developer": ["Flutter", "Kotlin", "Swift", "React Native", "Firebase"],
+    "Data Scientist": ["Machine Learning", "Python", "Data Analysis", "Statistics", "TensorFlow"],
+    "Data Engineer": ["SQL", "Python", "Spark", "Airflow", "Kafka", "Azure Data Factory"],
+    "Data Analyst": ["Data Analysis", "SQL", "Power BI", "Excel", "Tableau"],
+    "AI Engineer": ["Machine Learning", "Python", "PyTorch", "NLP", "LLMs"],
+    "Research Scientist": ["Machine Learning", "Statistics", "Python", "PyTorch"],
+    "DevOps Engineer": ["DevOps", "Kubernetes", "Docker", "Terraform", "AWS", "CI/CD"],
+    "Cloud Engineer": ["Cloud Computing", "AWS", "Azure", "Terraform", "Kubernetes"],
+    "Cloud Architect": ["Cloud Computing", "AWS", "Azure", "GCP", "Solution Architecture"],
+    "Database Developer": ["SQL", "PostgreSQL", "Oracle", "T-SQL", "Data Modeling"],
+    "Security Engineer": ["Network Security", "Cloud Computing", "Python", "SIEM", "IAM"],
+    "Security Analyst": ["Network Security", "SIEM", "Incident Response", "Risk Assessment"],
+    "QA Engineer": ["Selenium", "Test Automation", "Java", "Cypress", "API Testing"],
+    "Software Tester": ["Manual Testing", "Selenium", "Test Automation", "JIRA"],
+    "Project Manager": ["Project Management", "Agile", "Scrum", "JIRA", "Stakeholder Management"],
+    "Product Manager": ["Product Strategy", "Project Management", "Agile", "Data Analysis"],
+    "Product Owner": ["Agile", "Scrum", "Product Strategy", "JIRA"],
+    "UI Designer": ["UI/UX Design", "Figma", "Adobe XD", "CSS"],
+    "UX Researcher": ["UI/UX Design", "User Research", "Usability Testing", "Figma"],
+    "System Administrator": ["Linux", "Windows Server", "Networking", "Bash", "Azure"],
+    "Network Administrator": ["Networking", "Cisco", "Firewalls", "Linux"],
+    "Technical Support": ["Troubleshooting", "Windows Server", "Networking", "ITIL"],
+    "HR Specialist": ["Recruitment", "Employee Relations", "HRIS"],
+    "Marketing Specialist": ["SEO", "Content Marketing", "Google Analytics", "Social Media"],
+    "Sales Manager": ["Salesforce", "Negotiation", "CRM", "Account Management"],
+}
+ROLE_WEIGHTS = np.array([3.0 if "Engineer" in r or "Developer" in r else 2.0 for r in ROLE_SKILLS])
+
+CERTIFICATIONS = [
+    ("AWS Certified Solutions Architect - Associate", "Amazon Web Services"),
+    ("AWS Certified Developer - Associate", "Amazon Web Services"),
+    ("Microsoft Certified: Azure Fundamentals", "Microsoft"),
+    ("Microsoft Certified: Azure Data Engineer Associate (DP-203)", "Microsoft"),
+    ("Google Cloud Certified - Associate Cloud Engineer", "Google"),
+    ("Certified Kubernetes Administrator", "CNCF"),
+    ("Project Management Professional", "PMI"),
+    ("Certified ScrumMaster", "Scrum Alliance"),
+    ("CompTIA Security+", "CompTIA"),
+    ("Certified Information Systems Security Professional", "(ISC)²"),
+    ("Certified Information Security Manager", "ISACA"),
+    ("ITIL Foundation", "AXELOS"),
+    ("Oracle Certified Professional", "Oracle"),
+    ("Salesforce Certified Administrator", "Salesforce"),
+    ("Google Analytics Individual Qualification", "Google"),
+]
+
+FIRST_NAMES = [
+    "Olivia", "Liam", "Emma", "Noah", "Ava", "Elijah", "Sophia", "James", "Isabella", "Lucas",
+    "Mia", "Mason", "Amelia", "Ethan", "Harper", "Aarav", "Priya", "Wei", "Mei", "Carlos",
+    "Lucia", "Omar", "Fatima", "Kenji", "Yuki", "Ivan", "Anya", "Kwame", "Amara", "Ravi",
+]
+LAST_NAMES = [
+    "Martinez", "Johnson", "Smith", "Brown", "Garcia", "Miller", "Davis", "Wilson", "Anderson",
+    "Thomas", "Lee", "Patel", "Sharma", "Chen", "Wang", "Kim", "Nguyen", "Rossi", "Muller",
+    "Kowalski", "Silva", "Okafor", "Haddad", "Tanaka", "Petrov", "Singh", "Reddy", "Lopez",
+]
+PROJECTS = [
+    ("Website Redesign", "Developed responsive UI components and improved user experience"),
+    ("Mobile App Development", "Created cross-platform mobile app with seamless performance"),
+    ("Data Platform Migration", "Migrated legacy pipelines to a cloud data platform"),
+    ("Customer Analytics Dashboard", "Built dashboards and KPIs for customer behaviour"),
+    ("Cloud Cost Optimization", "Reduced infrastructure spend through rightsizing and automation"),
+    ("CI/CD Modernization", "Automated build, test and deployment pipelines"),
+    ("Fraud Detection Model", "Trained and deployed models to flag fraudulent transactions"),
+    ("ERP Integration", "Integrated ERP modules with internal services via REST APIs"),
+    ("Security Hardening", "Audited systems and remediated security vulnerabilities"),
+    ("Chatbot Assistant", "Delivered an LLM-based assistant for customer support"),
+]
+CLIENTS = [
+    "Acme Corp", "Globex Inc", "Initech", "Stark Industries", "Wayne Enterprises",
+    "Wonka Industries", "Tyrell Corp", "Oscorp", "Umbrella Corp", "Cyberdyne Systems",
+]
+SKILL_LEVELS = np.array(["Beginner", "Intermediate", "Advanced", "Expert"])
+BENCH_STATUSES = np.array(["active", "inactive", "terminated", "on_leave"])
+BENCH_WEIGHTS = np.array([0.50, 0.17, 0.17, 0.16])
+
+
+def _choice(rng, values, size, p=None):
+    values = np.asarray(values, dtype=object)
+    return values[rng.choice(len(values), size=size, p=p)]
+
+
+def _timestamps(rng, start, end, size):
+    lo, hi = pd.Timestamp(start).value // 10**9, pd.Timestamp(end).value // 10**9
+    seconds = rng.integers(lo, hi, size=size)
+    return pd.to_datetime(seconds, unit="s").strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def generate(n, seed=0):
+    """Return {table name: DataFrame} for `n` employees."""
+    rng = np.random.default_rng(seed)
+    width = max(4, len(str(n)))
+    employee_ids = np.array([f"ID_{i:0{width}d}" for i in range(1, n + 1)], dtype=object)
+
+    # ---------------------------
+    # EMPLOYEES
+    # ---------------------------
+    roles = list(ROLE_SKILLS)
+    role_idx = rng.choice(len(roles), size=n, p=ROLE_WEIGHTS / ROLE_WEIGHTS.sum())
+    experience = np.clip(np.round(rng.lognormal(np.log(6.0), 0.45, n), 1), 0.5, 35.0)
+    first = _choice(rng, FIRST_NAMES, n)
+    last = _choice(rng, LAST_NAMES, n)
+    names = first + " " + last
+    emails = (
+        pd.Series(first).str.lower() + "." + pd.Series(last).str.lower()
+        + pd.Series(np.arange(1, n + 1)).astype(str) + "@example.com"
+    )
+    # Padded role -> skill matrix so skills can be drawn for every row at once
+    pool_sizes = np.array([len(ROLE_SKILLS[r]) for r in roles])
+    pools = np.array([ROLE_SKILLS[r] + [""] * (pool_sizes.max() - len(ROLE_SKILLS[r])) for r in roles], dtype=object)
+    employees = pd.DataFrame({
+        "employee_id": employee_ids,
+        "name": names,
+        "email": emails.to_numpy(),
+        "role": np.array(roles, dtype=object)[role_idx],
+        "experience_years": experience,
+        "primary_skill": pools[role_idx, 0],
+    })
+
+    # ---------------------------
+    # SKILLS
+    # ---------------------------
+    skill_counts = np.minimum(1 + rng.poisson(2.5, n), pool_sizes[role_idx])
+    owner = np.repeat(np.arange(n), skill_counts)
+    pick = (rng.random(len(owner)) * pool_sizes[role_idx[owner]]).astype(int)
+    skills = pd.DataFrame({
+        "employee_id": employee_ids[owner],
+        "skill_name": pools[role_idx[owner], pick],
+        "_owner": owner,
+    }).drop_duplicates(["employee_id", "skill_name"])
+    owner = skills.pop("_owner").to_numpy()
+    # Seniority shifts the level distribution upwards
+    level = np.clip(np.round(experience[owner] / 4 + rng.normal(0, 0.8, len(owner))), 0, 3).astype(int)
+    skills["skill_level"] = SKILL_LEVELS[level]
+    skills["years_experience"] = np.round(experience[owner] * rng.uniform(0.3, 1.0, len(owner)), 1)
+    skills.insert(0, "skill_id", [f"ID_SKILL_{i:03d}" for i in range(1, len(skills) + 1)])
+
+    # ---------------------------
+    # CERTIFICATIONS
+    # ---------------------------
+    cert_counts = rng.poisson(0.8, n)
+    owner = np.repeat(np.arange(n), cert_counts)
+    cert_pick = rng.integers(0, len(CERTIFICATIONS), len(owner))
+    cert_names = np.array([c[0] for c in CERTIFICATIONS], dtype=object)
+    issuers = np.array([c[1] for c in CERTIFICATIONS], dtype=object)
+    certs = pd.DataFrame({
+        "certification_id": [f"ID_CERT_{i:03d}" for i in range(1, len(owner) + 1)],
+        "certificate_name": cert_names[cert_pick],
+        "employee_id": employee_ids[owner],
+        "issued_by": issuers[cert_pick],
+        "validity": _timestamps(rng, "2024-01-01", "2029-12-31", len(owner)),
+    })
+
+    # ---------------------------
+    # PROJECT HISTORY
+    # ---------------------------
+    project_counts = rng.poisson(1.0 + experience / 4)
+    owner = np.repeat(np.arange(n), project_counts)
+    project_pick = rng.integers(0, len(PROJECTS), len(owner))
+    tool_pick = (rng.random(len(owner)) * pool_sizes[role_idx[owner]]).astype(int)
+    projects = pd.DataFrame({
+        "project_id": [f"PRJ_{i:04d}" for i in range(1, len(owner) + 1)],
+        "employee_id": employee_ids[owner],
+        "project_name": np.array([p[0] for p in PROJECTS], dtype=object)[project_pick],
+        "client": _choice(rng, CLIENTS, len(owner)),
+        "role": employees["role"].to_numpy()[owner],
+        "tools_used": pools[role_idx[owner], tool_pick],
+        "experience_summary": np.array([p[1] for p in PROJECTS], dtype=object)[project_pick],
+    })
+
+    # ---------------------------
+    # BENCH STATUS
+    # ---------------------------
+    # One row per employee plus ~5% duplicate rows after it (the first row wins)
+    duplicates = rng.choice(n, size=n // 20, replace=False) if n >= 20 else np.array([], dtype=int)
+    owner = np.concatenate([np.arange(n), duplicates])
+    bench = pd.DataFrame({
+        "employee_id": employee_ids[owner],
+        "status": BENCH_STATUSES[rng.choice(len(BENCH_STATUSES), len(owner), p=BENCH_WEIGHTS)],
+        "since_date": _timestamps(rng, "2010-01-01", "2024-12-31", len(owner)),
+        "end_date": _timestamps(rng, "2025-01-01", "2027-12-31", len(owner)),
+        "salary": np.round(rng.normal(65000, 15000, len(owner)).clip(30000, 200000), 1),
+    })
+
+    return {
+        "employees": employees,
+        "skills": skills,
+        "certifications": certs,
+        "project_history": projects,
+        "bench_status": bench,
+    }
+
+
+def write(tables, out_dir):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, df in tables.items():
+        df.to_csv(out_dir / f"{name}.csv", index=False)
+    return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--out", required=True, help="Directory for the CSVs")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tables = generate(args.employees, args.seed)
+    write(tables, args.out)
+    rows = ", ".join(f"{name}={len(df)}" for name, df in tables.items())
+    print(f"Wrote {rows} to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,32 @@
+import numpy as np
 import pandas as pd
-import chromadb
-import nomic
-from nomic import embed
+import hashlib
+import shutil
+import threading
+import time
 from pathlib import Path
 import logging
-from sqlalchemy import create_engine
+from db import get_engine
 import os
-from llama_index.llms.ollama import Ollama
+import index_versions
+from bench_status_index import get_bench_index
+import eligibility_index
+import ingest_checkpoint
+import metrics
+import tracing
+import snapshot
+import streaming_loader
+import vector_index
+from table_schema import apply_schema, fill_missing, lean_tables
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+# Load environment variables from .env file (local file only - no network).
+# chromadb, nomic and llama_index are imported lazily by the accessors below
+# so importing this module (and main) stays fast and never touches the network.
 load_dotenv()
 
 NOMIC_API_KEY = os.getenv("NOMIC_API_KEY")
-if NOMIC_API_KEY:
-    # Login to Nomic with API key
-    nomic.login(NOMIC_API_KEY)
-else:
-    logger = logging.getLogger(__name__)
-    logger.warning("⚠️  NOMIC_API_KEY not set. Embedding features will be disabled.")
+
 # ---------------------------
 # SETUP LOGGING
 # ---------------------------
@@ -30,49 +38,37 @@ logger = logging.getLogger(__name__)
 # ---------------------------
 # CONFIG
 # ---------------------------
-DATA_DIR = Path("data")
+DATA_DIR = Path(os.getenv("BENCHMATCH_DATA_DIR", "data"))
 CHROMA_DIR = "chroma_data"
 COLLECTION_NAME = "employees"
 EMBED_MODEL = "nomic-embed-text-v1.5"
+# "fake" swaps in the deterministic offline providers from fake_providers.py
+EMBED_PROVIDER = os.getenv("BENCHMATCH_EMBEDDER", "nomic")
+LLM_PROVIDER = os.getenv("BENCHMATCH_LLM", "ollama")
+
+# Weighted fit score (60% skills, 20% exp, 10% certs, 10% avail)
+FIT_WEIGHTS = {
+    "skills": 0.60,
+    "experience": 0.20,
+    "certifications": 0.10,
+    "availability": 0.10,
+}
+
+# Availability scoring: Active bench employees are PRIMARY TARGET (higher score)
+# "active" = on bench and available = 95%
+# "inactive" = bench but not immediately available = 70%
+AVAILABILITY_SCORES = {"active": 95, "inactive": 70}
+
+# Employees per embedding call / checkpointed batch
+INGEST_BATCH_SIZE = int(os.getenv("BENCHMATCH_INGEST_BATCH_SIZE", "64"))
+# Consecutive fully failed batches (e.g. a Nomic outage) before a run stops
+INGEST_MAX_FAILED_BATCHES = int(os.getenv("BENCHMATCH_INGEST_MAX_FAILED_BATCHES", "3"))
+# Seconds to sleep after each batch (throttles background re-ingests)
+INGEST_BATCH_PAUSE = float(os.getenv("BENCHMATCH_INGEST_BATCH_PAUSE", "0"))
 
 # ---------------------------
 # LOAD CSVs
 # ---------------------------
-# ---------------------------
-# AZURE SQL CONFIG (ENTRA ID AUTH)
-# ---------------------------
-# Using Entra ID (Azure AD) authentication with pyodbc + ODBC Driver 18
-import urllib.parse
-
-AZURE_SQL_SERVER = "ai-db-dbs.database.windows.net"
-AZURE_SQL_DATABASE = "db_bench"
-
-# For Entra ID Integrated Authentication (uses Windows/Azure credentials)
-# No browser popup, uses current user's credentials
-AZURE_SQL_CONN_STR = (
-    f"mssql+pyodbc://@{AZURE_SQL_SERVER}/{AZURE_SQL_DATABASE}"
-    "?driver=ODBC+Driver+18+for+SQL+Server"
-    "&authentication=ActiveDirectoryIntegrated"
-)
-
-logger.info(
-    f"Connecting to Azure SQL: {AZURE_SQL_SERVER}/{AZURE_SQL_DATABASE} (Entra ID)"
-)
-
-# Create engine (lazy connection - only connects when needed)
-engine = None
-
-
-def get_engine():
-    """Get or create the SQLAlchemy engine."""
-    global engine
-    if engine is None:
-        engine = create_engine(AZURE_SQL_CONN_STR)
-    return engine
-
-
-# Connection will be tested on first actual data load (lazy initialization)
-# Don't raise - let it fail gracefully on actual usage
 
 
 def load_csvs():
@@ -81,6 +77,7 @@ def load_csvs():
         skills = pd.read_csv(DATA_DIR / "skills.csv")
         certs = pd.read_csv(DATA_DIR / "certifications.csv")
         projects = pd.read_csv(DATA_DIR / "project_history.csv")
+        employees, skills, certs, projects = lean_tables(employees, skills, certs, projects)
 
         logger.info(f"Loaded {len(employees)} employees")
         logger.info(f"Loaded {len(skills)} skill records")
@@ -121,7 +118,7 @@ def load_csvs():
 def load_bench_status():
     """Load bench status data and return as indexed dataframe."""
     try:
-        bench_df = pd.read_csv(DATA_DIR / "bench_status.csv")
+        bench_df = apply_schema(pd.read_csv(DATA_DIR / "bench_status.csv"), "bench_status")
         return bench_df.set_index("employee_id")
     except Exception as e:
         logger.error(f"Error loading bench_status.csv: {e}")
@@ -145,6 +142,96 @@ def load_bench_status():
 #         raise
 
 
+def load_search_tables(live_bench=True):
+    """
+    Tables read by search: (bench_df, employees, skills, certs, projects).
+
+    Served from the memory-mapped columnar snapshot when one is published
+    (shared by every worker, re-mapped only when a new one is swapped in),
+    otherwise read from the CSVs. With live_bench, bench_df comes from the
+    live bench-status index instead of the exported file.
+    """
+    tables = snapshot.load_snapshot()
+    if tables is not None:
+        return (
+            get_bench_index().as_frame() if live_bench
+            else tables["bench_status"].set_index("employee_id"),
+            tables["employees"],
+            tables["skills"],
+            tables["certifications"],
+            tables["projects"],
+        )
+    employees, skills, certs, projects = load_csvs()
+    bench_df = get_bench_index().as_frame() if live_bench else load_bench_status()
+    return bench_df, employees, skills, certs, projects
+
+
+def get_tables_version():
+    """Version of the employee tables: the published snapshot, else the CSV files."""
+    version = snapshot.current_version()
+    if version is not None and snapshot.pyarrow_available():
+        return f"snapshot:{version}"
+    stats = []
+    for name in ("employees.csv", "skills.csv", "certifications.csv"):
+        try:
+            stat = (DATA_DIR / name).stat()
+            stats.append(f"{name}:{stat.st_mtime_ns}:{stat.st_size}")
+        except FileNotFoundError:
+            stats.append(f"{name}:missing")
+    return ";".join(stats)
+
+
+def publish_snapshot(employees=None, skills=None, certs=None, projects=None, profiles=None, activate=True):
+    """
+    Write the search tables (loading the CSVs if not given) as a new
+    snapshot; with activate=False it is only staged (see ingest()).
+    """
+    if not snapshot.pyarrow_available():
+        logger.warning("⚠️  pyarrow not installed; skipping columnar snapshot (search reads CSVs).")
+        return None
+    if employees is None:
+        employees, skills, certs, projects = load_csvs()
+    if profiles is None:
+        profiles = aggregate_employee_data(employees, skills, certs, projects)
+    bench = apply_schema(pd.read_csv(DATA_DIR / "bench_status.csv"), "bench_status")
+    return snapshot.write_snapshot(
+        {
+            "employees": employees,
+            "skills": skills,
+            "certifications": certs,
+            "projects": projects,
+            "bench_status": bench,
+            "employee_profiles": profiles,
+        },
+        activate=activate,
+    )
+
+
+def get_data_version():
+    """
+    Cheap fingerprint of the data search reads (CSV files, published
+    snapshot, vector index and live bench statuses). Changes whenever a file
+    is rewritten, a snapshot is swapped in, the index is re-ingested or a
+    bench status changes.
+    """
+    digest = hashlib.sha1()
+    digest.update(f"bench:{get_bench_index().version()};".encode())
+    paths = sorted(DATA_DIR.glob("*.csv")) + [snapshot.SNAPSHOT_DIR / snapshot.POINTER_FILE]
+    if index_versions.POINTER_PATH.exists():
+        # Versioned indexes only change by publish/rollback; building (or
+        # discarding) an unpublished version must not look like new data
+        paths.append(index_versions.POINTER_PATH)
+    else:
+        paths += [Path(CHROMA_DIR) / "chroma.sqlite3", vector_index.INDEX_DIR / "meta.json"]
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        digest.update(f"{path.name}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return digest.hexdigest()[:16]
+
+
 # ---------------------------
 # AGGREGATE EMPLOYEE DATA
 # ---------------------------
@@ -177,8 +264,7 @@ def aggregate_employee_data(employees, skills, certs, projects):
         .merge(projects_grp, on="employee_id", how="left")
     )
 
-    df.fillna("", inplace=True)
-    return df
+    return fill_missing(df, "")
 
 
 # ---------------------------
@@ -195,13 +281,79 @@ Experience: {row.get('experience', '')}"""
     return chunk.strip()
 
 
+# ---------------------------
+# LAZY CLIENTS (CHROMA / NOMIC / OLLAMA)
+# ---------------------------
+_client_lock = threading.Lock()
+_chroma_client = None
+_nomic_embed = None
+_llm = None
+
+
+def get_chroma_client():
+    """Get or create the persistent ChromaDB client (imports chromadb on first use)."""
+    global _chroma_client
+    if _chroma_client is None:
+        with _client_lock:
+            if _chroma_client is None:
+                import chromadb
+
+                # Use persistent client for disk-based storage
+                _chroma_client = chromadb.PersistentClient(path=CHROMA_DIR)
+    return _chroma_client
+
+
+def get_collection(version=None):
+    """Chroma collection of the active index version (or a given one)."""
+    return get_chroma_client().get_collection(index_versions.collection_name(version))
+
+
+def get_embedder():
+    """Import nomic and log in on first use (the login is a network call)."""
+    global _nomic_embed
+    if _nomic_embed is None:
+        with _client_lock:
+            if _nomic_embed is None and EMBED_PROVIDER == "fake":
+                from fake_providers import FakeEmbedder
+
+                _nomic_embed = FakeEmbedder()
+            if _nomic_embed is None:
+                import nomic
+                from nomic import embed
+
+                if NOMIC_API_KEY:
+                    # Login to Nomic with API key
+                    nomic.login(NOMIC_API_KEY)
+                else:
+                    logger.warning("⚠️  NOMIC_API_KEY not set. Embedding features will be disabled.")
+                _nomic_embed = embed
+    return _nomic_embed
+
+
+def get_llm():
+    """Get or create the Ollama client (imports llama_index on first use)."""
+    global _llm
+    if _llm is None:
+        with _client_lock:
+            if _llm is None and LLM_PROVIDER == "fake":
+                from fake_providers import FakeLLM
+
+                _llm = FakeLLM()
+            if _llm is None:
+                from llama_index.llms.ollama import Ollama
+
+                # Use gemma3:4b (faster) or llama3 with increased timeout
+                _llm = Ollama(model="gemma3:4b", request_timeout=120.0)
+    return _llm
+
+
 # ---------------------------
 # GET EMBEDDING (NOMIC)
 # ---------------------------
 def get_embedding(text):
     """Generate embedding for a single text chunk using Nomic Embed."""
     try:
-        result = embed.text(
+        result = get_embedder().text(
             texts=[text],
             model=EMBED_MODEL,
             task_type="search_query"  # Nomic requires task_type for v1.5
@@ -212,72 +364,301 @@ def get_embedding(text):
         raise
 
 
+def get_embeddings(texts):
+    """Embed a batch of text chunks in one Nomic call (same task_type as get_embedding)."""
+    result = get_embedder().text(
+        texts=list(texts),
+        model=EMBED_MODEL,
+        task_type="search_query"
+    )
+    return result["embeddings"]
+
+
 # ---------------------------
 # INGEST INTO CHROMADB
 # ---------------------------
-def ingest():
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _embed_batch(rows, reuse=None):
     """
-    Azure SQL → Aggregation → Embedding → ChromaDB Pipeline
-    Entity-based chunking: One employee = One chunk = One embedding
+    Embed one batch of profile rows with a single call.
+
+    Returns (ids, vectors, texts, metadatas, failures, reused). If the batch
+    call fails, its employees are retried one at a time so only the ones that
+    really fail end up in `failures` (employee_id -> error). With `reuse`
+    (ingest_checkpoint.VectorReuse), employees whose text is unchanged keep
+    their earlier vector and are listed in `reused` instead of re-embedded.
     """
+    items, failures, kept = [], {}, {}
+    for row in rows:
+        employee_id = str(row.get("employee_id", "unknown"))
+        try:
+            metadata = {"employee_id": employee_id, "role": str(row.get("role", "Unknown"))}
+            employee_text = build_employee_text(row)
+            vector = reuse.get(employee_id, employee_text) if reuse is not None else None
+            if vector is not None:
+                kept[employee_id] = (employee_text, metadata, vector.tolist())
+            else:
+                items.append((employee_id, employee_text, metadata))
+        except Exception as e:
+            failures[employee_id] = e
+
     try:
-        logger.info("🔹 Loading data from Azure SQL Database...")
-        employees, skills, certs, projects = load_csvs()
+        vectors = get_embeddings([text for _, text, _ in items]) if items else []
+    except Exception as e:
+        logger.warning(f"Batch embedding failed ({e}); retrying {len(items)} employees one by one")
+        embedded, vectors = [], []
+        for item in items:
+            try:
+                vectors.append(get_embedding(item[1]))
+                embedded.append(item)
+            except Exception as e:
+                failures[item[0]] = e
+        items = embedded
+
+    ids = [employee_id for employee_id, _, _ in items] + list(kept)
+    texts = [text for _, text, _ in items] + [text for text, _, _ in kept.values()]
+    metadatas = [metadata for _, _, metadata in items] + [metadata for _, metadata, _ in kept.values()]
+    vectors = list(vectors) + [vector for _, _, vector in kept.values()]
+    return ids, vectors, texts, metadatas, failures, set(kept)
+
+
+def _open_run(resume, retry_failed, incremental):
+    """(run, employee IDs to skip, only these IDs or None) for an ingest call."""
+    if (resume or retry_failed) and incremental:
+        raise ValueError("incremental applies to new runs only")
+    if resume and retry_failed:
+        raise ValueError("Pass either resume or retry_failed, not both")
+    if resume:
+        run = ingest_checkpoint.load_run(None if resume == "latest" else resume)
+        if run.state["state"] != ingest_checkpoint.RUNNING:
+            raise ValueError(f"Ingest run {run.run_id} already completed; retry its failures with retry_failed")
+        done = run.done_ids()
+        logger.info(
+            f"🔹 Resuming ingest run {run.run_id} after batch {run.state['last_batch']} "
+            f"({len(done)} employees already embedded)"
+        )
+        return run, done, None
+    if retry_failed:
+        run = ingest_checkpoint.load_run(retry_failed)
+        if run.state["state"] == ingest_checkpoint.RUNNING:
+            raise ValueError(f"Ingest run {run.run_id} is unfinished; resume it instead")
+        failed = set(run.failed_ids())
+        if not failed:
+            return run, set(), failed
+        # The run's index version may be live; build the retry into a fresh one
+        run.update(state=ingest_checkpoint.RUNNING, version=index_versions.new_version(), retried_from=run.version)
+        logger.info(f"🔹 Retrying {len(failed)} failed employees of ingest run {run.run_id}")
+        return run, set(), failed
+    details = {"source": streaming_loader.INGEST_SOURCE}
+    if incremental:
+        base = ingest_checkpoint.latest_published_run(index_versions.active_version())
+        if base is None:
+            logger.info("🔹 No checkpointed run behind the active index; re-embedding everyone")
+        else:
+            details["incremental_from"] = base.run_id
+    run = ingest_checkpoint.IngestRun.create(index_versions.new_version(), **details)
+    return run, set(), None
 
-        logger.info("🔹 Aggregating employee data...")
-        df = aggregate_employee_data(employees, skills, certs, projects)
 
-        logger.info("🔹 Initializing ChromaDB...")
-        # Use persistent client for disk-based storage
-        client = chromadb.PersistentClient(path=CHROMA_DIR)
-        collection = client.get_or_create_collection(
-            name=COLLECTION_NAME, metadata={"hnsw:space": "cosine"}
-        )
+def _vector_reuse(run):
+    """Earlier embeddings an incremental run may reuse (None for a full run)."""
+    base_id = run.state.get("incremental_from")
+    if not base_id:
+        return None
+    try:
+        reuse = ingest_checkpoint.VectorReuse(ingest_checkpoint.load_run(base_id))
+    except ValueError:
+        logger.warning(f"Ingest run {base_id} is gone; re-embedding everyone")
+        return None
+    logger.info(f"🔹 Incremental run: reusing embeddings of unchanged employees from run {base_id} ({len(reuse)})")
+    return reuse
 
-        logger.info(f"🔹 Generating embeddings for {len(df)} employees...")
-        successful = 0
-        failed = 0
 
-        for idx, (_, row) in enumerate(df.iterrows(), 1):
-            try:
-                employee_id = str(row["employee_id"])
-                employee_text = build_employee_text(row)
-                embedding = get_embedding(employee_text)
-
-                # Upsert to ChromaDB with metadata
-                collection.upsert(
-                    ids=[employee_id],
-                    documents=[employee_text],
-                    embeddings=[embedding],
-                    metadatas=[
-                        {
-                            "employee_id": employee_id,
-                            "role": str(row.get("role", "Unknown")),
-                        }
-                    ],
-                )
-                successful += 1
+def _restore_collection(collection, run):
+    """Re-upsert checkpointed vectors missing from a resumed or retried build's collection."""
+    if collection is None or collection.count() >= run.state["succeeded"]:
+        return
+    logger.info(f"🔹 Restoring {run.state['succeeded']} checkpointed embeddings into {collection.name}")
+    for ids, vectors, texts, metadatas in run.iter_vectors():
+        collection.upsert(ids=ids, documents=texts, embeddings=vectors.tolist(), metadatas=metadatas)
 
-                if idx % 10 == 0:
-                    logger.info(f"  Processed {idx}/{len(df)} employees...")
 
+def ingest(resume=None, retry_failed=None, incremental=False):
+    """
+    Azure SQL → Aggregation → Embedding → ChromaDB Pipeline
+    Entity-based chunking: One employee = One chunk = One embedding
+
+    Each run builds a new versioned collection and compact index and stages
+    a columnar snapshot; search keeps reading the active version and its
+    snapshot until both are published together.
+    Employees are embedded BENCHMATCH_INGEST_BATCH_SIZE at a time and every
+    batch is checkpointed (ingest_checkpoint.py): resume=RUN_ID (or "latest")
+    continues an interrupted run, retry_failed=RUN_ID re-embeds only the
+    employees a finished run reported as failed. incremental=True re-embeds
+    only employees whose text changed since the run behind the active index
+    and keeps that index when nothing changed.
+    """
+    run = None
+    staged = {}
+    try:
+        run, skip, only = _open_run(resume, retry_failed, incremental)
+        reuse = _vector_reuse(run)
+        if only is not None and not only:
+            logger.info(f"Ingest run {run.run_id} has no failed employees to retry")
+            return None
+
+        if streaming_loader.INGEST_SOURCE == "sql":
+            # Bounded memory: tables are streamed and merge-joined chunk by
+            # chunk; the snapshot is staged after the last chunk
+            total = streaming_loader.count_employees()
+            logger.info(
+                f"🔹 Streaming {total} employees from SQL in chunks of {streaming_loader.CHUNK_ROWS} rows..."
+            )
+            profile_chunks = streaming_loader.iter_profile_chunks(staged=staged)
+        else:
+            logger.info("🔹 Loading data from CSVs...")
+            employees, skills, certs, projects = load_csvs()
+
+            logger.info("🔹 Aggregating employee data...")
+            df = aggregate_employee_data(employees, skills, certs, projects)
+
+            logger.info("🔹 Staging columnar snapshot...")
+            try:
+                staged["snapshot"] = publish_snapshot(employees, skills, certs, projects, df, activate=False)
             except Exception as e:
-                logger.warning(
-                    f"Failed to process employee {row.get('employee_id', 'unknown')}: {e}"
+                # Search keeps working from the CSVs / previous snapshot
+                logger.warning(f"Snapshot write failed: {e}")
+            total = len(df)
+            profile_chunks = [df]
+
+        version = run.version
+        client = collection = None
+        if vector_index.VECTOR_INDEX_MODE != "quantized":
+            logger.info("🔹 Initializing ChromaDB...")
+            client = get_chroma_client()
+            collection = client.get_or_create_collection(
+                name=index_versions.collection_name(version), metadata={"hnsw:space": "cosine"}
+            )
+            _restore_collection(collection, run)
+        else:
+            # Search reads only the compact index in this mode
+            logger.info("🔹 Quantized index mode: skipping ChromaDB upserts")
+        logger.info(f"🔹 Building index version {version} (active: {index_versions.active_version()})")
+
+        if only is not None:
+            total = len(only)
+        logger.info(f"🔹 Generating embeddings for {total - len(skip)} employees in batches of {INGEST_BATCH_SIZE}...")
+        rows = (row for df in profile_chunks for _, row in df.iterrows())
+        pending = (
+            row for row in rows
+            if str(row["employee_id"]) not in skip and (only is None or str(row["employee_id"]) in only)
+        )
+        processed = 0 if only is not None else len(skip)
+        failed_streak = 0
+
+        for batch_rows in _batched(pending, INGEST_BATCH_SIZE):
+            ids, vectors, texts, metadatas, failures, reused = _embed_batch(batch_rows, reuse)
+
+            # Upsert to ChromaDB with metadata
+            if collection is not None and ids:
+                try:
+                    collection.upsert(ids=ids, documents=texts, embeddings=vectors, metadatas=metadatas)
+                except Exception as e:
+                    failures.update({employee_id: e for employee_id in ids})
+                    ids, vectors, texts, metadatas = [], [], [], []
+
+            batch = run.commit_batch(ids, vectors, texts, metadatas, failures, reused)
+            for employee_id, error in failures.items():
+                logger.warning(f"Failed to process employee {employee_id}: {error}")
+            processed += len(batch_rows)
+            logger.info(f"  Batch {batch}: processed {processed}/{total} employees...")
+
+            # An outage fails every batch; stop (resumable) rather than mark everyone failed
+            failed_streak = 0 if ids else failed_streak + 1
+            if failed_streak >= INGEST_MAX_FAILED_BATCHES:
+                raise RuntimeError(
+                    f"{failed_streak} batches in a row failed; resume with "
+                    f"`python main.py ingest --resume {run.run_id}`"
                 )
-                failed += 1
+            if INGEST_BATCH_PAUSE:
+                time.sleep(INGEST_BATCH_PAUSE)
 
-        logger.info(f"Ingestion complete: {successful} succeeded, {failed} failed")
+        successful, failed = run.state["succeeded"], run.state["failed"]
         logger.info(
-            f"ChromaDB collection '{COLLECTION_NAME}' has {collection.count()} embeddings"
+            f"Ingestion complete: {successful} succeeded ({run.state['reused']} unchanged), {failed} failed"
         )
-        logger.info(f"Data persisted to {CHROMA_DIR}/")
+        if reuse is not None and not failed and run.state["reused"] == successful == len(reuse):
+            # Same employees, same texts: the active index is already current
+            if collection is not None:
+                client.delete_collection(collection.name)
+            # Nor is its snapshot: leave the data version (and caches) alone
+            snapshot.discard_snapshot(staged.pop("snapshot", None))
+            run.finish(published=False, unchanged=True)
+            shutil.rmtree(run.path / "batches", ignore_errors=True)
+            logger.info(f"✓ No employee changed; keeping index version {index_versions.active_version()}")
+            ingest_checkpoint.prune_runs(protect=set(index_versions.read_pointer()["versions"]))
+            return None
+        if not successful:
+            # Keep serving the active version rather than publishing an empty one
+            if collection is not None:
+                client.delete_collection(collection.name)
+            run.finish(published=False)
+            raise RuntimeError(f"No employees embedded; index version {version} discarded")
+
+        if collection is not None:
+            logger.info(
+                f"ChromaDB collection '{collection.name}' has {collection.count()} embeddings"
+            )
+            logger.info(f"Data persisted to {CHROMA_DIR}/")
+
+        try:
+            # Compact first-pass index from every checkpointed embedding
+            indexed_ids, indexed_vectors, indexed_metadatas = [], [], []
+            for ids, vectors, _, metadatas in run.iter_vectors():
+                indexed_ids.extend(ids)
+                indexed_vectors.append(vectors)
+                indexed_metadatas.extend(metadatas)
+            vector_index.build_index(
+                indexed_ids,
+                np.concatenate(indexed_vectors),
+                indexed_metadatas,
+                directory=index_versions.vector_index_dir(version),
+            )
+        except Exception as e:
+            if collection is None:
+                # No Chroma fallback to publish in quantized-only mode
+                raise
+            logger.warning(f"Compact vector index build failed: {e}")
+
+        # Blue/green swap: search follows the pointer from its next request
+        index_versions.publish(version, staged.pop("snapshot", None))
+        report = run.finish(published=True)
+        logger.info(f"✓ Ingest run {run.run_id}: {report['succeeded']} embedded, {report['failed']} failed")
+        retired = index_versions.garbage_collect(client, protect=ingest_checkpoint.resumable_versions())
+        if retired:
+            logger.info(f"🗑️  Garbage-collected index versions: {retired}")
+        ingest_checkpoint.prune_runs(protect=set(index_versions.read_pointer()["versions"]))
 
         return collection
 
     except Exception as e:
         logger.error(f"Ingestion pipeline failed: {e}")
+        if run is not None and run.state["state"] == ingest_checkpoint.RUNNING:
+            logger.info(f"Checkpoint kept; resume with `python main.py ingest --resume {run.run_id}`")
         raise
+    finally:
+        # A snapshot staged by a run that published nothing never goes live
+        snapshot.discard_snapshot(staged.get("snapshot"))
 
     """Parse query to extract skills, experience, certifications."""
     import re
@@ -435,6 +816,8 @@ def search_employees(
     top_n: int = 5,
     allow_partial: bool = True,
     debug: bool = True,
+    fields: list = None,
+    hard_constraints: list = None,
 ):
     """
     Structured search with form inputs (no parsing needed).
@@ -448,6 +831,10 @@ def search_employees(
         top_n: Number of results to return
         allow_partial: Include partial bench status
         debug: Enable debug logging
+        fields: Optional result keys to produce (default: all). The LLM call
+            and project history are skipped when their keys aren't requested.
+        hard_constraints: Subset of {"experience", "skills", "certifications"}
+            enforced as filters before retrieval instead of used as boosts
 
     Returns:
         List of ranked candidates with detailed breakdown
@@ -474,38 +861,79 @@ def search_employees(
     # ---------------------------
     # LOAD DATA
     # ---------------------------
-    bench_df = load_bench_status()
-    employees_df, skills_df, certs_df, projects_df = load_csvs()
+    with tracing.span("load"):
+        bench = get_bench_index()
+        _, employees_df, skills_df, certs_df, projects_df = load_search_tables()
 
     # Merge to have all employee data in one place
     full_emp_df = employees_df.copy()
 
     if debug:
-        logger.info(
-            f"📊 Bench distribution: {bench_df['status'].value_counts().to_dict()}"
-        )
+        logger.info(f"📊 Bench distribution: {bench.counts()}")
 
     # ---------------------------
-    # RETRIEVE CANDIDATES WITH EMBEDDINGS
+    # PRE-FILTER: RESOLVE HARD CONSTRAINTS TO AN ELIGIBLE SET
     # ---------------------------
-    client = chromadb.PersistentClient(path=CHROMA_DIR)
-    collection = client.get_collection(COLLECTION_NAME)
+    eligible = None
+    if eligibility_index.PREFILTER_ENABLED or hard_constraints:
+        with tracing.span("prefilter"):
+            elig_index = eligibility_index.get_eligibility_index(
+                get_tables_version(), employees_df, skills_df, certs_df
+            )
+            eligible = elig_index.resolve(
+                bench,
+                status="active",
+                min_experience=min_experience,
+                skills=required_skills,
+                certs=required_certs,
+                hard_constraints=hard_constraints,
+            )
+        logger.info(f"🧮 Pre-filter: {len(eligible)} eligible employees")
+        if not eligible:
+            return []
 
-    query_embedding = get_embedding(embedding_query)
+    # ---------------------------
+    # RETRIEVE CANDIDATES WITH EMBEDDINGS
+    # ---------------------------
+    with tracing.span("embed"):
+        query_embedding = get_embedding(embedding_query)
 
     # Wide retrieval window to get enough candidates after filtering
     retrieval_k = max(top_n * 6, 35)
+    if eligible is not None:
+        retrieval_k = min(retrieval_k, len(eligible))
+    quantized = vector_index.VECTOR_INDEX_MODE == "quantized"
+    where = None
+    if eligible is not None and not quantized:
+        if eligible.selective():
+            where = {"employee_id": {"$in": eligible.ids}}
+        else:
+            # A huge `$in` list costs more than it saves: retrieve a window
+            # wide enough for the eligible share and post-filter below
+            retrieval_k = eligible.widen(retrieval_k)
     logger.info(f"🔄 Retrieving top {retrieval_k} candidates with embeddings")
 
-    results = collection.query(
-        query_embeddings=[query_embedding],
-        n_results=retrieval_k,
-        include=["metadatas", "distances"],
-    )
+    with tracing.span("vector_query"):
+        if quantized:
+            # Truncated/quantized first pass, rescored at full precision
+            index = vector_index.get_index(index_versions.vector_index_dir())
+            mask = eligible.mask_for(index.ids) if eligible is not None else None
+            results = index.query(query_embedding, retrieval_k, mask=mask)
+        else:
+            results = get_collection().query(
+                query_embeddings=[query_embedding],
+                n_results=retrieval_k,
+                where=where,
+                include=["metadatas", "distances"],
+            )
+    metrics.RETRIEVAL_DEPTH.observe(len(results["ids"][0]))
 
     # ---------------------------
     # APPLY BENCH STATUS FILTER + BUILD MATCH LIST
     # ---------------------------
+    rerank = tracing.begin("rerank")
+    # Per-candidate logging is built only when DEBUG is enabled for this logger
+    log_candidates = debug and logger.isEnabledFor(logging.DEBUG)
     candidates = []
     dropped_not_eligible = 0
     dropped_missing = 0
@@ -513,24 +941,23 @@ def search_employees(
     for emp_id, metadata, distance in zip(
         results["ids"][0], results["metadatas"][0], results["distances"][0]
     ):
-        # Check if employee has bench status
-        if emp_id not in bench_df.index:
+        # Check if employee has bench status (live index, O(1) lookup)
+        status = bench.status(emp_id)
+        if status is None:
             dropped_missing += 1
             continue
 
-        # Extract bench status (handle Series case)
-        status_series = bench_df.loc[emp_id]["status"]
-        if isinstance(status_series, pd.Series):
-            status = status_series.iloc[0]
-        else:
-            status = status_series
-
         # BENCH RULE: Only include "active" bench employees (available on bench)
         # "active" = on bench and available for assignment
         if status != "active":
             dropped_not_eligible += 1
             continue
 
+        # Hard constraints not applied at retrieval (unfiltered Chroma query)
+        if eligible is not None and emp_id not in eligible:
+            dropped_not_eligible += 1
+            continue
+
         # Get employee data
         emp_data = full_emp_df[full_emp_df["employee_id"] == emp_id]
         if emp_data.empty:
@@ -558,20 +985,20 @@ def search_employees(
         role_lower = role_title.lower()
         if emp_role == role_lower:
             boost_factor *= 2.0
-            if debug:
-                logger.info(f"  🎯 {emp_id}: EXACT role match ({emp_role}) (×2.0)")
+            if log_candidates:
+                logger.debug(f"  🎯 {emp_id}: EXACT role match ({emp_role}) (×2.0)")
 
         # SIGNAL 2: Role word appears in employee role
         elif any(word in emp_role for word in role_lower.split() if len(word) > 2):
             boost_factor *= 1.5
-            if debug:
-                logger.info(f"  ✓ {emp_id}: Role keyword in '{emp_role}' (×1.5)")
+            if log_candidates:
+                logger.debug(f"  ✓ {emp_id}: Role keyword in '{emp_role}' (×1.5)")
 
         # SIGNAL 3: PRIMARY SKILL MATCHES REQUIRED SKILLS
         if emp_primary and any(skill in emp_primary for skill in required_skills):
             boost_factor *= 1.8
-            if debug:
-                logger.info(
+            if log_candidates:
+                logger.debug(
                     f"  ⭐ {emp_id}: PRIMARY skill '{emp_primary}' matches (×1.8)"
                 )
 
@@ -585,8 +1012,8 @@ def search_employees(
             num_matches = len(matching_skills)
             skill_boost = min(1.0 + (num_matches * 0.3), 2.0)  # Cap at 2x
             boost_factor *= skill_boost
-            if debug:
-                logger.info(
+            if log_candidates:
+                logger.debug(
                     f"  🔧 {emp_id}: Found {num_matches} matching skills (×{skill_boost:.1f})"
                 )
 
@@ -595,8 +1022,8 @@ def search_employees(
         if min_experience > 0 and candidate_exp >= min_experience:
             exp_boost = 1.5 if candidate_exp >= min_experience else 1.0
             boost_factor *= exp_boost
-            if debug:
-                logger.info(
+            if log_candidates:
+                logger.debug(
                     f"  📈 {emp_id}: Experience {candidate_exp} yrs meets {min_experience}+ requirement (×{exp_boost})"
                 )
 
@@ -609,8 +1036,8 @@ def search_employees(
         if matching_certs and required_certs:
             cert_boost = min(1.0 + (len(matching_certs) * 0.25), 1.5)  # Cap at 1.5x
             boost_factor *= cert_boost
-            if debug:
-                logger.info(
+            if log_candidates:
+                logger.debug(
                     f"  🏆 {emp_id}: Found {len(matching_certs)} matching certifications (×{cert_boost:.1f})"
                 )
 
@@ -632,18 +1059,27 @@ def search_employees(
     # ---------------------------
     # RE-RANK BY FINAL SCORE
     # ---------------------------
+    metrics.CANDIDATES_DROPPED.labels("not_active").inc(dropped_not_eligible)
+    metrics.CANDIDATES_DROPPED.labels("missing").inc(dropped_missing)
+
     candidates.sort(key=lambda x: x["final_score"], reverse=True)
     matches = candidates[:top_n]
+    rerank.end()
 
     # ---------------------------
     # LLM ENRICHMENT WITH DETAILED BREAKDOWN
     # ---------------------------
-    # Use gemma3:4b (faster) or llama3 with increased timeout
-    try:
-        llm = Ollama(model="gemma3:4b", request_timeout=120.0)
-    except Exception as e:
-        logger.warning(f"Failed to initialize Ollama: {e}")
-        llm = None
+    # Heavy sections are only built when the caller asked for them
+    wanted = set(fields) if fields else None
+    want_llm = wanted is None or bool(wanted & {"llm_summary", "ai_insight"})
+    want_projects = wanted is None or "relevant_projects" in wanted
+
+    llm = None
+    if want_llm:
+        try:
+            llm = get_llm()
+        except Exception as e:
+            logger.warning(f"Failed to initialize Ollama: {e}")
 
     requirements = {
         "skills": required_skills,
@@ -651,6 +1087,7 @@ def search_employees(
         "experience_years": min_experience,
     }
 
+    enrich = tracing.begin("enrich")
     final_results = []
 
     for rank, match in enumerate(matches[:5], 1):
@@ -660,7 +1097,9 @@ def search_employees(
         # Get employee data
         emp_skills = skills_df[skills_df["employee_id"] == emp_id]
         emp_certs = certs_df[certs_df["employee_id"] == emp_id]
-        emp_projects = projects_df[projects_df["employee_id"] == emp_id]
+        emp_projects = (
+            projects_df[projects_df["employee_id"] == emp_id] if want_projects else None
+        )
 
         # CALCULATE REAL BREAKDOWN
         skill_details, skills_match_pct = calculate_skill_matches(
@@ -680,23 +1119,11 @@ def search_employees(
         else:
             exp_match_pct = 80  # Default if no exp specified
 
-        # Availability scoring: Active bench employees are PRIMARY TARGET (higher score)
-        # "active" = on bench and available = 95%
-        # "inactive" = bench but not immediately available = 70%
-        if match["bench_status"] == "active":
-            avail_pct = 95  # Active bench employees are readily available
-        elif match["bench_status"] == "inactive":
-            avail_pct = 70  # Inactive bench employees may need more time
-        else:
-            avail_pct = 0  # Non-bench employees shouldn't reach here
+        # Availability scoring (non-bench employees shouldn't reach here)
+        avail_pct = AVAILABILITY_SCORES.get(match["bench_status"], 0)
 
         # WEIGHTED SCORE (60% skills, 20% exp, 10% certs, 10% avail)
-        weights = {
-            "skills": 0.60,
-            "experience": 0.20,
-            "certifications": 0.10,
-            "availability": 0.10,
-        }
+        weights = FIT_WEIGHTS
 
         overall_score = int(
             skills_match_pct * weights["skills"]
@@ -745,61 +1172,65 @@ Focus on facts. Be concise."""
         llm_summary = ""
         if llm:
             try:
-                response = llm.complete(prompt)
+                with tracing.span("llm"):
+                    response = llm.complete(prompt)
                 llm_summary = str(response).strip()
             except Exception as e:
                 logger.warning(f"LLM call failed for {emp_id}: {e}")
+                metrics.LLM_FALLBACKS.labels("error").inc()
                 llm_summary = f"Candidate with {overall_score}% overall fit. Skills match: {skills_match_pct}%, Experience: {candidate_exp} years."
 
-        if not llm_summary:
+        if not llm_summary and want_llm:
+            metrics.LLM_FALLBACKS.labels("empty" if llm else "unavailable").inc()
             llm_summary = f"Candidate with {overall_score}% overall fit. Skills match: {skills_match_pct}%, Experience: {candidate_exp} years."
 
-        # Prepare frontend payload (convert numpy types to native Python types)
+        # Prepare frontend payload (numpy/pandas scalars are serialized by
+        # fast_json, so values are passed through without conversion)
+        result = {
+            "rank": rank,
+            "employee_id": emp_id,
+            "name": emp_row.get("name", f"Employee {emp_id}"),
+            "email": emp_row.get("email", ""),
+            "role": match["role"],
+            "bench_status": match["bench_status"],
+            "overall_fit_score": overall_score,
+            # Breakdown scores
+            "breakdown": {
+                "skills_match": skills_match_pct,
+                "experience_match": int(exp_match_pct),
+                "availability_match": avail_pct,
+                "certifications_match": certs_match_pct,
+                "certification_details": cert_details,
+            },
+            # Detailed skill matching table
+            "skill_match_details": skill_details,
+            # Experience alignment
+            "experience_alignment": {
+                "required_years": required_exp,
+                "candidate_years": candidate_exp,
+                "exceeds_requirement": candidate_exp >= required_exp,
+            },
+            # LLM reasoning
+            "llm_summary": llm_summary,
+            "ai_insight": llm_summary,  # Alias for frontend
+            # Original score
+            "similarity_score": match["final_score"],
+        }
+
+        # Project history
+        if want_projects:
+            result["relevant_projects"] = [
+                {"project_name": name, "experience_summary": summary}
+                for name, summary in zip(
+                    emp_projects["project_name"], emp_projects["experience_summary"]
+                )
+            ]
+
         final_results.append(
-            {
-                "rank": int(rank),
-                "employee_id": str(emp_id),
-                "name": str(emp_row.get("name", f"Employee {emp_id}")),
-                "email": str(emp_row.get("email", "")),
-                "role": str(match["role"]),
-                "bench_status": str(match["bench_status"]),
-                "overall_fit_score": int(overall_score),
-                # Breakdown scores
-                "breakdown": {
-                    "skills_match": int(skills_match_pct),
-                    "experience_match": int(exp_match_pct),
-                    "availability_match": int(avail_pct),
-                    "certifications_match": int(certs_match_pct),
-                    "certification_details": cert_details,
-                },
-                # Detailed skill matching table
-                "skill_match_details": skill_details,
-                # Experience alignment
-                "experience_alignment": {
-                    "required_years": int(required_exp),
-                    "candidate_years": float(candidate_exp),
-                    "exceeds_requirement": bool(candidate_exp >= required_exp),
-                },
-                # Project history
-                "relevant_projects": (
-                    [
-                        {
-                            "project_name": str(proj["project_name"]),
-                            "experience_summary": str(proj["experience_summary"]),
-                        }
-                        for _, proj in emp_projects.iterrows()
-                    ]
-                    if not emp_projects.empty
-                    else []
-                ),
-                # LLM reasoning
-                "llm_summary": str(llm_summary),
-                "ai_insight": str(llm_summary),  # Alias for frontend
-                # Original score
-                "similarity_score": float(match["final_score"]),
-            }
+            {k: v for k, v in result.items() if k in wanted} if wanted else result
         )
 
+    enrich.end()
     logger.info(f"✓ Generated detailed breakdowns for {len(final_results)} candidates")
     return final_results
 
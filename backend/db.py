@@ -0,0 +1,180 @@
+"""
+Database engine for the bench schema.
+
+Builds the SQLAlchemy engine used by ingestion and the API with a tuned,
+instrumented connection pool. Pool sizing, overflow, timeout, recycle and
+pre-ping come from environment variables, and BENCHMATCH_DB_URL can point the
+whole app at a local SQLite stand-in (see local_db.py) for offline load tests.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# AZURE SQL CONFIG (ENTRA ID AUTH)
+# ---------------------------
+# Using Entra ID (Azure AD) authentication with pyodbc + ODBC Driver 18
+AZURE_SQL_SERVER = "ai-db-dbs.database.windows.net"
+AZURE_SQL_DATABASE = "db_bench"
+
+# For Entra ID Integrated Authentication (uses Windows/Azure credentials)
+# No browser popup, uses current user's credentials
+AZURE_SQL_CONN_STR = (
+    f"mssql+pyodbc://@{AZURE_SQL_SERVER}/{AZURE_SQL_DATABASE}"
+    "?driver=ODBC+Driver+18+for+SQL+Server"
+    "&authentication=ActiveDirectoryIntegrated"
+)
+
+# Upper bounds (seconds) of the checkout-wait buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+# ---------------------------
+# POOL METRICS
+# ---------------------------
+class PoolStats:
+    """Thread-safe counters for connection checkout waits."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.buckets = [0] * len(WAIT_BUCKETS)
+
+    def record(self, wait, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_sum += wait
+            self.wait_max = max(self.wait_max, wait)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if wait <= bound:
+                    self.buckets[i] += 1
+                    break
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_sum": round(self.wait_sum, 6),
+                "wait_seconds_max": round(self.wait_max, 6),
+                "wait_seconds_avg": round(self.wait_sum / self.checkouts, 6) if self.checkouts else 0.0,
+                "wait_buckets": dict(zip(WAIT_BUCKETS, self.buckets)),
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - start)
+        return conn
+
+
+# ---------------------------
+# ENGINE
+# ---------------------------
+def _env_int(name, default):
+    return int(os.getenv(name, str(default)))
+
+
+def engine_options(url):
+    """Pool and driver options for the configured database URL."""
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": _env_int("BENCHMATCH_DB_POOL_SIZE", 10),
+        "max_overflow": _env_int("BENCHMATCH_DB_MAX_OVERFLOW", 20),
+        "pool_timeout": _env_int("BENCHMATCH_DB_POOL_TIMEOUT", 30),
+        # Azure SQL drops idle connections after ~30 minutes
+        "pool_recycle": _env_int("BENCHMATCH_DB_POOL_RECYCLE", 1800),
+        # Detect stale connections at checkout instead of surfacing them as 500s
+        "pool_pre_ping": os.getenv("BENCHMATCH_DB_POOL_PRE_PING", "1") == "1",
+    }
+    if url.startswith("mssql+pyodbc"):
+        # fast_executemany sends executemany() parameter sets to SQL Server
+        # in one batch instead of one round trip per row
+        options["fast_executemany"] = True
+    return options
+
+
+def database_url():
+    """BENCHMATCH_DB_URL if set (e.g. a local SQLite stand-in), else Azure SQL."""
+    return os.getenv("BENCHMATCH_DB_URL") or AZURE_SQL_CONN_STR
+
+
+# Create engine (lazy connection - only connects when needed)
+engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Get or create the SQLAlchemy engine."""
+    global engine
+    if engine is None:
+        with _engine_lock:
+            if engine is None:
+                url = database_url()
+                if url.startswith("sqlite"):
+                    from local_db import create_local_engine
+
+                    engine = create_local_engine(url, **engine_options(url))
+                else:
+                    logger.info(
+                        f"Connecting to Azure SQL: {AZURE_SQL_SERVER}/{AZURE_SQL_DATABASE} (Entra ID)"
+                    )
+                    engine = create_engine(url, **engine_options(url))
+    return engine
+
+
+def limit_clause(param="limit"):
+    """Dialect-specific row limit for a query ending in ORDER BY."""
+    if get_engine().dialect.name == "mssql":
+        return f"OFFSET 0 ROWS FETCH NEXT :{param} ROWS ONLY"
+    return f"LIMIT :{param}"
+
+
+def binary_order(column):
+    """ORDER BY term sorting `column` by code point, like Python string comparison."""
+    if get_engine().dialect.name == "mssql":
+        # The default collation is case-insensitive
+        return f"{column} COLLATE Latin1_General_BIN2"
+    return column
+
+
+def pool_status():
+    """Current pool occupancy plus checkout-wait metrics."""
+    status = {"checkout_wait": pool_stats.snapshot()}
+    if engine is not None:
+        pool = engine.pool
+        status.update(
+            {
+                "dialect": engine.dialect.name,
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+    return status
@@ -0,0 +1,219 @@
+"""
+Structured eligibility pre-filter for search.
+
+search_employees used to retrieve the nearest employees first and drop the
+ineligible ones afterwards, so a retrieval window full of allocated or
+under-qualified people left few usable candidates. This index resolves a
+request's hard constraints to an eligible set *before* retrieval, and the
+vector search then runs only within that set:
+
+- bitmaps (Python ints, bit i = employee row i) per bench status, per skill
+  name and per certification name;
+- experience years sorted once, so `min_experience` is a binary search.
+
+Bench status always acts as a hard constraint (only "active" employees are
+ever returned). Experience, skills and certifications are hard only when the
+request lists them in `hard_constraints`; otherwise they remain ranking boosts.
+
+The quantized index applies the set as a row mask. Chroma only gets it as a
+`$in` filter when it is small (BENCHMATCH_PREFILTER_MAX_IN IDs); a larger set
+is searched unfiltered with a proportionally wider window and post-filtered.
+"""
+
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PREFILTER_ENABLED = os.getenv("BENCHMATCH_PREFILTER", "1") == "1"
+# Largest eligible set sent to Chroma as a `$in` filter
+PREFILTER_MAX_IN = int(os.getenv("BENCHMATCH_PREFILTER_MAX_IN", "1000"))
+HARD_CONSTRAINTS = {"experience", "skills", "certifications"}
+
+
+def _bitmap_from_positions(positions, n):
+    mask = np.zeros(n, dtype=bool)
+    mask[np.asarray(positions, dtype=np.int64)] = True
+    return _bitmap_from_mask(mask)
+
+
+def _bitmap_from_mask(mask):
+    packed = np.packbits(np.asarray(mask, dtype=bool), bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def _mask_from_bitmap(bitmap, n):
+    nbytes = (n + 7) // 8
+    raw = np.frombuffer(bitmap.to_bytes(nbytes, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:n].astype(bool)
+
+
+class Eligible:
+    """Resolved eligible set: a boolean mask over index rows (IDs built on demand)."""
+
+    def __init__(self, index, bitmap):
+        self.index = index
+        self.bitmap = bitmap
+        self.mask = _mask_from_bitmap(bitmap, len(index.employee_ids))
+        self._count = bitmap.bit_count()
+        self._ids = None
+
+    @property
+    def ids(self):
+        """Eligible employee IDs (only built when a `$in` filter needs them)."""
+        if self._ids is None:
+            self._ids = [self.index.employee_ids[i] for i in np.flatnonzero(self.mask)]
+        return self._ids
+
+    def __len__(self):
+        return self._count
+
+    def selective(self, limit=PREFILTER_MAX_IN):
+        """True when the set is small enough to pass to Chroma as `$in`."""
+        return self._count <= limit
+
+    def widen(self, k):
+        """Unfiltered retrieval window expected to hold `k` eligible employees."""
+        total = len(self.index.employee_ids)
+        return min(total, -(-k * total // max(self._count, 1)))
+
+    def __contains__(self, employee_id):
+        position = self.index.position.get(employee_id)
+        return position is not None and bool(self.mask[position])
+
+    def mask_for(self, ids):
+        """Boolean mask aligned with another ordering of employee IDs."""
+        rows = self.index.rows_for(ids)
+        mask = np.zeros(len(rows), dtype=bool)
+        known = rows >= 0
+        mask[known] = self.mask[rows[known]]
+        return mask
+
+
+class EligibilityIndex:
+    """Bitmap / sorted-array index over the employee tables."""
+
+    def __init__(self, employees, skills, certs):
+        employees = employees.drop_duplicates("employee_id")
+        self.employee_ids = [str(e) for e in employees["employee_id"]]
+        self.position = {emp_id: i for i, emp_id in enumerate(self.employee_ids)}
+        self.all_bitmap = (1 << len(self.employee_ids)) - 1
+
+        # Experience: sorted once, resolved by binary search
+        experience = pd.to_numeric(employees["experience_years"], errors="coerce").fillna(0.0)
+        experience = experience.to_numpy(dtype=float)
+        self._exp_order = np.argsort(experience, kind="stable")
+        self._exp_sorted = experience[self._exp_order]
+
+        self.skill_bitmaps = self._name_bitmaps(skills, "skill_name")
+        self.cert_bitmaps = self._name_bitmaps(certs, "certificate_name")
+
+        self._lock = threading.Lock()
+        self._status_generation = None
+        self._status_bitmaps = {}
+        self._row_cache = {}
+        self._lookup_cache = {}
+
+    def _name_bitmaps(self, df, column):
+        """Lowercase name -> bitmap of employees holding it."""
+        rows = df["employee_id"].astype(str).map(self.position)
+        names = df[column].astype(str).str.lower()
+        frame = pd.DataFrame({"row": rows, "name": names}).dropna()
+        return {
+            name: _bitmap_from_positions(group["row"], len(self.employee_ids))
+            for name, group in frame.groupby("name")
+        }
+
+    # ---------------------------
+    # CONSTRAINT BITMAPS
+    # ---------------------------
+    def status_bitmap(self, status, bench):
+        """Employees whose live bench status is `status` (rebuilt on change)."""
+        with self._lock:
+            if self._status_generation != bench.generation:
+                grouped = {}
+                for emp_id, row in self.position.items():
+                    grouped.setdefault(bench.status(emp_id), []).append(row)
+                self._status_bitmaps = {
+                    s: _bitmap_from_positions(rows, len(self.employee_ids))
+                    for s, rows in grouped.items()
+                }
+                self._status_generation = bench.generation
+            return self._status_bitmaps.get(status, 0)
+
+    def experience_bitmap(self, min_experience):
+        """Employees with at least `min_experience` years."""
+        start = np.searchsorted(self._exp_sorted, min_experience, side="left")
+        mask = np.zeros(len(self.employee_ids), dtype=bool)
+        mask[self._exp_order[start:]] = True
+        return _bitmap_from_mask(mask)
+
+    def _substring_bitmap(self, kind, bitmaps, needle, both_ways=False):
+        # Same substring rules as the boost / breakdown scoring
+        key = (kind, needle)
+        cached = self._lookup_cache.get(key)
+        if cached is None:
+            cached = 0
+            for name, bitmap in bitmaps.items():
+                if needle in name or (both_ways and name in needle):
+                    cached |= bitmap
+            if len(self._lookup_cache) > 4096:
+                self._lookup_cache.clear()
+            self._lookup_cache[key] = cached
+        return cached
+
+    def skill_bitmap(self, skill):
+        """Employees with a skill whose name contains `skill`."""
+        return self._substring_bitmap("skill", self.skill_bitmaps, skill.lower().strip())
+
+    def cert_bitmap(self, cert):
+        """Employees holding `cert` (partial match, as in calculate_cert_matches)."""
+        return self._substring_bitmap("cert", self.cert_bitmaps, cert.lower().strip(), both_ways=True)
+
+    # ---------------------------
+    # RESOLVE
+    # ---------------------------
+    def resolve(self, bench, status="active", min_experience=0, skills=(), certs=(), hard_constraints=()):
+        """AND together the hard constraints of one request."""
+        hard = set(hard_constraints or ())
+        bitmap = self.status_bitmap(status, bench) if status else self.all_bitmap
+        if "experience" in hard and min_experience > 0:
+            bitmap &= self.experience_bitmap(min_experience)
+        if "skills" in hard:
+            for skill in skills:
+                bitmap &= self.skill_bitmap(skill)
+        if "certifications" in hard:
+            for cert in certs:
+                bitmap &= self.cert_bitmap(cert)
+        return Eligible(self, bitmap)
+
+    def rows_for(self, ids):
+        """Row of each ID in `ids` (-1 if unknown), cached per ID list."""
+        key = id(ids)
+        cached = self._row_cache.get(key)
+        if cached is None or cached[0] is not ids:
+            rows = np.fromiter((self.position.get(str(i), -1) for i in ids), dtype=np.int64, count=len(ids))
+            cached = (ids, rows)
+            self._row_cache = {key: cached}
+        return cached[1]
+
+
+_lock = threading.Lock()
+_loaded = {"key": None, "index": None}
+
+
+def get_eligibility_index(key, employees, skills, certs):
+    """Process-wide index, rebuilt when the tables' version `key` changes."""
+    if _loaded["key"] != key:
+        with _lock:
+            if _loaded["key"] != key:
+                _loaded["index"] = EligibilityIndex(employees, skills, certs)
+                _loaded["key"] = key
+                logger.info(
+                    f"🔹 Built eligibility index ({len(_loaded['index'].employee_ids)} employees)"
+                )
+    return _loaded["index"]
@@ -0,0 +1,90 @@
+"""
+Deterministic offline stand-ins for the Nomic embedder and the Ollama LLM.
+
+Selected with BENCHMATCH_EMBEDDER=fake and BENCHMATCH_LLM=fake (see
+data_ingestion.get_embedder / get_llm) so benchmarks and load tests run
+without network access or a local model, and give identical results run to run.
+
+FakeEmbedder hashes each word of a text into a few signed dimensions of a
+768-d vector (feature hashing), so texts sharing skills and roles land close
+together and vector search still ranks meaningfully. Optional artificial
+latency (BENCHMATCH_FAKE_EMBED_LATENCY / BENCHMATCH_FAKE_LLM_LATENCY, seconds
+per call) approximates the real services.
+"""
+
+import hashlib
+import os
+import re
+import time
+
+import numpy as np
+
+EMBED_DIM = 768
+# Signed dimensions each token contributes to
+_HASHES_PER_TOKEN = 4
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+
+class FakeEmbedder:
+    """Drop-in for `nomic.embed`: exposes text(texts=..., model=..., task_type=...)."""
+
+    def __init__(self, dim=EMBED_DIM, latency=None):
+        self.dim = dim
+        self.latency = (
+            float(os.getenv("BENCHMATCH_FAKE_EMBED_LATENCY", "0")) if latency is None else latency
+        )
+        self._token_cache = {}
+        self.calls = 0
+
+    def _token_slots(self, token):
+        slots = self._token_cache.get(token)
+        if slots is None:
+            digest = hashlib.blake2b(token.encode(), digest_size=4 * _HASHES_PER_TOKEN).digest()
+            values = np.frombuffer(digest, dtype=np.uint32)
+            slots = (values % self.dim, np.where(values & 1 << 31, -1.0, 1.0))
+            self._token_cache[token] = slots
+        return slots
+
+    def embed_one(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in _TOKEN_RE.findall(text.lower()):
+            index, sign = self._token_slots(token)
+            np.add.at(vector, index, sign)
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def text(self, texts, model=None, task_type=None, **_):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return {"embeddings": [self.embed_one(t) for t in texts]}
+
+
+class FakeCompletion:
+    def __init__(self, text):
+        self.text = text
+
+    def __str__(self):
+        return self.text
+
+
+class FakeLLM:
+    """Drop-in for the Ollama client: complete(prompt) -> response with str()."""
+
+    def __init__(self, latency=None):
+        self.latency = (
+            float(os.getenv("BENCHMATCH_FAKE_LLM_LATENCY", "0")) if latency is None else latency
+        )
+        self.calls = 0
+
+    def complete(self, prompt):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        overall = re.search(r"Overall Fit: (\d+)%", prompt)
+        candidate = re.search(r"\*\*Candidate #\d+: (.+?)\*\*", prompt)
+        return FakeCompletion(
+            f"{candidate.group(1) if candidate else 'Candidate'} has an overall fit of "
+            f"{overall.group(1) if overall else '?'}% for this requirement. "
+            "Generated offline by the fake LLM provider."
+        )
@@ -0,0 +1,70 @@
+"""
+Fast JSON encoding for large API payloads.
+
+Search responses carry nested breakdowns, skill tables, cert details and
+project histories built from pandas rows. FastAPI's default path runs every
+value through jsonable_encoder before json.dumps; FastJSONResponse skips that
+and serializes numpy/pandas scalars natively with orjson (optional - falls back
+to the stdlib encoder with the same conversions when orjson isn't installed).
+"""
+
+import datetime
+import decimal
+import json
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+def _default(obj):
+    """Convert the values orjson / json can't serialize on their own."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """Serialize to JSON bytes, handling numpy and pandas scalars."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(obj) -> str:
+    """Serialize to a JSON string (for storing in text columns)."""
+    return dumps(obj).decode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that bypasses jsonable_encoder and renders with dumps()."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def project(records, fields):
+    """Keep only the requested top-level keys of each record."""
+    if not fields:
+        return records
+    wanted = set(fields)
+    return [{k: v for k, v in record.items() if k in wanted} for record in records]
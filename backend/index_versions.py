@@ -0,0 +1,173 @@
+"""
+Versioned vector indexes with an atomic blue/green pointer.
+
+ingest() builds every run into a fresh Chroma collection (employees_<version>)
+and compact index directory (vector_index/<version>) while /search keeps
+reading the active version. Only when the build is complete is the version
+published by atomically replacing the pointer file, which every worker checks
+(by mtime) on each search. Older versions are garbage-collected, keeping the
+newest BENCHMATCH_INDEX_KEEP so `python main.py rollback` can flip back
+instantly without re-embedding.
+
+The columnar snapshot (snapshot.py) built from the same data is swapped with
+the index: the pointer records each version's snapshot, publish() activates it
+with the version and rollback() restores the one of the version it returns to.
+
+Without a pointer file (indexes ingested before versioning) search reads the
+unversioned `employees` collection and vector_index/ directory.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import snapshot
+import vector_index
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+POINTER_PATH = Path(os.getenv("BENCHMATCH_INDEX_POINTER", "chroma_data/ACTIVE_INDEX.json"))
+# Published versions kept (active + rollback targets)
+KEEP_VERSIONS = int(os.getenv("BENCHMATCH_INDEX_KEEP", "2"))
+# Unversioned collection name (data_ingestion.COLLECTION_NAME)
+BASE_COLLECTION = "employees"
+
+
+def new_version():
+    """Sortable version id for a new build."""
+    now = time.time()
+    return time.strftime("v%Y%m%d%H%M%S", time.localtime(now)) + f"{int(now * 1000) % 1000:03d}"
+
+
+def collection_name(version=None):
+    """Chroma collection for `version` (default: the active one)."""
+    version = version or active_version()
+    return f"{BASE_COLLECTION}_{version}" if version else BASE_COLLECTION
+
+
+def vector_index_dir(version=None):
+    """Compact index directory for `version` (default: the active one)."""
+    version = version or active_version()
+    return vector_index.INDEX_DIR / version if version else vector_index.INDEX_DIR
+
+
+# ---------------------------
+# POINTER
+# ---------------------------
+_lock = threading.Lock()
+_cached = {"mtime": None, "state": None}
+
+
+def read_pointer():
+    """
+    {"active": version or None, "versions": [published, oldest first],
+     "snapshots": {version: snapshot version}}
+    """
+    try:
+        mtime = POINTER_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {"active": None, "versions": [], "snapshots": {}}
+    if _cached["mtime"] != mtime:
+        with _lock:
+            _cached["state"] = {"snapshots": {}, **json.loads(POINTER_PATH.read_text())}
+            _cached["mtime"] = mtime
+    return _cached["state"]
+
+
+def active_version():
+    return read_pointer()["active"]
+
+
+def _write_pointer(state):
+    POINTER_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = POINTER_PATH.with_name(f".{POINTER_PATH.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, POINTER_PATH)
+
+
+def _activate_snapshot(version, snapshots):
+    snapshot_version = snapshots.get(version)
+    if snapshot_version is None:
+        return
+    try:
+        snapshot.activate_snapshot(snapshot_version, protect=set(snapshots.values()))
+    except ValueError as e:
+        # Pruned or never staged here (e.g. another snapshot directory)
+        logger.warning(f"Snapshot of index version {version} not restored: {e}")
+
+
+def publish(version, snapshot_version=None):
+    """
+    Make a fully built `version` the active index, together with the
+    snapshot staged from the same data (if any).
+    """
+    state = read_pointer()
+    versions = [v for v in state["versions"] if v != version] + [version]
+    snapshots = dict(state["snapshots"])
+    if snapshot_version is not None:
+        snapshots[version] = snapshot_version
+    _activate_snapshot(version, snapshots)
+    _write_pointer({"active": version, "versions": versions, "snapshots": snapshots, "published_at": time.time()})
+    logger.info(f"✓ Activated index version {version} (previous: {state['active']})")
+
+
+def rollback(version=None):
+    """
+    Point search back at `version`, or at the version published before the
+    active one. Returns the newly active version.
+    """
+    state = read_pointer()
+    versions = state["versions"]
+    if version is None:
+        if state["active"] not in versions or versions.index(state["active"]) == 0:
+            raise ValueError("No earlier index version to roll back to")
+        version = versions[versions.index(state["active"]) - 1]
+    elif version not in versions:
+        raise ValueError(f"Unknown index version: {version} (available: {versions})")
+
+    _activate_snapshot(version, state["snapshots"])
+    _write_pointer({**state, "active": version, "published_at": time.time()})
+    logger.info(f"✓ Rolled index back from {state['active']} to {version}")
+    return version
+
+
+# ---------------------------
+# GARBAGE COLLECTION
+# ---------------------------
+def garbage_collect(client, keep=KEEP_VERSIONS, protect=()):
+    """
+    Drop collections and compact indexes of all but the newest `keep`
+    published versions (never the active one), plus abandoned builds.
+    Versions in `protect` (unfinished, resumable builds) are left alone.
+    """
+    state = read_pointer()
+    versions = state["versions"]
+    kept = set(versions[-keep:]) | {state["active"]} | set(protect)
+    retired = [v for v in versions if v not in kept]
+    if retired:
+        _write_pointer({
+            **state,
+            "versions": [v for v in versions if v in kept],
+            "snapshots": {v: snap for v, snap in state["snapshots"].items() if v in kept},
+        })
+
+    prefix = f"{BASE_COLLECTION}_v"
+    # client is None when ingest skipped Chroma (quantized-only index)
+    for collection in client.list_collections() if client is not None else ():
+        name = getattr(collection, "name", collection)
+        if name.startswith(prefix) and name[len(BASE_COLLECTION) + 1:] not in kept:
+            client.delete_collection(name)
+            logger.info(f"🗑️  Dropped collection {name}")
+
+    if vector_index.INDEX_DIR.exists():
+        for path in vector_index.INDEX_DIR.iterdir():
+            if path.is_dir() and path.name.startswith("v") and path.name not in kept:
+                shutil.rmtree(path, ignore_errors=True)
+    return retired
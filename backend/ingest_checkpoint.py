@@ -0,0 +1,326 @@
+"""
+Durable checkpoints for ingest() runs, so a failed run can be resumed.
+
+Every ingest run gets a run id and a directory under
+BENCHMATCH_INGEST_RUNS_DIR (ingest_runs/<run_id>/):
+
+- checkpoint.json   run state, atomically replaced after every batch:
+                    {"run_id", "version", "state", "last_batch",
+                     "succeeded", "failed", ...}
+- batches/NNNNNN.npz  ids, float32 embeddings, texts and metadata of one batch
+- employees.jsonl   per-employee status lines ({"employee_id", "batch",
+                    "status": "ok" | "failed", "error"}); the last line wins
+- report.json       end-of-run report listing the failed employee IDs
+
+A batch is committed by writing its vectors, then appending its statuses
+(fsynced), then the checkpoint, so an employee only counts as done once its
+"ok" line is on disk. `python main.py ingest --resume [RUN_ID]` continues an
+unfinished run (the latest by default) into the same index version, skipping
+employees already committed. `python main.py ingest --retry-failed RUN_ID`
+re-embeds only the employees a finished run reported as failed and publishes
+a new index version from the checkpointed vectors plus the retried ones.
+`python main.py ingest --incremental` reuses the vectors of the run that
+published the active version for every employee whose text is unchanged
+(VectorReuse) and only embeds the rest.
+The newest BENCHMATCH_INGEST_RUNS_KEEP (5) runs are kept, plus the runs
+that published a retained index version and unfinished runs updated within
+BENCHMATCH_INGEST_RUNS_STALE (7 days).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+RUNS_DIR = Path(os.getenv("BENCHMATCH_INGEST_RUNS_DIR", "ingest_runs"))
+RUNS_KEEP = int(os.getenv("BENCHMATCH_INGEST_RUNS_KEEP", "5"))
+# Unfinished runs untouched this long are no longer kept for --resume
+RUNS_STALE_SECONDS = float(os.getenv("BENCHMATCH_INGEST_RUNS_STALE", str(7 * 24 * 3600)))
+
+RUNNING = "running"
+COMPLETED = "completed"
+
+
+def _write_json(path, data):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+# ---------------------------
+# RUN
+# ---------------------------
+class IngestRun:
+    """One ingest run's checkpoint directory."""
+
+    def __init__(self, run_id, directory=RUNS_DIR):
+        self.run_id = run_id
+        self.path = Path(directory) / run_id
+        self.state = json.loads((self.path / "checkpoint.json").read_text())
+        self._status = None
+        # A crash between the status append and the checkpoint leaves the
+        # checkpoint a batch behind; never reuse a batch number with statuses
+        statuses = self.statuses()
+        self.state["last_batch"] = max([self.state["last_batch"]] + [s["batch"] for s in statuses.values()])
+        self.state["succeeded"] = sum(1 for s in statuses.values() if s["status"] == "ok")
+        self.state["failed"] = len(statuses) - self.state["succeeded"]
+        self.state["reused"] = sum(1 for s in statuses.values() if s.get("reused"))
+
+    @classmethod
+    def create(cls, version, directory=RUNS_DIR, **details):
+        """Start a new run building index `version`."""
+        run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 1_000_000_000:09d}"
+        path = Path(directory) / run_id
+        (path / "batches").mkdir(parents=True)
+        _write_json(path / "checkpoint.json", {
+            "run_id": run_id,
+            "version": version,
+            "state": RUNNING,
+            "started_at": time.time(),
+            "updated_at": time.time(),
+            "last_batch": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "reused": 0,
+            **details,
+        })
+        logger.info(f"🔹 Ingest run {run_id} (checkpoints in {path}/)")
+        return cls(run_id, directory)
+
+    @property
+    def version(self):
+        return self.state["version"]
+
+    def statuses(self):
+        """employee_id -> latest {"status", "batch", "error"}."""
+        if self._status is None:
+            self._status = {}
+            try:
+                with open(self.path / "employees.jsonl", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # Torn last line from a crash mid-append
+                            continue
+                        self._status[entry.pop("employee_id")] = entry
+            except FileNotFoundError:
+                pass
+        return self._status
+
+    def done_ids(self):
+        return {e for e, s in self.statuses().items() if s["status"] == "ok"}
+
+    def failed_ids(self):
+        return {e: s.get("error") for e, s in self.statuses().items() if s["status"] == "failed"}
+
+    def commit_batch(self, ids, vectors, texts, metadatas, failures, reused=()):
+        """
+        Durably record one batch: embedded `ids` (with their vectors, texts
+        and metadata) as ok, `failures` (employee_id -> error) as failed.
+        IDs in `reused` took their vector from an earlier run.
+        """
+        batch = self.state["last_batch"] + 1
+        if ids:
+            tmp = self.path / "batches" / f".{batch:06d}.npz"
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f,
+                    ids=np.array(ids, dtype=str),
+                    vectors=np.asarray(vectors, dtype=np.float32),
+                    texts=np.array(texts, dtype=str),
+                    metadatas=np.array(json.dumps(metadatas)),
+                )
+            os.replace(tmp, self.path / "batches" / f"{batch:06d}.npz")
+
+        lines = [
+            {"employee_id": e, "batch": batch, "status": "ok", **({"reused": True} if e in reused else {})}
+            for e in ids
+        ] + [
+            {"employee_id": e, "batch": batch, "status": "failed", "error": str(err)[:500]}
+            for e, err in failures.items()
+        ]
+        with open(self.path / "employees.jsonl", "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(line) + "\n" for line in lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+        statuses = self.statuses()
+        for line in lines:
+            previous = statuses.get(line["employee_id"])
+            if previous is not None:
+                self._count(previous, -1)
+            self._count(line, 1)
+            statuses[line.pop("employee_id")] = line
+        self.state.update(last_batch=batch, updated_at=time.time())
+        _write_json(self.path / "checkpoint.json", self.state)
+        return batch
+
+    def _count(self, entry, delta):
+        self.state["succeeded" if entry["status"] == "ok" else "failed"] += delta
+        if entry.get("reused"):
+            self.state["reused"] += delta
+
+    def _ok_batches(self):
+        """Yield (batch file, loaded npz, rows whose latest status is ok in that batch)."""
+        statuses = self.statuses()
+        for path in sorted((self.path / "batches").glob("[0-9]*.npz")):
+            batch = int(path.stem)
+            with np.load(path) as data:
+                keep = [
+                    i for i, e in enumerate(data["ids"].tolist())
+                    if statuses.get(e, {}).get("status") == "ok" and statuses[e]["batch"] == batch
+                ]
+                if keep:
+                    yield path, data, keep
+
+    def iter_vectors(self):
+        """Yield (ids, vectors, texts, metadatas) of every employee whose latest status is ok."""
+        for _, data, keep in self._ok_batches():
+            metadatas = json.loads(str(data["metadatas"]))
+            yield (
+                [str(data["ids"][i]) for i in keep],
+                data["vectors"][keep],
+                [str(data["texts"][i]) for i in keep],
+                [metadatas[i] for i in keep],
+            )
+
+    def update(self, **changes):
+        self.state.update(changes, updated_at=time.time())
+        _write_json(self.path / "checkpoint.json", self.state)
+
+    def finish(self, published, **details):
+        """Mark the run completed and write its report; returns the report."""
+        failed = self.failed_ids()
+        report = {
+            "run_id": self.run_id,
+            "version": self.version,
+            "published": published,
+            "succeeded": self.state["succeeded"],
+            "embedded": self.state["succeeded"] - self.state["reused"],
+            "reused": self.state["reused"],
+            "failed": len(failed),
+            "failed_employees": failed,
+            "started_at": self.state["started_at"],
+            "finished_at": time.time(),
+            **details,
+        }
+        _write_json(self.path / "report.json", report)
+        self.update(state=COMPLETED, failed=len(failed), published=published)
+        if failed:
+            sample = ", ".join(sorted(failed)[:20])
+            logger.warning(
+                f"⚠️  Run {self.run_id}: {len(failed)} employees failed ({sample}{', ...' if len(failed) > 20 else ''}); "
+                f"retry them with `python main.py ingest --retry-failed {self.run_id}`"
+            )
+        return report
+
+
+def text_digest(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:20]
+
+
+class VectorReuse:
+    """
+    Embeddings of an earlier run, reused by an incremental run for every
+    employee whose embedded text is unchanged (compared by hash). Only
+    employee_id -> (text hash, batch file, row) is kept in memory; vectors
+    are read from the batch files one file at a time.
+    """
+
+    def __init__(self, run):
+        self.run_id = run.run_id
+        self._where = {}
+        for path, data, keep in run._ok_batches():
+            ids, texts = data["ids"], data["texts"]
+            for i in keep:
+                self._where[str(ids[i])] = (text_digest(str(texts[i])), path, i)
+        self._cached = (None, None)
+
+    def __len__(self):
+        return len(self._where)
+
+    def get(self, employee_id, text):
+        """The earlier vector for `employee_id` if its text is unchanged, else None."""
+        entry = self._where.get(employee_id)
+        if entry is None or entry[0] != text_digest(text):
+            return None
+        _, path, row = entry
+        if self._cached[0] != path:
+            with np.load(path) as data:
+                self._cached = (path, data["vectors"])
+        return self._cached[1][row]
+
+
+# ---------------------------
+# LOOKUP / RETENTION
+# ---------------------------
+def list_runs(directory=RUNS_DIR):
+    """Checkpoint states of all runs, oldest first."""
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    runs = []
+    for path in sorted(p for p in directory.iterdir() if p.is_dir()):
+        try:
+            runs.append(json.loads((path / "checkpoint.json").read_text()))
+        except (FileNotFoundError, ValueError):
+            continue
+    return runs
+
+
+def load_run(run_id=None, directory=RUNS_DIR):
+    """A run by id, or the latest unfinished one when run_id is None."""
+    if run_id is None:
+        unfinished = [r for r in list_runs(directory) if r["state"] == RUNNING]
+        if not unfinished:
+            raise ValueError("No unfinished ingest run to resume")
+        run_id = unfinished[-1]["run_id"]
+    if not (Path(directory) / run_id / "checkpoint.json").exists():
+        raise ValueError(f"Unknown ingest run: {run_id}")
+    return IngestRun(run_id, directory)
+
+
+def latest_published_run(version, directory=RUNS_DIR):
+    """Newest completed run that published index `version`, or None."""
+    for run in reversed(list_runs(directory)):
+        if run["state"] == COMPLETED and run.get("published") and run["version"] == version:
+            return IngestRun(run["run_id"], directory)
+    return None
+
+
+def resumable_versions(directory=RUNS_DIR):
+    """Index versions of unfinished runs (their partial builds must survive GC)."""
+    return {r["version"] for r in list_runs(directory) if r["state"] == RUNNING}
+
+
+def prune_runs(directory=RUNS_DIR, keep=RUNS_KEEP, protect=(), stale_seconds=RUNS_STALE_SECONDS):
+    """
+    Delete all but the `keep` newest run directories, except runs that
+    published an index version in `protect` (incremental runs reuse them)
+    and unfinished runs updated within `stale_seconds` (still resumable).
+    """
+    runs = list_runs(directory)
+    now = time.time()
+    for run in runs[:-keep] if keep > 0 else runs:
+        if run.get("published") and run["version"] in protect:
+            continue
+        if run["state"] == RUNNING:
+            if now - run.get("updated_at", 0) < stale_seconds:
+                continue
+            logger.warning(
+                f"⚠️  Removing unfinished ingest run {run['run_id']} (no progress for "
+                f"{(now - run.get('updated_at', 0)) / 3600:.0f} h); it can no longer be resumed"
+            )
+        shutil.rmtree(Path(directory) / run["run_id"], ignore_errors=True)
+        logger.info(f"🗑️  Removed ingest run {run['run_id']}")
@@ -0,0 +1,165 @@
+"""
+Local SQLite stand-in for the Azure SQL bench schema.
+
+The bench.* tables live in a second SQLite file ATTACHed as "bench" on every
+connection, so the API's SQL runs unchanged (bench.client_requirements etc.),
+and GETDATE() is registered as a SQLite function. Point the app at it with:
+
+    BENCHMATCH_DB_URL=sqlite:///storage/bench_local.db
+
+Usage:
+    python local_db.py [sqlite-url] [--seed]   # create schema (and load data/*.csv)
+"""
+
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_URL = "sqlite:///storage/bench_local.db"
+
+# Mirrors the columns the API and ingestion read/write in Azure SQL
+BENCH_SCHEMA = {
+    "employees": """
+        employee_id TEXT PRIMARY KEY, name TEXT, email TEXT, role TEXT,
+        experience_years REAL, primary_skill TEXT
+    """,
+    "skills": """
+        skill_id TEXT PRIMARY KEY, employee_id TEXT, skill_name TEXT,
+        skill_level TEXT, years_experience REAL
+    """,
+    "certifications": """
+        certification_id TEXT PRIMARY KEY, certificate_name TEXT,
+        employee_id TEXT, issued_by TEXT, validity TEXT
+    """,
+    "project_history": """
+        project_id TEXT PRIMARY KEY, employee_id TEXT, project_name TEXT,
+        client TEXT, role TEXT, tools_used TEXT, experience_summary TEXT
+    """,
+    "bench_status": """
+        employee_id TEXT, status TEXT, since_date TEXT,
+        end_date TEXT, salary REAL, allocated_to_requirement_id TEXT,
+        allocated_date TEXT,
+        last_updated TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+    """,
+    "client_requirements": """
+        requirement_id TEXT PRIMARY KEY, client_name TEXT, role_title TEXT,
+        status TEXT, submitted_date TEXT, min_experience INTEGER,
+        mandatory_certs TEXT, availability_date TEXT, summary TEXT,
+        required_skills TEXT, matched_candidates INTEGER NOT NULL DEFAULT 0
+    """,
+    "candidate_shortlists": """
+        shortlist_id TEXT PRIMARY KEY, requirement_id TEXT,
+        generated_at TEXT, engine_version TEXT, total_candidates INTEGER
+    """,
+    "candidate_shortlist_items": """
+        shortlist_item_id TEXT PRIMARY KEY, shortlist_id TEXT,
+        employee_id TEXT, rank INTEGER, overall_fit_score INTEGER,
+        skill_match_score INTEGER, experience_score INTEGER,
+        availability_score INTEGER, certifications_score INTEGER,
+        bench_status TEXT, reason_for_ranking TEXT, strengths TEXT,
+        gaps TEXT, llm_summary TEXT, llm_breakdown_json TEXT,
+        selected INTEGER DEFAULT 0, selected_date TEXT
+    """,
+    "match_history": """
+        match_run_id TEXT PRIMARY KEY, requirement_id TEXT,
+        run_timestamp TEXT, status TEXT, top_candidate_id TEXT,
+        top_candidate_fit INTEGER, engine_version TEXT
+    """,
+}
+
+BENCH_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS bench.ix_requirements_submitted ON client_requirements (submitted_date DESC, requirement_id DESC)",
+    "CREATE INDEX IF NOT EXISTS bench.ix_shortlists_requirement ON candidate_shortlists (requirement_id)",
+    "CREATE INDEX IF NOT EXISTS bench.ix_items_shortlist ON candidate_shortlist_items (shortlist_id)",
+    "CREATE INDEX IF NOT EXISTS bench.ix_bench_status_employee ON bench_status (employee_id)",
+    "CREATE INDEX IF NOT EXISTS bench.ix_bench_status_last_updated ON bench_status (last_updated)",
+    "CREATE INDEX IF NOT EXISTS bench.ix_skills_employee ON skills (employee_id)",
+    "CREATE INDEX IF NOT EXISTS bench.ix_certs_employee ON certifications (employee_id)",
+    "CREATE INDEX IF NOT EXISTS bench.ix_projects_employee ON project_history (employee_id)",
+]
+
+# CSV file -> bench table
+CSV_TABLES = {
+    "employees.csv": "employees",
+    "skills.csv": "skills",
+    "certifications.csv": "certifications",
+    "project_history.csv": "project_history",
+    "bench_status.csv": "bench_status",
+}
+
+
+def _getdate():
+    return datetime.now().isoformat(sep=" ", timespec="milliseconds")
+
+
+def bench_path(url):
+    """Path of the SQLite file attached as the bench schema."""
+    database = make_url(url).database
+    if not database or database == ":memory:":
+        raise ValueError("The local stand-in needs a file-based SQLite URL")
+    path = Path(database)
+    return path.with_name(f"{path.stem}.bench{path.suffix or '.db'}")
+
+
+def create_local_engine(url=DEFAULT_URL, **options):
+    """Create a SQLite engine with the bench schema attached and created."""
+    attached = bench_path(url)
+    attached.parent.mkdir(parents=True, exist_ok=True)
+
+    options.pop("fast_executemany", None)
+    options.setdefault("connect_args", {"timeout": 30, "check_same_thread": False})
+    engine = create_engine(url, **options)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        dbapi_conn.execute(f"ATTACH DATABASE '{attached}' AS bench")
+        dbapi_conn.execute("PRAGMA journal_mode=WAL")
+        dbapi_conn.execute("PRAGMA bench.journal_mode=WAL")
+        dbapi_conn.create_function("GETDATE", 0, _getdate)
+
+    create_schema(engine)
+    logger.info(f"Using local SQLite stand-in: {url} (bench schema in {attached})")
+    return engine
+
+
+def create_schema(engine):
+    """Create the bench.* tables if they don't exist."""
+    with engine.begin() as conn:
+        for table, columns in BENCH_SCHEMA.items():
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS bench.{table} ({columns})"))
+        for statement in BENCH_INDEXES:
+            conn.execute(text(statement))
+
+
+def seed_from_csvs(engine, data_dir=Path("data")):
+    """Load the employee CSVs into the bench tables (replacing existing rows)."""
+    with engine.begin() as conn:
+        for filename, table in CSV_TABLES.items():
+            df = pd.read_csv(Path(data_dir) / filename)
+            rows = df.astype(object).where(df.notna(), None).to_dict("records")
+            columns = list(df.columns)
+            conn.execute(text(f"DELETE FROM bench.{table}"))
+            if rows:
+                conn.execute(
+                    text(
+                        f"INSERT INTO bench.{table} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join(':' + c for c in columns)})"
+                    ),
+                    rows,
+                )
+            logger.info(f"Seeded bench.{table} with {len(rows)} rows")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    local_engine = create_local_engine(args[0] if args else DEFAULT_URL)
+    if "--seed" in sys.argv:
+        seed_from_csvs(local_engine)
@@ -1,10 +1,36 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager, contextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from data_ingestion import ingest, search_employees, get_engine
+from fastapi.responses import JSONResponse, PlainTextResponse
+from data_ingestion import ingest, search_employees, get_data_version, get_engine
+from db import limit_clause, pool_status
+from assignment import assign_requirements, DEFAULT_TOP_K
+from shortlist_store import (
+    ENGINE_VERSION,
+    INSERT_MATCH_HISTORY,
+    mark_in_progress,
+    prepare_shortlist,
+    store_shortlist,
+)
+import index_versions
+from eligibility_index import HARD_CONSTRAINTS
+from bench_status_index import bench_index
+import precompute
+import metrics
+import profiling
+import reingest_scheduler
+import tracing
+import traffic_capture
+import warmup
+import write_behind
+from fast_json import FastJSONResponse, project
+from response_cache import etag_matches, get_or_load, invalidate_requirement
 import logging
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+import base64
 import json
+import time
 import uuid
 from datetime import datetime
 from sqlalchemy import text
@@ -12,7 +38,26 @@ from sqlalchemy import text
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="BenchMatch AI API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up heavy clients, start background workers, flush them on shutdown."""
+    warmup.start_warm_up()
+    if write_behind.WRITE_BEHIND_ENABLED:
+        # Replays anything left in the journal by a previous process
+        write_behind.get_queue().start()
+    # Picks up bench-status changes made by other workers / outside the API
+    bench_index.start()
+    # Optional interval / on-change re-ingest in a throttled child process
+    reingest_scheduler.scheduler.start()
+    yield
+    reingest_scheduler.scheduler.stop()
+    bench_index.stop()
+    if write_behind.WRITE_BEHIND_ENABLED:
+        write_behind.get_queue().stop()
+
+
+app = FastAPI(title="BenchMatch AI API", version="1.0.0", lifespan=lifespan)
 
 # ========================================
 # CORS MIDDLEWARE
@@ -25,6 +70,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# ========================================
+# METRICS MIDDLEWARE
+# ========================================
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Request latency histogram per endpoint and in-flight gauge."""
+    metrics.REQUESTS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.REQUESTS_IN_FLIGHT.dec()
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", "unmatched")
+        metrics.REQUEST_DURATION.labels(request.method, endpoint, status).observe(
+            time.perf_counter() - start
+        )
+
 # ========================================
 # AZURE SQL HELPER FUNCTIONS
 # ========================================
@@ -71,6 +138,12 @@ class SearchRequest(BaseModel):
     requirement_summary: Optional[str] = ""
     top_n: Optional[int] = 5
     allow_partial: Optional[bool] = True
+    # Optional projection of each match, e.g. ["rank", "employee_id", "overall_fit_score"]
+    fields: Optional[List[str]] = None
+    # Constraints enforced before retrieval: "experience", "skills", "certifications"
+    hard_constraints: Optional[List[str]] = None
+    # Include per-stage timings in the response body
+    trace: Optional[bool] = False
 
 
 class CreateRequirementRequest(BaseModel):
@@ -89,6 +162,14 @@ class SelectCandidateRequest(BaseModel):
     hired_by: Optional[str] = None
 
 
+class AssignmentRequest(BaseModel):
+    """Request body for a global assignment run across requirements."""
+    requirement_ids: Optional[List[str]] = None  # Default: all open requirements
+    capacities: Optional[Dict[str, int]] = None  # Headcount per requirement (default 1)
+    top_k: int = DEFAULT_TOP_K
+    min_score: int = 0
+
+
 @app.get("/")
 def root():
     return {"status": "ok", "message": "BenchMatch AI API is running"}
@@ -99,6 +180,95 @@ def hello_world():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready():
+    """
+    GET /ready
+    Readiness probe: which subsystems (vector store, embedder, database, LLM)
+    have been initialized. 503 until every required subsystem is warm.
+    """
+    payload = {"ready": warmup.is_ready(), "subsystems": warmup.status()}
+    return JSONResponse(payload, status_code=200 if payload["ready"] else 503)
+
+
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus text-format metrics for this worker."""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, http_request: Request):
+    """
+    GET /profiles/{profile_id}
+    Download a stored request profile in collapsed-stack format
+    (flamegraph.pl / speedscope). Requires X-Admin-Token.
+    """
+    try:
+        profiling.authorize(http_request.headers.get("x-admin-token"))
+    except profiling.ProfileRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    folded = profiling.read_profile(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return PlainTextResponse(folded)
+
+
+@contextmanager
+def profiled(http_request: Request, enabled: bool, endpoint: str):
+    """Run the block under the sampling profiler when `?profile=true`."""
+    if not enabled:
+        yield None
+        return
+    try:
+        session = profiling.start(http_request.headers.get("x-admin-token"), endpoint)
+    except profiling.ProfileRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    try:
+        yield session
+    finally:
+        session.stop()
+
+
+def attach_profile(result, response: Response, session):
+    """Add the profile summary to a read response (header only on a 304)."""
+    if session is None:
+        return result
+    if isinstance(result, Response):
+        result.headers["X-Profile-Id"] = session.profile_id
+        return result
+    response.headers["X-Profile-Id"] = session.profile_id
+    return {**result, "profile": session.summary()}
+
+
+@app.get("/health/db")
+def db_health():
+    """
+    GET /health/db
+    Round-trip a trivial query and report connection pool occupancy and
+    checkout-wait metrics.
+    """
+    try:
+        start = time.perf_counter()
+        with get_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+        latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        return {"status": "ok", "latency_ms": latency_ms, "pool": pool_status()}
+    except Exception as e:
+        logger.error(f"Database health check failed: {e}")
+        raise HTTPException(status_code=503, detail=f"Database unavailable: {str(e)}")
+
+
+@app.get("/reingest/status")
+def reingest_status():
+    """
+    GET /reingest/status
+    Background re-ingest scheduler: configuration, the run in progress (with
+    checkpoint progress) and the stats of the last run.
+    """
+    return reingest_scheduler.scheduler.status()
+
+
 # ========================================
 # POST ENDPOINTS - CREATE/STORE DATA
 # ========================================
@@ -143,6 +313,15 @@ def create_requirement(request: CreateRequirementRequest):
         })
         
         logger.info(f"✓ Created requirement {requirement_id} for {request.client_name}")
+
+        # Speculatively compute the shortlist while the user reviews the form
+        precompute.enqueue(requirement_id, {
+            "required_skills": request.required_skills,
+            "required_certs": request.mandatory_certifications,
+            "min_experience": request.minimum_experience,
+            "role_title": request.role_title,
+            "requirement_summary": request.requirement_summary,
+        })
         
         return {
             "status": "success",
@@ -166,193 +345,289 @@ def create_requirement(request: CreateRequirementRequest):
 
 
 @app.post("/search")
-def search(request: SearchRequest):
+def search(request: SearchRequest, http_request: Request, profile: bool = False):
     """
     POST /search
-    Semantic search endpoint - Stores results to Azure SQL.
+    Runs the search under a trace. Stage timings are returned as a
+    Server-Timing header with `X-Trace: 1`, and also as a `timings`
+    field when the body sets `"trace": true`. `?profile=true` (with
+    X-Admin-Token) also samples the request and returns a `profile` summary.
+    """
+    with profiled(http_request, profile, "search") as session:
+        with tracing.start_trace() as trace:
+            payload = run_search(request)
+
+    headers = None
+    if request.trace or http_request.headers.get("x-trace") == "1":
+        headers = {"Server-Timing": trace.server_timing()}
+        if request.trace:
+            payload["timings"] = trace.summary()
+    if session is not None:
+        headers = {**(headers or {}), "X-Profile-Id": session.profile_id}
+        payload["profile"] = session.summary()
+
+    # Serialize numpy/pandas values directly instead of via jsonable_encoder
+    return FastJSONResponse(payload, headers=headers)
+
+
+def run_search(request: SearchRequest):
+    """
+    Semantic search - Stores results to Azure SQL.
     
     Flow:
-    1. Run embedding search to find matching candidates
-    2. Store shortlist in bench.candidate_shortlists
-    3. Store each candidate in bench.candidate_shortlist_items
-    4. Update requirement status to 'In Progress'
+    1. Reuse the shortlist precomputed on requirement creation, if the
+       parameters and data version still match
+    2. Otherwise run embedding search to find matching candidates
+    3. Store shortlist in bench.candidate_shortlists
+    4. Store each candidate in bench.candidate_shortlist_items
+    5. Update requirement status to 'In Progress'
     """
-    try:
-        # Run the search
-        results = search_employees(
-            required_skills=request.required_skills,
-            required_certs=request.required_certs or [],
-            min_experience=request.min_experience,
-            role_title=request.role_title,
-            requirement_summary=request.requirement_summary or "",
-            top_n=request.top_n,
-            allow_partial=request.allow_partial,
+    unknown = set(request.hard_constraints or []) - HARD_CONSTRAINTS
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown hard_constraints {sorted(unknown)}; expected {sorted(HARD_CONSTRAINTS)}",
         )
-        
-        # If requirement_id provided, store results to database
+
+    try:
+        search_params = {
+            "required_skills": request.required_skills,
+            "required_certs": request.required_certs or [],
+            "min_experience": request.min_experience,
+            "role_title": request.role_title,
+            "requirement_summary": request.requirement_summary or "",
+            "top_n": request.top_n,
+            "allow_partial": request.allow_partial,
+            "hard_constraints": request.hard_constraints,
+        }
+
+        # Reuse the shortlist precomputed on requirement creation if still valid
+        precomputed = None
+        if request.requirement_id:
+            with tracing.span("precompute_lookup"):
+                precomputed = precompute.lookup(request.requirement_id, search_params)
+
         stored_shortlist_id = None
         stored_candidates = []
-        if request.requirement_id:
-            try:
-                engine = get_engine()
-                shortlist_id = f"SL-{str(uuid.uuid4())[:8].upper()}"
-
-                insert_shortlist = """
-                    INSERT INTO bench.candidate_shortlists (
-                        shortlist_id, requirement_id, generated_at, 
-                        engine_version, total_candidates
-                    ) VALUES (
-                        :sl_id, :req_id, GETDATE(), '1.0', :count
-                    )
-                """
-
-                insert_item = """
-                    INSERT INTO bench.candidate_shortlist_items (
-                        shortlist_item_id, shortlist_id, employee_id, rank,
-                        overall_fit_score, skill_match_score, experience_score,
-                        availability_score, certifications_score, bench_status,
-                        reason_for_ranking, strengths, gaps, 
-                        llm_summary, llm_breakdown_json, selected
-                    ) VALUES (
-                        :item_id, :sl_id, :emp_id, :rank,
-                        :overall_fit, :skill_match, :exp_match,
-                        :avail_match, :cert_match, :bench_status,
-                        :reason, :strengths, :gaps,
-                        :llm_summary, :llm_json, 0
-                    )
-                """
-
-                update_status = """
-                    UPDATE bench.client_requirements 
-                    SET status = 'In Progress'
-                    WHERE requirement_id = :req_id
-                """
-
-                with engine.begin() as conn:
-                    conn.execute(text(insert_shortlist), {
-                        "sl_id": shortlist_id,
-                        "req_id": request.requirement_id,
-                        "count": len(results)
+        persistence = "stored" if request.requirement_id else "none"
+        if precomputed:
+            results = precomputed["results"]
+            stored_shortlist_id = precomputed["shortlist_id"]
+            stored_candidates = precomputed["stored_candidates"]
+            mark_in_progress(request.requirement_id)
+            logger.info(f"✓ Reused precomputed shortlist {stored_shortlist_id}")
+        else:
+            # Run the search (stored shortlists always need the full payload)
+            results = search_employees(
+                **search_params,
+                fields=None if request.requirement_id else request.fields,
+            )
+
+            # If requirement_id provided, store results to database
+            with tracing.span("persist"):
+                if request.requirement_id and write_behind.WRITE_BEHIND_ENABLED:
+                    # Hand the writes to the durable journal and return immediately
+                    stored_shortlist_id, items, stored_candidates = prepare_shortlist(results)
+                    write_behind.get_queue().enqueue("shortlist", {
+                        "requirement_id": request.requirement_id,
+                        "shortlist_id": stored_shortlist_id,
+                        "items": items,
+                        "engine_version": ENGINE_VERSION,
                     })
+                    persistence = "queued"
+                elif request.requirement_id:
+                    try:
+                        stored_shortlist_id, stored_candidates = store_shortlist(
+                            request.requirement_id, results
+                        )
+                    except Exception as e:
+                        logger.error(f"Error storing shortlist: {e}")
+                        raise HTTPException(status_code=500, detail=str(e))
+
+        if traffic_capture.should_capture():
+            trace = tracing.current_trace()
+            traffic_capture.record(
+                search_params,
+                results,
+                get_data_version(),
+                trace.total() * 1000 if trace else 0.0,
+                source="precomputed" if precomputed else "search",
+            )
 
-                    for candidate in results:
-                        item_id = f"CSI-{str(uuid.uuid4())[:8].upper()}"
-                        breakdown = candidate.get("breakdown", {})
-
-                        skill_details = candidate.get("skill_match_details", [])
-                        matched_skills = [
-                            str(s.get("required_skill", ""))
-                            for s in skill_details
-                            if int(s.get("confidence", 0)) > 0
-                        ]
-                        strengths_summary = ", ".join(matched_skills)[:450] if matched_skills else "No matching skills"
-
-                        unmatched_skills = [
-                            str(s.get("required_skill", ""))
-                            for s in skill_details
-                            if int(s.get("confidence", 0)) == 0
-                        ]
-                        gaps_summary = ", ".join(unmatched_skills)[:450] if unmatched_skills else ""
-
-                        llm_summary = str(candidate.get("llm_summary", "No summary available"))
-                        reason = llm_summary[:200]
-
-                        conn.execute(text(insert_item), {
-                            "item_id": item_id,
-                            "sl_id": shortlist_id,
-                            "emp_id": str(candidate["employee_id"]),
-                            "rank": int(candidate["rank"]),
-                            "overall_fit": int(candidate["overall_fit_score"]),
-                            "skill_match": int(breakdown.get("skills_match", 0)),
-                            "exp_match": int(breakdown.get("experience_match", 0)),
-                            "avail_match": int(breakdown.get("availability_match", 0)),
-                            "cert_match": int(breakdown.get("certifications_match", 0)),
-                            "bench_status": str(candidate["bench_status"]),
-                            "reason": reason,
-                            "strengths": strengths_summary,
-                            "gaps": gaps_summary,
-                            "llm_summary": llm_summary,
-                            "llm_json": json.dumps(breakdown)
-                        })
-
-                    conn.execute(text(update_status), {"req_id": request.requirement_id})
-
-                stored_shortlist_id = shortlist_id
-
-                stored_candidates = fetch_query(
-                    """
-                    SELECT 
-                        csi.shortlist_item_id, csi.employee_id, csi.rank,
-                        csi.overall_fit_score, csi.skill_match_score,
-                        csi.experience_score, csi.availability_score,
-                        csi.certifications_score, csi.bench_status,
-                        csi.reason_for_ranking, csi.strengths, csi.gaps,
-                        csi.llm_summary, csi.llm_breakdown_json
-                    FROM bench.candidate_shortlist_items csi
-                    WHERE csi.shortlist_id = :sl_id
-                    ORDER BY csi.rank
-                    """,
-                    {"sl_id": shortlist_id}
-                )
-
-                logger.info(f"✓ Stored {len(results)} candidates to shortlist {shortlist_id}")
-
-            except Exception as e:
-                logger.error(f"Error storing shortlist: {e}")
-                raise HTTPException(status_code=500, detail=str(e))
-        
-        return {
+        payload = {
             "status": "success",
             "requirement_id": request.requirement_id,
             "client_name": request.client_name,
             "role_title": request.role_title,
-            "matches": results,
+            "matches": project(results, request.fields),
             "count": len(results),
             "requirement_status": "In Progress" if request.requirement_id else "Not Stored",
             "stored_shortlist_id": stored_shortlist_id,
-            "stored_candidates": stored_candidates,
+            "persistence": persistence,
         }
+        if not request.fields or "stored_candidates" in request.fields:
+            payload["stored_candidates"] = stored_candidates
+        return payload
     except Exception as e:
         logger.error(f"Search error: {e}")
         return {"status": "failed", "error": str(e)}
 
 
+@app.post("/assignments")
+def assign(request: AssignmentRequest):
+    """
+    POST /assignments
+    Globally assign active bench employees across open requirements so the
+    same employee isn't proposed for several requirements at once.
+
+    Reads from: bench.client_requirements (status Submitted / In Progress)
+    """
+    try:
+        query = """
+            SELECT requirement_id, required_skills, mandatory_certs, min_experience
+            FROM bench.client_requirements
+            WHERE status IN ('Submitted', 'In Progress')
+        """
+        rows = fetch_query(query)
+
+        if request.requirement_ids:
+            wanted = set(request.requirement_ids)
+            rows = [r for r in rows if r["requirement_id"] in wanted]
+
+        requirements = [
+            {
+                "requirement_id": r["requirement_id"],
+                "required_skills": (r.get("required_skills") or "").split(","),
+                "required_certs": (r.get("mandatory_certs") or "").split(","),
+                "min_experience": r.get("min_experience") or 0,
+            }
+            for r in rows
+        ]
+
+        if not requirements:
+            raise HTTPException(status_code=404, detail="No open requirements to assign")
+
+        result = assign_requirements(
+            requirements,
+            top_k=request.top_k,
+            min_score=request.min_score,
+            capacities=request.capacities,
+        )
+
+        return {
+            "status": "success",
+            "requirement_count": len(requirements),
+            **result,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Assignment error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ========================================
 # GET ENDPOINTS - RETRIEVE DATA
 # ========================================
 
+# Columns the listing can return; requirement_id and submitted_date are
+# always included because they form the pagination cursor
+REQUIREMENT_LIST_COLUMNS = [
+    "requirement_id", "client_name", "role_title", "status",
+    "submitted_date", "min_experience", "mandatory_certs",
+    "availability_date", "summary", "required_skills", "matched_candidates",
+]
+REQUIREMENTS_PAGE_SIZE = 50
+REQUIREMENTS_MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Opaque keyset cursor from the last row of a page."""
+    submitted = row["submitted_date"]
+    payload = {
+        "d": submitted.isoformat() if isinstance(submitted, datetime) else submitted,
+        "dt": isinstance(submitted, datetime),
+        "id": row["requirement_id"],
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """Return (submitted_date, requirement_id) from a cursor."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        submitted = datetime.fromisoformat(payload["d"]) if payload["dt"] else payload["d"]
+        return submitted, payload["id"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @app.get("/requirements")
-def get_all_requirements(status: Optional[str] = None):
+def get_all_requirements(
+    status: Optional[str] = None,
+    limit: int = REQUIREMENTS_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
     """
     GET /requirements
-    Retrieve all client requirements from Azure SQL.
+    Retrieve client requirements from Azure SQL, newest first.
     Optional filter by status: Submitted, In Progress, Matched, Placed
+
+    Pagination is keyset-based on (submitted_date, requirement_id): pass the
+    returned next_cursor to fetch the following page. `fields` is a
+    comma-separated list of columns to return (default: all).
     """
     try:
-        query = """
-            SELECT 
-                cr.requirement_id, cr.client_name, cr.role_title, cr.status,
-                cr.submitted_date, cr.min_experience, cr.mandatory_certs,
-                cr.availability_date, cr.summary, cr.required_skills,
-                COUNT(DISTINCT csi.employee_id) as matched_candidates
-            FROM bench.client_requirements cr
-            LEFT JOIN bench.candidate_shortlists cs ON cr.requirement_id = cs.requirement_id
-            LEFT JOIN bench.candidate_shortlist_items csi ON cs.shortlist_id = csi.shortlist_id
+        if limit < 1 or limit > REQUIREMENTS_MAX_PAGE_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"limit must be between 1 and {REQUIREMENTS_MAX_PAGE_SIZE}"
+            )
+
+        columns = REQUIREMENT_LIST_COLUMNS
+        if fields:
+            requested = [f.strip() for f in fields.split(",") if f.strip()]
+            unknown = set(requested) - set(REQUIREMENT_LIST_COLUMNS)
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+            columns = [
+                c for c in REQUIREMENT_LIST_COLUMNS
+                if c in requested or c in ("requirement_id", "submitted_date")
+            ]
+
+        # matched_candidates is a maintained counter (see migrations/001),
+        # so the listing is a single-table index range scan
+        query = f"""
+            SELECT {", ".join(columns)}
+            FROM bench.client_requirements
+            WHERE 1 = 1
         """
-        
-        params = {}
+
+        params = {"limit": limit + 1}
         if status:
-            query += " WHERE cr.status = :status"
+            query += " AND status = :status"
             params["status"] = status
-        
-        query += """
-            GROUP BY cr.requirement_id, cr.client_name, cr.role_title, cr.status,
-                     cr.submitted_date, cr.min_experience, cr.mandatory_certs,
-                     cr.availability_date, cr.summary, cr.required_skills
-            ORDER BY cr.submitted_date DESC
+        if cursor:
+            cursor_date, cursor_id = decode_cursor(cursor)
+            query += """
+                AND (submitted_date < :cursor_date
+                     OR (submitted_date = :cursor_date AND requirement_id < :cursor_id))
+            """
+            params["cursor_date"] = cursor_date
+            params["cursor_id"] = cursor_id
+
+        query += f"""
+            ORDER BY submitted_date DESC, requirement_id DESC
+            {limit_clause()}
         """
         
         requirements = fetch_query(query, params)
+
+        next_cursor = None
+        if len(requirements) > limit:
+            requirements = requirements[:limit]
+            next_cursor = encode_cursor(requirements[-1])
         
         # Convert required_skills and mandatory_certs to lists
         for req in requirements:
@@ -364,8 +639,11 @@ def get_all_requirements(status: Optional[str] = None):
         return {
             "status": "success",
             "count": len(requirements),
-            "data": requirements
+            "data": requirements,
+            "next_cursor": next_cursor
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving requirements: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -407,58 +685,32 @@ def get_requirement(requirement_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def conditional_get(http_request: Request, response: Response, key, load):
+    """
+    Serve a cached read with an ETag; answer 304 if the client's
+    If-None-Match still matches.
+    """
+    etag, payload = get_or_load(key, load)
+    if etag_matches(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return payload
+
+
 @app.get("/shortlist/{requirement_id}")
-def get_shortlist(requirement_id: str):
+def get_shortlist(requirement_id: str, http_request: Request, response: Response, profile: bool = False):
     """
     GET /shortlist/{requirement_id}
     Retrieve candidate shortlist for a specific requirement.
+    Supports ETag / If-None-Match (304 when unchanged) and `?profile=true`.
     """
     try:
-        # Get shortlist with all candidate details
-        query = """
-            SELECT 
-                csi.shortlist_item_id, csi.employee_id, csi.rank,
-                csi.overall_fit_score, csi.skill_match_score, 
-                csi.experience_score, csi.availability_score,
-                csi.certifications_score, csi.bench_status,
-                csi.reason_for_ranking, csi.strengths, csi.gaps,
-                csi.llm_summary, csi.llm_breakdown_json, csi.selected,
-                e.name, e.email, e.role, e.experience_years,
-                cs.generated_at, cs.total_candidates
-            FROM bench.candidate_shortlists cs
-            JOIN bench.candidate_shortlist_items csi ON cs.shortlist_id = csi.shortlist_id
-            JOIN bench.employees e ON csi.employee_id = e.employee_id
-            WHERE cs.requirement_id = :req_id
-            ORDER BY csi.rank
-        """
-        
-        candidates = fetch_query(query, {"req_id": requirement_id})
-        
-        if not candidates:
-            raise HTTPException(status_code=404, detail=f"Shortlist for requirement {requirement_id} not found")
-        
-        # Parse JSON fields
-        for candidate in candidates:
-            if candidate.get("llm_breakdown_json"):
-                try:
-                    candidate["breakdown"] = json.loads(candidate["llm_breakdown_json"])
-                except:
-                    candidate["breakdown"] = {}
-            if candidate.get("strengths"):
-                try:
-                    candidate["skill_match_details"] = json.loads(candidate["strengths"])
-                except:
-                    candidate["skill_match_details"] = []
-        
-        return {
-            "status": "success",
-            "requirement_id": requirement_id,
-            "data": {
-                "candidates": candidates,
-                "candidate_count": len(candidates),
-                "generated_at": candidates[0]["generated_at"] if candidates else None
-            }
-        }
+        with profiled(http_request, profile, "shortlist") as session:
+            result = conditional_get(
+                http_request, response, ("shortlist", requirement_id),
+                lambda: load_shortlist(requirement_id)
+            )
+        return attach_profile(result, response, session)
     except HTTPException:
         raise
     except Exception as e:
@@ -466,43 +718,71 @@ def get_shortlist(requirement_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def load_shortlist(requirement_id: str):
+    """Query and parse the shortlist payload for a requirement."""
+    # Get shortlist with all candidate details
+    query = """
+        SELECT 
+            csi.shortlist_item_id, csi.employee_id, csi.rank,
+            csi.overall_fit_score, csi.skill_match_score, 
+            csi.experience_score, csi.availability_score,
+            csi.certifications_score, csi.bench_status,
+            csi.reason_for_ranking, csi.strengths, csi.gaps,
+            csi.llm_summary, csi.llm_breakdown_json, csi.selected,
+            e.name, e.email, e.role, e.experience_years,
+            cs.generated_at, cs.total_candidates
+        FROM bench.candidate_shortlists cs
+        JOIN bench.candidate_shortlist_items csi ON cs.shortlist_id = csi.shortlist_id
+        JOIN bench.employees e ON csi.employee_id = e.employee_id
+        WHERE cs.requirement_id = :req_id
+        ORDER BY csi.rank
+    """
+
+    candidates = fetch_query(query, {"req_id": requirement_id})
+
+    if not candidates:
+        raise HTTPException(status_code=404, detail=f"Shortlist for requirement {requirement_id} not found")
+
+    # Parse JSON fields
+    for candidate in candidates:
+        if candidate.get("llm_breakdown_json"):
+            try:
+                candidate["breakdown"] = json.loads(candidate["llm_breakdown_json"])
+            except:
+                candidate["breakdown"] = {}
+        if candidate.get("strengths"):
+            try:
+                candidate["skill_match_details"] = json.loads(candidate["strengths"])
+            except:
+                candidate["skill_match_details"] = []
+
+    return {
+        "status": "success",
+        "requirement_id": requirement_id,
+        "data": {
+            "candidates": candidates,
+            "candidate_count": len(candidates),
+            "generated_at": candidates[0]["generated_at"] if candidates else None
+        }
+    }
+
+
 @app.get("/breakdown/{requirement_id}/{employee_id}")
-def get_breakdown(requirement_id: str, employee_id: str):
+def get_breakdown(
+    requirement_id: str, employee_id: str, http_request: Request, response: Response, profile: bool = False
+):
     """
     GET /breakdown/{requirement_id}/{employee_id}
     Retrieve detailed breakdown for a specific candidate.
+    Supports ETag / If-None-Match (304 when unchanged) and `?profile=true`.
     """
     try:
-        query = """
-            SELECT 
-                csi.*, e.name, e.email, e.role, e.experience_years
-            FROM bench.candidate_shortlists cs
-            JOIN bench.candidate_shortlist_items csi ON cs.shortlist_id = csi.shortlist_id
-            JOIN bench.employees e ON csi.employee_id = e.employee_id
-            WHERE cs.requirement_id = :req_id AND csi.employee_id = :emp_id
-        """
-        
-        results = fetch_query(query, {"req_id": requirement_id, "emp_id": employee_id})
-        
-        if not results:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Breakdown not found for requirement {requirement_id} and candidate {employee_id}"
+        with profiled(http_request, profile, "breakdown") as session:
+            result = conditional_get(
+                http_request, response, ("breakdown", requirement_id, employee_id),
+                lambda: load_breakdown(requirement_id, employee_id)
             )
-        
-        breakdown = results[0]
-        
-        # Parse JSON fields
-        if breakdown.get("llm_breakdown_json"):
-            try:
-                breakdown["breakdown"] = json.loads(breakdown["llm_breakdown_json"])
-            except:
-                breakdown["breakdown"] = {}
-        
-        return {
-            "status": "success",
-            "data": breakdown
-        }
+        return attach_profile(result, response, session)
     except HTTPException:
         raise
     except Exception as e:
@@ -510,7 +790,38 @@ def get_breakdown(requirement_id: str, employee_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def load_breakdown(requirement_id: str, employee_id: str):
+    """Query and parse the breakdown payload for one candidate."""
+    query = """
+        SELECT 
+            csi.*, e.name, e.email, e.role, e.experience_years
+        FROM bench.candidate_shortlists cs
+        JOIN bench.candidate_shortlist_items csi ON cs.shortlist_id = csi.shortlist_id
+        JOIN bench.employees e ON csi.employee_id = e.employee_id
+        WHERE cs.requirement_id = :req_id AND csi.employee_id = :emp_id
+    """
+
+    results = fetch_query(query, {"req_id": requirement_id, "emp_id": employee_id})
+
+    if not results:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Breakdown not found for requirement {requirement_id} and candidate {employee_id}"
+        )
+
+    breakdown = results[0]
 
+    # Parse JSON fields
+    if breakdown.get("llm_breakdown_json"):
+        try:
+            breakdown["breakdown"] = json.loads(breakdown["llm_breakdown_json"])
+        except:
+            breakdown["breakdown"] = {}
+
+    return {
+        "status": "success",
+        "data": breakdown
+    }
 
 
 # ========================================
@@ -573,29 +884,30 @@ def select_candidate(shortlist_item_id: str, request: SelectCandidateRequest = N
                 UPDATE bench.bench_status 
                 SET status = 'allocated',
                     allocated_to_requirement_id = :req_id,
-                    allocated_date = GETDATE()
+                    allocated_date = GETDATE(),
+                    last_updated = GETDATE()
                 WHERE employee_id = :emp_id
             """)
             conn.execute(update_bench, {"req_id": requirement_id, "emp_id": employee_id})
             
-            # 5. Record in match_history
-            match_run_id = f"MH-{str(uuid.uuid4())[:8].upper()}"
-            insert_history = text("""
-                INSERT INTO bench.match_history 
-                (match_run_id, requirement_id, run_timestamp, status, 
-                 top_candidate_id, top_candidate_fit, engine_version)
-                VALUES (
-                    :match_id, :req_id, GETDATE(), 'Matched',
-                    :emp_id, :fit_score, '1.0'
-                )
-            """)
-            conn.execute(insert_history, {
-                "match_id": match_run_id,
-                "req_id": requirement_id, 
+            # 5. Record in match_history (queued after commit in write-behind mode)
+            history = {
+                "match_id": f"MH-{str(uuid.uuid4())[:8].upper()}",
+                "req_id": requirement_id,
                 "emp_id": employee_id,
-                "fit_score": fit_score
-            })
+                "fit_score": int(fit_score) if fit_score is not None else None,
+                "engine_version": ENGINE_VERSION,
+            }
+            if not write_behind.WRITE_BEHIND_ENABLED:
+                conn.execute(text(INSERT_MATCH_HISTORY), history)
+
+        if write_behind.WRITE_BEHIND_ENABLED:
+            write_behind.get_queue().enqueue("match_history", history)
         
+        # Drop the employee from this worker's searches immediately;
+        # other workers pick the change up on their next bench-status poll
+        bench_index.apply(employee_id, "allocated")
+        invalidate_requirement(requirement_id)
         logger.info(f"✓ Candidate {employee_id} selected for requirement {requirement_id}")
         
         return {
@@ -656,11 +968,33 @@ if __name__ == "__main__":
     import sys
 
     if len(sys.argv) > 1 and sys.argv[1] == "ingest":
+        options = sys.argv[2:]
+        resume = retry_failed = None
+        if "--resume" in options:
+            position = options.index("--resume") + 1
+            has_id = position < len(options) and not options[position].startswith("--")
+            resume = options[position] if has_id else "latest"
+        if "--retry-failed" in options:
+            retry_failed = options[options.index("--retry-failed") + 1]
         logger.info("Starting data ingestion...")
-        ingest()
+        ingest(resume=resume, retry_failed=retry_failed, incremental="--incremental" in options)
         logger.info("Ingestion complete!")
+    elif len(sys.argv) > 1 and sys.argv[1] == "ingest-runs":
+        import ingest_checkpoint
+
+        print(json.dumps(ingest_checkpoint.list_runs(), indent=2))
+    elif len(sys.argv) > 1 and sys.argv[1] == "rollback":
+        index_versions.rollback(sys.argv[2] if len(sys.argv) > 2 else None)
+    elif len(sys.argv) > 1 and sys.argv[1] == "index-versions":
+        print(json.dumps(index_versions.read_pointer(), indent=2))
     else:
         print("Usage:")
         print("  python main.py ingest           # Run data ingestion")
+        print("  python main.py ingest --resume [run]        # Continue an interrupted ingest run")
+        print("  python main.py ingest --retry-failed run    # Re-embed only a run's failed employees")
+        print("  python main.py ingest --incremental         # Re-embed only employees whose text changed")
+        print("  python main.py ingest-runs      # Show ingest runs and their checkpoints")
+        print("  python main.py rollback [ver]   # Re-activate the previous (or given) index version")
+        print("  python main.py index-versions   # Show active and retained index versions")
         print("\nAPI Server:")
         print("  python -m uvicorn main:app --reload       # Start FastAPI server")
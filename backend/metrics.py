@@ -0,0 +1,296 @@
+"""
+In-process metrics exposed at GET /metrics in Prometheus text format.
+
+A small thread-safe registry of counters, gauges and histograms - no
+prometheus_client or external collector needed; Prometheus (or curl) scrapes
+each worker directly. Series:
+
+- benchmatch_http_request_duration_seconds{method,endpoint,status} histogram
+- benchmatch_http_requests_in_flight gauge
+- benchmatch_stage_duration_seconds{stage} histogram, fed by every tracing
+  span (load, embed, vector_query, rerank, llm, enrich, persist, ...)
+- benchmatch_retrieval_depth histogram (candidates returned by the vector query)
+- benchmatch_candidates_dropped_total{reason} counter
+- benchmatch_llm_fallbacks_total{reason} counter
+- DB pool checkout waits and occupancy, write-behind queue depth and read
+  cache hits/misses, collected from their modules at scrape time.
+"""
+
+import threading
+
+import tracing
+
+# Upper bounds (seconds) for request / stage latencies
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEPTH_BUCKETS = (0, 5, 10, 20, 35, 50, 100, 200, 500)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+# ---------------------------
+# METRIC TYPES
+# ---------------------------
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children = {}
+
+    def labels(self, *values):
+        key = tuple(str(v) for v in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        return self.labels(*()) if not self.labelnames else None
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+
+class _Value:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+    def _render_child(self, key, child):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount=1):
+        self._default().dec(amount)
+
+    def set(self, value):
+        self._default().set(value)
+
+
+class _HistogramValue:
+    def __init__(self, buckets):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def _render_child(self, key, child):
+        with child._lock:
+            counts, total, count = list(child.counts), child.sum, child.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key, [("le", "+Inf")])
+        lines.append(f"{self.name}_bucket{labels} {count}")
+        base = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{base} {_format_value(total)}")
+        lines.append(f"{self.name}_count{base} {count}")
+        return lines
+
+
+# ---------------------------
+# REGISTRY
+# ---------------------------
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """collector() -> iterable of exposition lines, called at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                lines.append(f"# collector {getattr(collector, '__name__', collector)} failed: {e}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_DURATION = registry.register(Histogram(
+    "benchmatch_http_request_duration_seconds",
+    "HTTP request latency by endpoint",
+    ("method", "endpoint", "status"),
+))
+REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "benchmatch_http_requests_in_flight",
+    "HTTP requests currently being served",
+))
+STAGE_DURATION = registry.register(Histogram(
+    "benchmatch_stage_duration_seconds",
+    "Search pipeline stage latency",
+    ("stage",),
+))
+RETRIEVAL_DEPTH = registry.register(Histogram(
+    "benchmatch_retrieval_depth",
+    "Candidates returned by the vector query per search",
+    buckets=DEPTH_BUCKETS,
+))
+CANDIDATES_DROPPED = registry.register(Counter(
+    "benchmatch_candidates_dropped_total",
+    "Retrieved candidates dropped before ranking",
+    ("reason",),
+))
+LLM_FALLBACKS = registry.register(Counter(
+    "benchmatch_llm_fallbacks_total",
+    "Template summaries used instead of an LLM response",
+    ("reason",),
+))
+
+# Every tracing span feeds the stage histogram
+tracing.add_observer(lambda stage, seconds: STAGE_DURATION.labels(stage).observe(seconds))
+
+
+# ---------------------------
+# SCRAPE-TIME COLLECTORS
+# ---------------------------
+def _collect_db_pool():
+    from db import WAIT_BUCKETS, pool_status
+
+    status = pool_status()
+    wait = status["checkout_wait"]
+    name = "benchmatch_db_pool_checkout_wait_seconds"
+    lines = [f"# HELP {name} Time spent waiting for a pooled DB connection", f"# TYPE {name} histogram"]
+    cumulative = 0
+    for bound in WAIT_BUCKETS:
+        cumulative += wait["wait_buckets"][bound]
+        lines.append(f'{name}_bucket{{le="{_format_value(bound)}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {wait["checkouts"]}')
+    lines.append(f"{name}_sum {_format_value(wait['wait_seconds_sum'])}")
+    lines.append(f"{name}_count {wait['checkouts']}")
+    lines.append("# TYPE benchmatch_db_pool_checkout_timeouts_total counter")
+    lines.append(f"benchmatch_db_pool_checkout_timeouts_total {wait['timeouts']}")
+    for key in ("pool_size", "checked_out", "checked_in", "overflow"):
+        if key in status:
+            lines.append(f"# TYPE benchmatch_db_pool_{key} gauge")
+            lines.append(f"benchmatch_db_pool_{key} {status[key]}")
+    return lines
+
+
+def _collect_read_cache():
+    from response_cache import read_cache
+
+    return [
+        "# TYPE benchmatch_read_cache_hits_total counter",
+        f"benchmatch_read_cache_hits_total {read_cache.hits}",
+        "# TYPE benchmatch_read_cache_misses_total counter",
+        f"benchmatch_read_cache_misses_total {read_cache.misses}",
+    ]
+
+
+def _collect_write_behind():
+    import write_behind
+
+    if not write_behind.WRITE_BEHIND_ENABLED:
+        return []
+    stats = write_behind.get_queue().stats()
+    return [
+        "# TYPE benchmatch_write_behind_pending gauge",
+        f"benchmatch_write_behind_pending {stats['pending']}",
+        "# TYPE benchmatch_write_behind_dead_lettered gauge",
+        f"benchmatch_write_behind_dead_lettered {stats['dead_lettered']}",
+    ]
+
+
+registry.add_collector(_collect_db_pool)
+registry.add_collector(_collect_read_cache)
+registry.add_collector(_collect_write_behind)
+
+
+def render():
+    """Current metrics in Prometheus text exposition format."""
+    return registry.render()
@@ -0,0 +1,35 @@
+-- ========================================
+-- GET /requirements listing support
+-- ========================================
+-- 1. Maintained matched_candidates counter (replaces the per-request
+--    COUNT(DISTINCT employee_id) over two LEFT JOINs). Kept current by
+--    shortlist_store.write_shortlist / delete_shortlist.
+-- 2. Index backing keyset pagination on (submitted_date, requirement_id).
+
+IF COL_LENGTH('bench.client_requirements', 'matched_candidates') IS NULL
+    ALTER TABLE bench.client_requirements
+        ADD matched_candidates INT NOT NULL
+        CONSTRAINT DF_client_requirements_matched_candidates DEFAULT 0;
+GO
+
+-- Backfill from existing shortlists
+UPDATE cr
+SET matched_candidates = COALESCE(m.matched, 0)
+FROM bench.client_requirements cr
+LEFT JOIN (
+    SELECT cs.requirement_id, COUNT(DISTINCT csi.employee_id) AS matched
+    FROM bench.candidate_shortlists cs
+    JOIN bench.candidate_shortlist_items csi ON cs.shortlist_id = csi.shortlist_id
+    GROUP BY cs.requirement_id
+) m ON m.requirement_id = cr.requirement_id;
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_client_requirements_submitted'
+      AND object_id = OBJECT_ID('bench.client_requirements')
+)
+    CREATE INDEX IX_client_requirements_submitted
+        ON bench.client_requirements (submitted_date DESC, requirement_id DESC)
+        INCLUDE (status);
+GO
@@ -0,0 +1,39 @@
+-- ========================================
+-- Live bench-status index support
+-- ========================================
+-- 1. last_updated change timestamp on bench.bench_status, polled by
+--    bench_status_index.py with "WHERE last_updated >= :watermark - overlap"
+--    (rows in the overlap window are re-read, so late commits aren't missed).
+-- 2. Trigger keeping it current for updates made outside the API
+--    (the select endpoint also sets it explicitly).
+-- 3. Index backing the "changed since" poll.
+
+IF COL_LENGTH('bench.bench_status', 'last_updated') IS NULL
+    ALTER TABLE bench.bench_status
+        ADD last_updated DATETIME2(3) NOT NULL
+        CONSTRAINT DF_bench_status_last_updated DEFAULT SYSDATETIME();
+GO
+
+CREATE OR ALTER TRIGGER bench.TR_bench_status_last_updated
+ON bench.bench_status
+AFTER UPDATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF UPDATE(last_updated) RETURN;
+    UPDATE bs
+    SET last_updated = SYSDATETIME()
+    FROM bench.bench_status bs
+    JOIN inserted i ON i.employee_id = bs.employee_id;
+END;
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_bench_status_last_updated'
+      AND object_id = OBJECT_ID('bench.bench_status')
+)
+    CREATE INDEX IX_bench_status_last_updated
+        ON bench.bench_status (last_updated)
+        INCLUDE (employee_id, status);
+GO
@@ -0,0 +1,159 @@
+"""
+Speculative shortlist precomputation.
+
+POST /requirements enqueues a background search for the new requirement and
+persists the result as a provisional shortlist. A later /search with the same
+parameters reuses it instantly, as long as the data version (CSV files +
+vector index) hasn't changed since it was computed. GET /shortlist already
+reads the persisted rows, so it benefits without any changes.
+
+The registry is per process: with several uvicorn workers, a /search served by
+a different worker than the one that created the requirement simply misses and
+runs the search as before.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from data_ingestion import get_data_version, search_employees
+from shortlist_store import delete_shortlist, store_shortlist
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+PRECOMPUTE_ENABLED = os.getenv("BENCHMATCH_PRECOMPUTE", "1") == "1"
+PRECOMPUTE_WORKERS = int(os.getenv("BENCHMATCH_PRECOMPUTE_WORKERS", "1"))
+PRECOMPUTE_WAIT_SECONDS = float(os.getenv("BENCHMATCH_PRECOMPUTE_WAIT", "30"))
+# Requirements never searched would otherwise keep their results forever
+PRECOMPUTE_MAX_ENTRIES = int(os.getenv("BENCHMATCH_PRECOMPUTE_MAX_ENTRIES", "256"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=PRECOMPUTE_WORKERS, thread_name_prefix="precompute"
+)
+_lock = threading.Lock()
+_entries = {}  # requirement_id -> {"key", "future"}, oldest first
+
+
+def search_key(params):
+    """Stable hash of the normalized search parameters."""
+    normalized = {
+        "required_skills": sorted(s.lower().strip() for s in params.get("required_skills") or []),
+        "required_certs": sorted(c.strip() for c in params.get("required_certs") or []),
+        "min_experience": int(params.get("min_experience") or 0),
+        "role_title": (params.get("role_title") or "").strip(),
+        "requirement_summary": (params.get("requirement_summary") or "").strip(),
+        "top_n": int(params.get("top_n") or 5),
+        "allow_partial": bool(params.get("allow_partial", True)),
+        "hard_constraints": sorted(params.get("hard_constraints") or []),
+    }
+    encoded = json.dumps(normalized, sort_keys=True).encode()
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def _run(requirement_id, params):
+    """Run the search and persist it as a provisional shortlist."""
+    data_version = get_data_version()
+    results = search_employees(**params)
+    shortlist_id, stored_candidates = store_shortlist(
+        requirement_id, results, update_status=False
+    )
+    logger.info(f"✓ Precomputed shortlist {shortlist_id} for {requirement_id}")
+    return {
+        "data_version": data_version,
+        "results": results,
+        "shortlist_id": shortlist_id,
+        "stored_candidates": stored_candidates,
+    }
+
+
+def _drop_shortlist(future):
+    """Done-callback deleting the provisional shortlist of an abandoned computation."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    shortlist_id = future.result()["shortlist_id"]
+    try:
+        delete_shortlist(shortlist_id)
+    except Exception as e:
+        logger.warning(f"Could not delete abandoned shortlist {shortlist_id}: {e}")
+
+
+def _abandon(entry):
+    """
+    Give up on a precomputation: cancel it if it hasn't started, otherwise
+    delete its provisional shortlist once stored (right away if it already
+    is), so it never shows up next to the one /search stores.
+    """
+    if not entry["future"].cancel():
+        entry["future"].add_done_callback(_drop_shortlist)
+
+
+def enqueue(requirement_id, params):
+    """Schedule a background search for a newly created requirement."""
+    if not PRECOMPUTE_ENABLED:
+        return
+    future = _executor.submit(_run, requirement_id, params)
+    with _lock:
+        abandoned = [_entries.pop(requirement_id, None)]
+        _entries[requirement_id] = {"key": search_key(params), "future": future}
+        while len(_entries) > PRECOMPUTE_MAX_ENTRIES:
+            abandoned.append(_entries.pop(next(iter(_entries))))
+    # Outside the lock: abandoning a finished entry deletes its shortlist
+    for entry in abandoned:
+        if entry is not None:
+            _abandon(entry)
+    logger.info(f"🔹 Queued shortlist precompute for {requirement_id}")
+
+
+def lookup(requirement_id, params, wait=PRECOMPUTE_WAIT_SECONDS):
+    """
+    Return the precomputed result for a requirement if it was computed with
+    the same parameters against the current data version, else None.
+
+    A computation already running is awaited (up to `wait` seconds) rather
+    than duplicated; one still queued behind other requirements is cancelled
+    and /search runs inline. The entry is consumed by the lookup either way.
+    A provisional shortlist that can't be reused (including one stored after
+    the wait timed out) is deleted so it doesn't show up next to the one
+    /search is about to store, unless a candidate was already selected from it.
+    """
+    with _lock:
+        entry = _entries.pop(requirement_id, None)
+    if not entry:
+        return None
+
+    future = entry["future"]
+    if future.cancel():
+        logger.info(f"Precompute for {requirement_id} not started yet; searching inline")
+        return None
+    try:
+        result = future.result(timeout=wait)
+    except FutureTimeoutError:
+        logger.warning(f"Precomputed shortlist for {requirement_id} not ready after {wait}s; searching inline")
+        _abandon(entry)
+        return None
+    except Exception as e:
+        logger.warning(f"Precomputed shortlist unavailable for {requirement_id}: {e}")
+        return None
+
+    if entry["key"] != search_key(params) or result["data_version"] != get_data_version():
+        try:
+            delete_shortlist(result["shortlist_id"])
+        except Exception as e:
+            logger.warning(f"Could not delete stale shortlist {result['shortlist_id']}: {e}")
+        return None
+    return result
+
+
+def discard(requirement_id):
+    """Forget (and abandon) the precomputed result for a requirement."""
+    with _lock:
+        entry = _entries.pop(requirement_id, None)
+    if entry is not None:
+        _abandon(entry)
@@ -0,0 +1,199 @@
+"""
+On-demand sampling profiler for individual requests.
+
+`?profile=true` on /search, /shortlist/{id} and /breakdown/{id}/{employee}
+runs that one request under a sampling profiler: a background thread reads
+the request thread's Python stack (sys._current_frames) every
+BENCHMATCH_PROFILE_SAMPLE_MS (5 ms) and counts identical stacks. The
+request's own code is never instrumented, so overhead is a few percent and
+only for the profiled request.
+
+Profiles are written in collapsed-stack format ("root;caller;callee count"
+per line), which flamegraph.pl, speedscope and inferno render directly, to
+BENCHMATCH_PROFILE_DIR (profiles/). The newest BENCHMATCH_PROFILE_KEEP (50)
+are kept. They can be downloaded with GET /profiles/{profile_id}.
+
+Safe to leave enabled in production:
+- disabled unless BENCHMATCH_ADMIN_TOKEN is set, and the caller must send
+  it in the X-Admin-Token header;
+- one profile at a time per worker, and at most one every
+  BENCHMATCH_PROFILE_INTERVAL seconds (10); anything else gets 429;
+- sampling stops after BENCHMATCH_PROFILE_MAX_SECONDS (60) whatever happens.
+"""
+
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ADMIN_TOKEN = os.getenv("BENCHMATCH_ADMIN_TOKEN", "")
+PROFILE_DIR = Path(os.getenv("BENCHMATCH_PROFILE_DIR", "profiles"))
+PROFILE_KEEP = int(os.getenv("BENCHMATCH_PROFILE_KEEP", "50"))
+MIN_INTERVAL = float(os.getenv("BENCHMATCH_PROFILE_INTERVAL", "10"))
+SAMPLE_INTERVAL = float(os.getenv("BENCHMATCH_PROFILE_SAMPLE_MS", "5")) / 1000
+MAX_SECONDS = float(os.getenv("BENCHMATCH_PROFILE_MAX_SECONDS", "60"))
+TOP_FRAMES = 15
+
+_PROFILE_ID_RE = re.compile(r"^[0-9]{8}T[0-9]{6}-[a-z0-9_]+-[0-9a-f]{8}$")
+
+
+class ProfileRejected(Exception):
+    """Profiling refused; status_code is the HTTP status to answer with."""
+
+    def __init__(self, status_code, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+
+
+# ---------------------------
+# ACCESS CONTROL / RATE LIMIT
+# ---------------------------
+_active = threading.Lock()
+_state = {"last_started": float("-inf")}
+_state_lock = threading.Lock()
+
+
+def authorize(token):
+    """Raise ProfileRejected unless profiling is enabled and `token` matches."""
+    if not ADMIN_TOKEN:
+        raise ProfileRejected(403, "Profiling is disabled (BENCHMATCH_ADMIN_TOKEN not set)")
+    if not token or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise ProfileRejected(403, "Invalid or missing X-Admin-Token")
+
+
+def _acquire():
+    if not _active.acquire(blocking=False):
+        raise ProfileRejected(429, "Another request is being profiled")
+    with _state_lock:
+        wait = _state["last_started"] + MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            _active.release()
+            raise ProfileRejected(429, f"Profiling rate limit; retry in {wait:.0f}s")
+        _state["last_started"] = time.monotonic()
+
+
+# ---------------------------
+# SAMPLER
+# ---------------------------
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _collapsed_stack(frame):
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class ProfileSession:
+    """Samples one thread's stack until stop() (or MAX_SECONDS)."""
+
+    def __init__(self, endpoint, thread_id=None):
+        self.endpoint = endpoint
+        self.thread_id = thread_id or threading.get_ident()
+        self.profile_id = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{re.sub(r'[^a-z0-9]+', '_', endpoint.lower()).strip('_')}"
+            f"-{uuid.uuid4().hex[:8]}"
+        )
+        self.stacks = Counter()
+        self.samples = 0
+        self.path = None
+        self._stop = threading.Event()
+        self._started = time.perf_counter()
+        self._duration = None
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{self.profile_id}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        deadline = self._started + MAX_SECONDS
+        while not self._stop.wait(SAMPLE_INTERVAL) and time.perf_counter() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            self.stacks[_collapsed_stack(frame)] += 1
+            self.samples += 1
+            del frame
+
+    def stop(self):
+        """Stop sampling, write the collapsed-stack file and release the slot."""
+        try:
+            self._stop.set()
+            self._thread.join()
+            self._duration = time.perf_counter() - self._started
+            self.path = _write_profile(self.profile_id, self.stacks)
+            logger.info(
+                f"🔬 Profiled {self.endpoint}: {self.samples} samples over "
+                f"{self._duration * 1000:.0f} ms -> {self.path}"
+            )
+        except Exception as e:
+            logger.warning(f"Could not write profile {self.profile_id}: {e}")
+        finally:
+            _active.release()
+
+    def summary(self):
+        """Profile ID, sample count and the frames with most self time."""
+        own = Counter()
+        for stack, count in self.stacks.items():
+            own[stack.rsplit(";", 1)[-1]] += count
+        total = max(self.samples, 1)
+        return {
+            "profile_id": self.profile_id,
+            "format": "collapsed",
+            "samples": self.samples,
+            "sample_interval_ms": SAMPLE_INTERVAL * 1000,
+            "duration_ms": round((self._duration or 0) * 1000, 2),
+            "download": f"/profiles/{self.profile_id}",
+            "top_self": [
+                {"frame": frame, "samples": count, "percent": round(100 * count / total, 1)}
+                for frame, count in own.most_common(TOP_FRAMES)
+            ],
+        }
+
+
+def start(token, endpoint):
+    """Authorize and rate-limit, then start profiling the calling thread."""
+    authorize(token)
+    _acquire()
+    try:
+        return ProfileSession(endpoint)
+    except Exception:
+        _active.release()
+        raise
+
+
+# ---------------------------
+# STORAGE
+# ---------------------------
+def _write_profile(profile_id, stacks):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    path = PROFILE_DIR / f"{profile_id}.folded"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+    os.replace(tmp, path)
+    _prune()
+    return path
+
+
+def _prune(keep=PROFILE_KEEP):
+    profiles = sorted(PROFILE_DIR.glob("*.folded"), key=lambda p: p.stat().st_mtime)
+    for stale in profiles[:-keep] if keep > 0 else profiles:
+        stale.unlink(missing_ok=True)
+
+
+def read_profile(profile_id):
+    """Collapsed stacks of a stored profile, or None if unknown."""
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None
+    path = PROFILE_DIR / f"{profile_id}.folded"
+    return path.read_text() if path.exists() else None
@@ -0,0 +1,342 @@
+"""
+Optional background re-ingest scheduled inside the API process.
+
+Off by default. BENCHMATCH_REINGEST_INTERVAL (seconds) re-ingests
+periodically; BENCHMATCH_REINGEST_WATCH (seconds) checks the ingest source
+for changes that often and re-ingests when it changed (CSV file stats, or
+row counts - plus CHECKSUM_AGG on Azure SQL - of the SQL tables). Either or
+both may be set.
+
+Each re-ingest is `python main.py ingest --incremental` in a child process,
+so it never holds the GIL the API serves with. Only employees whose text
+changed are re-embedded, and it builds a new index version that search
+switches to atomically (blue/green), so the API keeps reading the active
+collection while the child writes a different one. The child is throttled:
+
+- CPU: nice BENCHMATCH_REINGEST_NICE (19; below-normal priority class on
+  Windows), BLAS/OpenMP threads capped at BENCHMATCH_REINGEST_THREADS (1);
+- IO: idle IO class via `ionice -c 3` where available;
+- pace: BENCHMATCH_REINGEST_BATCH_PAUSE (0.5 s) sleep after every batch.
+
+A lock file in the ingest runs directory (heartbeated while the child runs)
+makes sure only one uvicorn worker runs a re-ingest at a time, and no
+re-ingest starts while a manual ingest run is still writing checkpoints.
+GET /reingest/status reports the scheduler, the current run's progress and
+the last run's stats.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import ingest_checkpoint
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+INTERVAL = float(os.getenv("BENCHMATCH_REINGEST_INTERVAL", "0"))
+WATCH = float(os.getenv("BENCHMATCH_REINGEST_WATCH", "0"))
+NICE = int(os.getenv("BENCHMATCH_REINGEST_NICE", "19"))
+THREADS = os.getenv("BENCHMATCH_REINGEST_THREADS", "1")
+BATCH_PAUSE = os.getenv("BENCHMATCH_REINGEST_BATCH_PAUSE", "0.5")
+ENABLED = INTERVAL > 0 or WATCH > 0
+
+BACKEND_DIR = Path(__file__).resolve().parent
+LOCK_FILE = "reingest.lock"
+LOG_FILE = "reingest.log"
+# A lock or RUNNING checkpoint untouched this long belongs to a dead process
+STALE_SECONDS = 600
+HEARTBEAT_SECONDS = 5
+
+
+# ---------------------------
+# CHANGE DETECTION
+# ---------------------------
+def source_fingerprint():
+    """Cheap fingerprint of the data ingest reads (not of its own outputs)."""
+    import streaming_loader
+
+    digest = hashlib.sha1()
+    if streaming_loader.INGEST_SOURCE == "sql":
+        from sqlalchemy import text
+
+        from db import get_engine
+
+        engine = get_engine()
+        checksum = "CHECKSUM_AGG(BINARY_CHECKSUM(*))" if engine.dialect.name == "mssql" else "0"
+        with engine.connect() as conn:
+            for name in ("employees", "skills", "certifications", "projects"):
+                table = streaming_loader.TABLES[name][0]
+                row = conn.execute(text(f"SELECT COUNT(*), {checksum} FROM bench.{table}")).fetchone()
+                digest.update(f"{table}:{row[0]}:{row[1]};".encode())
+    else:
+        from data_ingestion import DATA_DIR
+
+        for name in ("employees.csv", "skills.csv", "certifications.csv", "project_history.csv"):
+            try:
+                stat = (DATA_DIR / name).stat()
+                digest.update(f"{name}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+            except FileNotFoundError:
+                digest.update(f"{name}:missing;".encode())
+    return digest.hexdigest()[:16]
+
+
+# ---------------------------
+# LOCK
+# ---------------------------
+def _lock_path():
+    return ingest_checkpoint.RUNS_DIR / LOCK_FILE
+
+
+def _acquire_lock():
+    path = _lock_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if time.time() - path.stat().st_mtime > STALE_SECONDS:
+            logger.warning(f"Removing stale re-ingest lock {path}")
+            path.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    os.write(fd, f"{os.getpid()}\n".encode())
+    os.close(fd)
+    return True
+
+
+def _release_lock():
+    try:
+        _lock_path().unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _manual_run_active():
+    """A RUNNING ingest checkpoint written recently (e.g. `python main.py ingest`)."""
+    now = time.time()
+    return any(
+        r["state"] == ingest_checkpoint.RUNNING and now - r.get("updated_at", 0) < STALE_SECONDS
+        for r in ingest_checkpoint.list_runs()
+    )
+
+
+# ---------------------------
+# CHILD PROCESS
+# ---------------------------
+def _launch(log):
+    """Start the throttled `main.py ingest --incremental` child."""
+    command = [sys.executable, str(BACKEND_DIR / "main.py"), "ingest", "--incremental"]
+    env = {
+        **os.environ,
+        "BENCHMATCH_INGEST_BATCH_PAUSE": BATCH_PAUSE,
+        "OMP_NUM_THREADS": THREADS,
+        "OPENBLAS_NUM_THREADS": THREADS,
+        "MKL_NUM_THREADS": THREADS,
+    }
+    options = {}
+    if os.name == "nt":
+        options["creationflags"] = subprocess.BELOW_NORMAL_PRIORITY_CLASS
+    else:
+        if shutil.which("ionice"):
+            command = ["ionice", "-c", "3"] + command
+        # Niced before exec, so every thread the child starts inherits it
+        if shutil.which("nice"):
+            command = ["nice", "-n", str(NICE)] + command
+        else:
+            # preexec_fn isn't fork-safe with threads; only when nice is missing
+            options["preexec_fn"] = lambda: os.nice(NICE)
+    return subprocess.Popen(
+        command, cwd=os.getcwd(), env=env, stdout=log, stderr=subprocess.STDOUT, **options
+    )
+
+
+def _run_summary(run):
+    keys = ("run_id", "state", "version", "succeeded", "reused", "failed", "last_batch", "started_at", "updated_at")
+    return {key: run.get(key) for key in keys}
+
+
+def _read_report(run_id):
+    import json
+
+    try:
+        return json.loads((ingest_checkpoint.RUNS_DIR / run_id / "report.json").read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+# ---------------------------
+# SCHEDULER
+# ---------------------------
+class ReingestScheduler:
+    """Background thread that launches re-ingests on an interval or on data change."""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = None
+        self._proc = None
+        self.fingerprint = None
+        # Source fingerprint of the last successful re-ingest (None: none yet)
+        self.ingested_fingerprint = None
+        self.next_run_at = None
+        self.running = None
+        self.last_run = None
+        self.runs = 0
+        self.skipped = 0
+
+    def start(self):
+        if not ENABLED:
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reingest-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"🔹 Re-ingest scheduler started (interval {INTERVAL:g}s, watch {WATCH:g}s)")
+
+    def stop(self):
+        self._stop.set()
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            # The run is checkpointed; `python main.py ingest --resume` finishes it
+            logger.info(f"Stopping background re-ingest (pid {proc.pid})")
+            proc.terminate()
+        if self._thread:
+            self._thread.join(10)
+
+    def _run(self):
+        try:
+            self.fingerprint = source_fingerprint()
+        except Exception as e:
+            logger.warning(f"Re-ingest change check failed: {e}")
+        now = time.time()
+        self.next_run_at = now + INTERVAL if INTERVAL > 0 else None
+        next_check = now + WATCH
+        tick = min(v for v in (INTERVAL, WATCH, 30.0) if v > 0)
+
+        while not self._stop.wait(tick):
+            now = time.time()
+            trigger = None
+            if self.next_run_at is not None and now >= self.next_run_at:
+                self.next_run_at = now + INTERVAL
+                if self._source_unchanged():
+                    logger.info("Re-ingest (interval) skipped: source unchanged since the last run")
+                else:
+                    trigger = "interval"
+            elif WATCH > 0 and now >= next_check:
+                next_check = now + WATCH
+                try:
+                    if source_fingerprint() != self.fingerprint:
+                        trigger = "change"
+                except Exception as e:
+                    logger.warning(f"Re-ingest change check failed: {e}")
+            if trigger is None:
+                continue
+            try:
+                self.run_once(trigger)
+            except Exception as e:
+                logger.error(f"Background re-ingest failed: {e}")
+            if INTERVAL > 0:
+                self.next_run_at = time.time() + INTERVAL
+
+    def _source_unchanged(self):
+        """True when the source still matches the last successful re-ingest."""
+        if self.ingested_fingerprint is None:
+            return False
+        try:
+            return source_fingerprint() == self.ingested_fingerprint
+        except Exception as e:
+            logger.warning(f"Re-ingest change check failed: {e}")
+            return False
+
+    def run_once(self, trigger):
+        """Run one throttled re-ingest and wait for it. Returns its stats, or None if skipped."""
+        if _manual_run_active() or not _acquire_lock():
+            self.skipped += 1
+            logger.info(f"Re-ingest ({trigger}) skipped: another ingest is running")
+            return None
+        try:
+            try:
+                fingerprint = source_fingerprint()
+            except Exception:
+                fingerprint = None
+            started = time.time()
+            self.running = {"trigger": trigger, "started_at": started}
+            log_path = ingest_checkpoint.RUNS_DIR / LOG_FILE
+            logger.info(f"🔹 Background re-ingest ({trigger}) starting; log in {log_path}")
+            with open(log_path, "w", encoding="utf-8") as log:
+                self._proc = _launch(log)
+                self.running["pid"] = self._proc.pid
+                while True:
+                    try:
+                        exit_code = self._proc.wait(timeout=HEARTBEAT_SECONDS)
+                        break
+                    except subprocess.TimeoutExpired:
+                        _lock_path().touch()
+
+            runs = [r for r in ingest_checkpoint.list_runs() if r.get("started_at", 0) >= started - 1]
+            run = runs[-1] if runs else None
+            report = _read_report(run["run_id"]) if run else None
+            self.last_run = {
+                "trigger": trigger,
+                "started_at": started,
+                "finished_at": time.time(),
+                "duration_s": round(time.time() - started, 1),
+                "exit_code": exit_code,
+                "run": _run_summary(run) if run else None,
+                "report": {k: v for k, v in report.items() if k != "failed_employees"} if report else None,
+            }
+            self.runs += 1
+            if exit_code == 0:
+                # Changes made while the child ran still differ and trigger again
+                self.fingerprint = self.ingested_fingerprint = fingerprint
+                logger.info(f"✓ Background re-ingest ({trigger}) finished in {self.last_run['duration_s']}s")
+            else:
+                logger.warning(f"Background re-ingest ({trigger}) exited with {exit_code}; see {log_path}")
+            return self.last_run
+        finally:
+            self._proc = None
+            self.running = None
+            _release_lock()
+
+    def status(self):
+        current = None
+        if self.running is not None:
+            active = [r for r in ingest_checkpoint.list_runs() if r["state"] == ingest_checkpoint.RUNNING]
+            current = {**self.running, "run": _run_summary(active[-1]) if active else None}
+        return {
+            "enabled": ENABLED,
+            "interval_s": INTERVAL,
+            "watch_s": WATCH,
+            "throttle": {"nice": NICE, "threads": THREADS, "batch_pause_s": float(BATCH_PAUSE)},
+            "running": current,
+            "next_run_at": self.next_run_at,
+            "source_fingerprint": self.fingerprint,
+            "ingested_fingerprint": self.ingested_fingerprint,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "last_run": self.last_run,
+            "last_completed_run": self._last_completed(),
+            "lock_held": _lock_path().exists(),
+        }
+
+    @staticmethod
+    def _last_completed():
+        """Newest finished ingest run (any worker or manual run) and its report."""
+        completed = [r for r in ingest_checkpoint.list_runs() if r["state"] == ingest_checkpoint.COMPLETED]
+        if not completed:
+            return None
+        report = _read_report(completed[-1]["run_id"]) or {}
+        return {k: v for k, v in report.items() if k != "failed_employees"} or _run_summary(completed[-1])
+
+
+scheduler = ReingestScheduler()
@@ -0,0 +1,106 @@
+"""
+In-process TTL/LRU cache and ETags for shortlist and breakdown reads.
+
+GET /shortlist/{requirement_id} and GET /breakdown/{requirement_id}/{employee_id}
+are polled by the frontend's CandidateFitModal. Parsed payloads are cached per
+requirement and tagged with an ETag, so repeated polls skip the three-table
+join and the llm_breakdown_json parsing, and unchanged payloads return 304.
+
+Entries are invalidated when a shortlist is stored or deleted and when a
+candidate is selected. Invalidation is per process; with several uvicorn
+workers the TTL bounds how long another worker can serve a stale payload.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_TTL_SECONDS = float(os.getenv("BENCHMATCH_READ_CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("BENCHMATCH_READ_CACHE_SIZE", "1024"))
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every invalidation so a load that raced with one isn't cached
+        self.generation = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, predicate):
+        """Drop every entry whose key matches `predicate`."""
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+
+# Keys: ("shortlist", requirement_id) and ("breakdown", requirement_id, employee_id)
+read_cache = TTLCache()
+
+
+def get_or_load(key, load):
+    """
+    Return (etag, payload) for `key`, calling `load()` on a miss.
+    Exceptions from `load` (e.g. 404s) propagate and are not cached.
+    """
+    cached = read_cache.get(key)
+    if cached is None:
+        generation = read_cache.generation
+        payload = load()
+        cached = (compute_etag(payload), payload)
+        read_cache.set(key, cached, generation)
+    return cached
+
+
+def compute_etag(payload):
+    """Weak ETag over the JSON form of a response payload."""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return f'W/"{hashlib.sha1(encoded).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header covers `etag`."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+
+def invalidate_requirement(requirement_id):
+    """Drop cached shortlist and breakdown payloads for a requirement."""
+    read_cache.invalidate(lambda key: key[1] == requirement_id)
@@ -0,0 +1,252 @@
+"""
+Shortlist persistence to Azure SQL (bench.candidate_shortlists,
+bench.candidate_shortlist_items and bench.match_history).
+"""
+
+import logging
+import uuid
+from pathlib import Path
+
+from sqlalchemy import text
+
+from data_ingestion import get_engine
+from fast_json import dumps_str
+from response_cache import invalidate_requirement
+
+logger = logging.getLogger(__name__)
+
+# Ranking engine version stamped on shortlists and match history. Bumped by
+# `python benchmarks/ranking_regression.py --update` when rankings change.
+ENGINE_VERSION = Path(__file__).with_name("ENGINE_VERSION").read_text().strip()
+
+INSERT_SHORTLIST = """
+    INSERT INTO bench.candidate_shortlists (
+        shortlist_id, requirement_id, generated_at,
+        engine_version, total_candidates
+    ) VALUES (
+        :sl_id, :req_id, GETDATE(), :engine_version, :count
+    )
+"""
+
+INSERT_ITEM = """
+    INSERT INTO bench.candidate_shortlist_items (
+        shortlist_item_id, shortlist_id, employee_id, rank,
+        overall_fit_score, skill_match_score, experience_score,
+        availability_score, certifications_score, bench_status,
+        reason_for_ranking, strengths, gaps,
+        llm_summary, llm_breakdown_json, selected
+    ) VALUES (
+        :item_id, :sl_id, :emp_id, :rank,
+        :overall_fit, :skill_match, :exp_match,
+        :avail_match, :cert_match, :bench_status,
+        :reason, :strengths, :gaps,
+        :llm_summary, :llm_json, 0
+    )
+"""
+
+UPDATE_STATUS = """
+    UPDATE bench.client_requirements
+    SET status = 'In Progress'
+    WHERE requirement_id = :req_id
+"""
+
+# Maintained counter read by GET /requirements (see migrations/001)
+UPDATE_MATCHED_COUNT = """
+    UPDATE bench.client_requirements
+    SET matched_candidates = (
+        SELECT COUNT(DISTINCT csi.employee_id)
+        FROM bench.candidate_shortlists cs
+        JOIN bench.candidate_shortlist_items csi ON cs.shortlist_id = csi.shortlist_id
+        WHERE cs.requirement_id = :req_id
+    )
+    WHERE requirement_id = :req_id
+"""
+
+INSERT_MATCH_HISTORY = """
+    INSERT INTO bench.match_history
+    (match_run_id, requirement_id, run_timestamp, status,
+     top_candidate_id, top_candidate_fit, engine_version)
+    VALUES (
+        :match_id, :req_id, GETDATE(), 'Matched',
+        :emp_id, :fit_score, :engine_version
+    )
+"""
+
+# Column names returned to the client for each stored item, mapped from the
+# insert parameters (avoids reading back the rows we just wrote)
+STORED_COLUMNS = {
+    "shortlist_item_id": "item_id",
+    "employee_id": "emp_id",
+    "rank": "rank",
+    "overall_fit_score": "overall_fit",
+    "skill_match_score": "skill_match",
+    "experience_score": "exp_match",
+    "availability_score": "avail_match",
+    "certifications_score": "cert_match",
+    "bench_status": "bench_status",
+    "reason_for_ranking": "reason",
+    "strengths": "strengths",
+    "gaps": "gaps",
+    "llm_summary": "llm_summary",
+    "llm_breakdown_json": "llm_json",
+}
+
+
+def build_item_params(shortlist_id, candidate):
+    """Map one search result to candidate_shortlist_items parameters."""
+    item_id = f"CSI-{str(uuid.uuid4())[:8].upper()}"
+    breakdown = candidate.get("breakdown", {})
+
+    skill_details = candidate.get("skill_match_details", [])
+    matched_skills = [
+        str(s.get("required_skill", ""))
+        for s in skill_details
+        if int(s.get("confidence", 0)) > 0
+    ]
+    strengths_summary = ", ".join(matched_skills)[:450] if matched_skills else "No matching skills"
+
+    unmatched_skills = [
+        str(s.get("required_skill", ""))
+        for s in skill_details
+        if int(s.get("confidence", 0)) == 0
+    ]
+    gaps_summary = ", ".join(unmatched_skills)[:450] if unmatched_skills else ""
+
+    llm_summary = str(candidate.get("llm_summary", "No summary available"))
+    reason = llm_summary[:200]
+
+    return {
+        "item_id": item_id,
+        "sl_id": shortlist_id,
+        "emp_id": str(candidate["employee_id"]),
+        "rank": int(candidate["rank"]),
+        "overall_fit": int(candidate["overall_fit_score"]),
+        "skill_match": int(breakdown.get("skills_match", 0)),
+        "exp_match": int(breakdown.get("experience_match", 0)),
+        "avail_match": int(breakdown.get("availability_match", 0)),
+        "cert_match": int(breakdown.get("certifications_match", 0)),
+        "bench_status": str(candidate["bench_status"]),
+        "reason": reason,
+        "strengths": strengths_summary,
+        "gaps": gaps_summary,
+        "llm_summary": llm_summary,
+        "llm_json": dumps_str(breakdown),
+    }
+
+
+def prepare_shortlist(results):
+    """
+    Build the shortlist ID, item insert parameters and the stored rows
+    returned to the client, without touching the database.
+
+    Returns:
+        (shortlist_id, items, stored_candidates)
+    """
+    shortlist_id = f"SL-{str(uuid.uuid4())[:8].upper()}"
+    items = [build_item_params(shortlist_id, candidate) for candidate in results]
+    stored_candidates = sorted(
+        (
+            {column: item[param] for column, param in STORED_COLUMNS.items()}
+            for item in items
+        ),
+        key=lambda c: c["rank"],
+    )
+    return shortlist_id, items, stored_candidates
+
+
+def write_shortlist(conn, requirement_id, shortlist_id, items, update_status=True, engine_version=ENGINE_VERSION):
+    """Write a prepared shortlist inside an open transaction."""
+    conn.execute(text(INSERT_SHORTLIST), {
+        "sl_id": shortlist_id,
+        "req_id": requirement_id,
+        "engine_version": engine_version,
+        "count": len(items)
+    })
+
+    if items:
+        conn.execute(text(INSERT_ITEM), items)
+
+    conn.execute(text(UPDATE_MATCHED_COUNT), {"req_id": requirement_id})
+
+    if update_status:
+        conn.execute(text(UPDATE_STATUS), {"req_id": requirement_id})
+
+
+def shortlist_exists(conn, shortlist_id):
+    """Check whether a shortlist was already written (for idempotent replays)."""
+    row = conn.execute(
+        text("SELECT 1 FROM bench.candidate_shortlists WHERE shortlist_id = :sl_id"),
+        {"sl_id": shortlist_id},
+    ).first()
+    return row is not None
+
+
+def store_shortlist(requirement_id, results, update_status=True):
+    """
+    Store search results as a new shortlist for a requirement.
+
+    Flow (one transaction, a constant number of round trips):
+    1. Store shortlist in bench.candidate_shortlists
+    2. Store all candidates in bench.candidate_shortlist_items (executemany,
+       which pyodbc sends as one batch when fast_executemany is enabled)
+    3. Update requirement status to 'In Progress' (unless update_status=False)
+
+    Returns:
+        (shortlist_id, stored_candidates) - stored rows are built from the
+        inserted parameters rather than read back
+    """
+    shortlist_id, items, stored_candidates = prepare_shortlist(results)
+
+    with get_engine().begin() as conn:
+        write_shortlist(conn, requirement_id, shortlist_id, items, update_status)
+    invalidate_requirement(requirement_id)
+
+    logger.info(f"✓ Stored {len(results)} candidates to shortlist {shortlist_id}")
+    return shortlist_id, stored_candidates
+
+
+def mark_in_progress(requirement_id):
+    """Update requirement status to 'In Progress' without storing a shortlist."""
+    with get_engine().begin() as conn:
+        conn.execute(text(UPDATE_STATUS), {"req_id": requirement_id})
+
+
+def delete_shortlist(shortlist_id):
+    """
+    Delete a stale provisional shortlist and its items. A shortlist with a
+    selected candidate is kept (it may already have been served by
+    GET /shortlist), so selection history is never lost. Returns True if
+    it was deleted.
+    """
+    params = {"sl_id": shortlist_id}
+    with get_engine().begin() as conn:
+        row = conn.execute(
+            text("SELECT requirement_id FROM bench.candidate_shortlists WHERE shortlist_id = :sl_id"),
+            params,
+        ).first()
+        # Conditional deletes, so a selection committed meanwhile also keeps it
+        conn.execute(text("""
+            DELETE FROM bench.candidate_shortlist_items
+            WHERE shortlist_id = :sl_id
+              AND NOT EXISTS (
+                  SELECT 1 FROM bench.candidate_shortlist_items
+                  WHERE shortlist_id = :sl_id AND selected = 1
+              )
+        """), params)
+        deleted = conn.execute(text("""
+            DELETE FROM bench.candidate_shortlists
+            WHERE shortlist_id = :sl_id
+              AND NOT EXISTS (
+                  SELECT 1 FROM bench.candidate_shortlist_items WHERE shortlist_id = :sl_id
+              )
+        """), params).rowcount
+        if row and deleted:
+            conn.execute(text(UPDATE_MATCHED_COUNT), {"req_id": row[0]})
+    if row is None:
+        return False
+    if not deleted:
+        logger.info(f"Kept stale shortlist {shortlist_id}: a candidate was selected from it")
+        return False
+    invalidate_requirement(row[0])
+    logger.info(f"Deleted stale shortlist {shortlist_id}")
+    return True
@@ -0,0 +1,269 @@
+"""
+Columnar, memory-mapped snapshot of the tables search reads.
+
+ingest() (or `python snapshot.py`) writes the employee, skill, certification,
+project, bench and aggregated profile tables as uncompressed Arrow IPC files in
+a fresh directory under SNAPSHOT_DIR, then publishes it by atomically replacing
+the CURRENT pointer file. ingest() only stages its snapshot; it is activated
+together with the index version built from the same data
+(index_versions.publish), and `python main.py rollback` restores the snapshot
+of the version it rolls back to. API workers memory-map the current snapshot read-only
+and wrap the Arrow buffers in pandas columns without copying, so every uvicorn
+worker shares one page-cache copy instead of holding its own DataFrames.
+Category columns (see table_schema.py) are stored dictionary-encoded and come
+back as pandas categoricals; only their small integer codes are materialized.
+
+pyarrow is optional: without it (or before the first snapshot is published)
+search falls back to reading the CSVs.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+SNAPSHOT_DIR = Path(os.getenv("BENCHMATCH_SNAPSHOT_DIR", "snapshots"))
+POINTER_FILE = "CURRENT"
+# Published snapshots kept on disk (older ones may still be mapped by a worker)
+SNAPSHOT_KEEP = int(os.getenv("BENCHMATCH_SNAPSHOT_KEEP", "3"))
+
+TABLES = (
+    "employees",
+    "skills",
+    "certifications",
+    "projects",
+    "bench_status",
+    "employee_profiles",
+)
+
+
+def pyarrow_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ---------------------------
+# WRITE / PUBLISH
+# ---------------------------
+class SnapshotWriter:
+    """
+    Build a snapshot table by table or chunk by chunk, then publish it.
+
+    write() stores a whole DataFrame as is (category columns stay
+    dictionary-encoded). append() streams chunks of a table whose dictionaries
+    would differ per chunk, so category columns are written as plain strings
+    and re-encoded when the snapshot is mapped. Files go to a staging
+    directory that publish() renames into place before CURRENT is swapped, so
+    readers only ever see complete snapshots; abort() discards it.
+    publish(activate=False) only stages the snapshot for a later activate().
+    Used as a context manager it publishes on a clean exit and aborts on an
+    exception.
+    """
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.version = f"{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 1_000_000_000:09d}"
+        self.staging = self.directory / f".{self.version}.tmp"
+        self.staging.mkdir()
+        self._files = {}
+
+    def _open(self, name, schema):
+        import pyarrow as pa
+
+        # Uncompressed IPC files can be memory-mapped without copying
+        sink = pa.OSFile(str(self.staging / f"{name}.arrow"), "wb")
+        self._files[name] = (sink, pa.ipc.new_file(sink, schema), schema)
+
+    def write(self, name, df):
+        import pyarrow as pa
+
+        if name in self._files:
+            raise ValueError(f"Snapshot table {name} already written")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        self._open(name, table.schema)
+        self._files[name][1].write_table(table)
+
+    def append(self, name, df):
+        import pyarrow as pa
+
+        plain = df.astype({c: "str" for c in df.columns if df[c].dtype == "category"})
+        table = pa.Table.from_pandas(plain, preserve_index=False)
+        if name not in self._files:
+            self._open(name, table.schema)
+        _, writer, schema = self._files[name]
+        writer.write_table(table.cast(schema))
+
+    def _close(self):
+        for sink, writer, _ in self._files.values():
+            writer.close()
+            sink.close()
+
+    def abort(self):
+        try:
+            self._close()
+        finally:
+            shutil.rmtree(self.staging, ignore_errors=True)
+
+    def publish(self, activate=True):
+        """Publish (or with activate=False, stage) the written tables; returns the snapshot version."""
+        try:
+            self._close()
+            os.replace(self.staging, self.directory / self.version)
+        except Exception:
+            shutil.rmtree(self.staging, ignore_errors=True)
+            raise
+
+        if not activate:
+            logger.info(f"🔹 Staged snapshot {self.version} ({', '.join(self._files)}) in {self.directory}/")
+            return self.version
+        activate_snapshot(self.version, self.directory)
+        return self.version
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.publish()
+        else:
+            self.abort()
+        return False
+
+
+def write_snapshot(tables, directory=SNAPSHOT_DIR, activate=True):
+    """
+    Write `tables` (name -> DataFrame) as a new snapshot and publish it
+    (or only stage it, with activate=False).
+
+    Returns:
+        The snapshot version
+    """
+    writer = SnapshotWriter(directory)
+    try:
+        for name, df in tables.items():
+            writer.write(name, df)
+    except Exception:
+        writer.abort()
+        raise
+    return writer.publish(activate)
+
+
+def activate_snapshot(version, directory=SNAPSHOT_DIR, protect=()):
+    """Point CURRENT at a published or staged snapshot `version`."""
+    directory = Path(directory)
+    if not (directory / version).is_dir():
+        raise ValueError(f"Unknown snapshot version: {version}")
+    pointer_tmp = directory / f".{POINTER_FILE}.{os.getpid()}.tmp"
+    pointer_tmp.write_text(version)
+    os.replace(pointer_tmp, directory / POINTER_FILE)
+    logger.info(f"✓ Published snapshot {version} to {directory}/")
+    prune_snapshots(directory, protect=protect)
+
+
+def discard_snapshot(version, directory=SNAPSHOT_DIR):
+    """Delete a staged snapshot that will never be activated."""
+    if version and version != current_version(directory):
+        shutil.rmtree(Path(directory) / version, ignore_errors=True)
+
+
+def prune_snapshots(directory=SNAPSHOT_DIR, keep=SNAPSHOT_KEEP, protect=()):
+    """
+    Delete all but the `keep` newest snapshots older than the current one.
+    Newer ones are staged for an ingest that hasn't swapped yet; `protect`
+    lists snapshots an index version can still be rolled back to.
+    """
+    directory = Path(directory)
+    current = current_version(directory)
+    versions = sorted(
+        p.name for p in directory.iterdir()
+        if p.is_dir() and not p.name.startswith(".") and (current is None or p.name <= current)
+    )
+    for name in versions[:-keep] if keep > 0 else versions:
+        if name == current or name in protect:
+            continue
+        try:
+            shutil.rmtree(directory / name)
+        except OSError as e:
+            # Windows refuses to delete files another worker still has mapped
+            logger.warning(f"Could not remove old snapshot {name}: {e}")
+
+
+# ---------------------------
+# READ (MEMORY-MAPPED)
+# ---------------------------
+def current_version(directory=SNAPSHOT_DIR):
+    """Version named by the CURRENT pointer, or None if nothing is published."""
+    try:
+        return (Path(directory) / POINTER_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _map_table(path):
+    import pyarrow as pa
+
+    from table_schema import CATEGORY, KEY, SCHEMAS
+
+    source = pa.memory_map(str(path), "r")
+    table = pa.ipc.open_file(source).read_all()
+    # Tables written with append() store their labels as plain strings
+    kinds = SCHEMAS.get(path.stem, {})
+    for i, field in enumerate(table.schema):
+        is_text = pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+        if is_text and kinds.get(field.name) in (CATEGORY, KEY):
+            table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+    # split_blocks keeps numeric/date columns as views of the mapped buffers;
+    # strings stay Arrow-backed and dictionary columns become categoricals
+    return table.to_pandas(split_blocks=True)
+
+
+_lock = threading.Lock()
+_loaded = {"key": None, "tables": None}
+
+
+def load_snapshot(directory=SNAPSHOT_DIR):
+    """
+    Return the current snapshot as a dict of DataFrames backed by the mapped
+    files, or None when no snapshot is published or pyarrow isn't installed.
+    Re-maps only when CURRENT points at a new version.
+    """
+    version = current_version(directory)
+    if version is None:
+        return None
+    key = (str(directory), version)
+    if _loaded["key"] == key:
+        return _loaded["tables"]
+
+    if not pyarrow_available():
+        return None
+
+    with _lock:
+        if _loaded["key"] != key:
+            path = Path(directory) / version
+            tables = {
+                name: _map_table(path / f"{name}.arrow")
+                for name in TABLES
+                if (path / f"{name}.arrow").exists()
+            }
+            _loaded["tables"] = tables
+            _loaded["key"] = key
+            logger.info(f"🔹 Mapped snapshot {version} ({', '.join(tables)})")
+        return _loaded["tables"]
+
+
+if __name__ == "__main__":
+    # Publish a snapshot from the current CSVs without re-embedding
+    from data_ingestion import publish_snapshot
+
+    publish_snapshot()
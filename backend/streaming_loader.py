@@ -0,0 +1,181 @@
+"""
+Chunked, streaming load of the employee tables from SQL for ingest().
+
+With BENCHMATCH_INGEST_SOURCE=sql, ingest() no longer reads four whole tables
+into memory. Each table is streamed from the bench schema
+(server-side cursor, BENCHMATCH_INGEST_CHUNK_ROWS rows at a time) with only
+the columns search uses (table_schema.SCHEMAS), ordered by employee_id.
+Because every stream is sorted on the same key, a chunk of employees is
+joined with its skill, certification and project rows merge-join style: each
+child stream is consumed up to the chunk's last employee_id and the rest is
+kept for the next chunk. Memory therefore stays bounded by the chunk size, not
+the table sizes.
+
+Every chunk is aggregated with aggregate_employee_data() and appended to a
+new columnar snapshot, which is staged once all tables are streamed (ingest()
+activates it with the index version it builds).
+Works against Azure SQL or the local SQLite stand-in (BENCHMATCH_DB_URL).
+"""
+
+import logging
+import os
+
+import pandas as pd
+from sqlalchemy import text
+
+from db import binary_order, get_engine
+from table_schema import SCHEMAS, apply_schema, lean_tables
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+# "csv" (data/*.csv, whole tables) or "sql" (streamed from the bench schema)
+INGEST_SOURCE = os.getenv("BENCHMATCH_INGEST_SOURCE", "csv")
+CHUNK_ROWS = int(os.getenv("BENCHMATCH_INGEST_CHUNK_ROWS", "5000"))
+
+# snapshot table -> (bench table, tie-breaking key after employee_id)
+TABLES = {
+    "employees": ("employees", None),
+    "skills": ("skills", "skill_id"),
+    "certifications": ("certifications", "certification_id"),
+    "projects": ("project_history", "project_id"),
+    "bench_status": ("bench_status", None),
+}
+
+
+# ---------------------------
+# STREAMS
+# ---------------------------
+def iter_table(name, chunk_rows=CHUNK_ROWS):
+    """
+    Yield chunks of one table, ordered by employee_id, with explicit dtypes.
+    Always yields at least one (possibly empty) chunk.
+    """
+    table, tie = TABLES[name]
+    columns = ", ".join(SCHEMAS[name])
+    order = binary_order("employee_id") + (f", {tie}" if tie else "")
+    query = text(f"SELECT {columns} FROM bench.{table} ORDER BY {order}")
+    with get_engine().connect().execution_options(stream_results=True) as conn:
+        for chunk in pd.read_sql(query, conn, chunksize=chunk_rows):
+            yield apply_schema(chunk, name)
+
+
+def count_employees():
+    with get_engine().connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM bench.employees")).scalar() or 0
+
+
+def _in_order(name, chunks):
+    """Pass chunks through, failing if employee_id ever goes backwards."""
+    last_id = None
+    for chunk in chunks:
+        ids = chunk["employee_id"].astype(str)
+        if len(ids):
+            # Python and the database must agree on the order, or rows get lost
+            if (last_id is not None and ids.iloc[0] < last_id) or not ids.is_monotonic_increasing:
+                raise RuntimeError(
+                    f"bench.{TABLES[name][0]} is not streamed in employee_id order; check its collation"
+                )
+            last_id = ids.iloc[-1]
+        yield chunk
+
+
+class _SortedStream:
+    """One table consumed in employee_id order, a chunk at a time."""
+
+    def __init__(self, name, chunk_rows):
+        self._chunks = _in_order(name, iter_table(name, chunk_rows))
+        self._buffer = next(self._chunks)
+        self.empty = self._buffer.iloc[:0]
+
+    def take_through(self, last_id):
+        """All remaining rows with employee_id <= last_id."""
+        parts = []
+        while self._buffer is not None:
+            ids = self._buffer["employee_id"].astype(str).to_numpy(dtype=object)
+            cut = int(ids.searchsorted(last_id, side="right"))
+            if cut:
+                parts.append(self._buffer.iloc[:cut])
+            if cut < len(ids):
+                self._buffer = self._buffer.iloc[cut:]
+                break
+            self._buffer = next(self._chunks, None)
+        return pd.concat(parts, ignore_index=True) if parts else self.empty
+
+    def rest(self):
+        """Yield the rows after the last employee (IDs with no employee row)."""
+        while self._buffer is not None:
+            if len(self._buffer):
+                yield self._buffer
+            self._buffer = next(self._chunks, None)
+
+
+# ---------------------------
+# MERGE-JOIN AGGREGATION
+# ---------------------------
+def iter_profile_chunks(chunk_rows=CHUNK_ROWS, staged=None):
+    """
+    Yield aggregated employee profiles (aggregate_employee_data output) one
+    employee chunk at a time. Every streamed table is appended to a new
+    snapshot, staged after the last chunk with its version stored in
+    staged["snapshot"]; a snapshot write failure only skips the snapshot
+    (search keeps the previous one).
+    """
+    import snapshot
+    from data_ingestion import aggregate_employee_data
+
+    writer = snapshot.SnapshotWriter() if snapshot.pyarrow_available() else None
+
+    def save(name, df):
+        nonlocal writer
+        if writer is None:
+            return
+        try:
+            writer.append(name, df)
+        except Exception as e:
+            logger.warning(f"Snapshot write failed; search keeps the previous snapshot: {e}")
+            writer.abort()
+            writer = None
+
+    try:
+        children = {name: _SortedStream(name, chunk_rows) for name in ("skills", "certifications", "projects")}
+        for employees in _in_order("employees", iter_table("employees", chunk_rows)):
+            if employees.empty:
+                continue
+            last_id = str(employees["employee_id"].iloc[-1])
+            parts = {name: stream.take_through(last_id) for name, stream in children.items()}
+            employees, skills, certs, projects = lean_tables(
+                employees, parts["skills"], parts["certifications"], parts["projects"]
+            )
+            profiles = aggregate_employee_data(employees, skills, certs, projects)
+            for name, df in (
+                ("employees", employees),
+                ("skills", skills),
+                ("certifications", certs),
+                ("projects", projects),
+                ("employee_profiles", profiles),
+            ):
+                save(name, df)
+            yield profiles
+
+        orphans = 0
+        for name, stream in children.items():
+            save(name, stream.empty)
+            for rest in stream.rest():
+                orphans += len(rest)
+                save(name, rest)
+        if orphans:
+            logger.warning(f"⚠️  {orphans} skill/certification/project rows reference no employee")
+        for chunk in iter_table("bench_status", chunk_rows):
+            save("bench_status", chunk)
+
+        if writer is not None:
+            version = writer.publish(activate=False)
+            writer = None
+            if staged is not None:
+                staged["snapshot"] = version
+    finally:
+        if writer is not None:
+            writer.abort()
@@ -0,0 +1,134 @@
+"""
+Explicit, memory-lean dtypes for the employee tables.
+
+read_csv / read_sql leave every text column as one Python-level string per
+row, so the repeated labels (role, skill name and level, certificate,
+issuer, status, client...) dominate the memory of the search tables.
+apply_schema() converts a raw table to:
+
+- category for low-cardinality labels (one copy of each distinct value plus
+  a small integer code per row);
+- a compact categorical key for employee_id, shared by all tables so merges
+  and groupbys compare codes instead of strings;
+- str for free text, float64 for numbers (scores are unchanged);
+- datetime64 for the date columns, parsed once at load instead of per use.
+
+Columns not listed here are left as they are. `python benchmarks/memory_report.py`
+shows bytes per employee before and after.
+"""
+
+import pandas as pd
+
+# ---------------------------
+# SCHEMA
+# ---------------------------
+KEY = "key"
+CATEGORY = "category"
+TEXT = "text"
+NUMBER = "number"
+DATE = "date"
+
+SCHEMAS = {
+    "employees": {
+        "employee_id": KEY,
+        "name": TEXT,
+        "email": TEXT,
+        "role": CATEGORY,
+        "experience_years": NUMBER,
+        "primary_skill": CATEGORY,
+    },
+    "skills": {
+        "skill_id": TEXT,
+        "employee_id": KEY,
+        "skill_name": CATEGORY,
+        "skill_level": CATEGORY,
+        "years_experience": NUMBER,
+    },
+    "certifications": {
+        "certification_id": TEXT,
+        "certificate_name": CATEGORY,
+        "employee_id": KEY,
+        "issued_by": CATEGORY,
+        "validity": DATE,
+    },
+    "projects": {
+        "project_id": TEXT,
+        "employee_id": KEY,
+        "project_name": TEXT,
+        "client": CATEGORY,
+        "role": CATEGORY,
+        "tools_used": CATEGORY,
+        "experience_summary": TEXT,
+    },
+    "bench_status": {
+        "employee_id": KEY,
+        "status": CATEGORY,
+        "since_date": DATE,
+        "end_date": DATE,
+        "salary": NUMBER,
+    },
+}
+
+
+def key_dtype(*frames):
+    """Categorical dtype over every employee_id in `frames` (first-seen order)."""
+    ids = pd.concat(
+        [df["employee_id"].astype(str) for df in frames if df is not None and "employee_id" in df],
+        ignore_index=True,
+    )
+    return pd.CategoricalDtype(ids.drop_duplicates().tolist())
+
+
+def _convert(column, kind, id_dtype):
+    if kind == KEY:
+        dtype = id_dtype if id_dtype is not None else pd.CategoricalDtype(column.dropna().astype(str).unique())
+        return column if column.dtype == dtype else column.astype(str).astype(dtype)
+    if kind == CATEGORY:
+        return column if isinstance(column.dtype, pd.CategoricalDtype) else column.astype("category")
+    if kind == TEXT:
+        return column.astype("str")
+    if kind == NUMBER:
+        return pd.to_numeric(column, errors="coerce").astype("float64")
+    if kind == DATE:
+        if pd.api.types.is_datetime64_any_dtype(column):
+            return column
+        return pd.to_datetime(column, errors="coerce", format="ISO8601")
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def apply_schema(df, table, id_dtype=None):
+    """`df` with the explicit dtypes of `table` (idempotent)."""
+    schema = SCHEMAS[table]
+    return df.assign(**{
+        name: _convert(df[name], kind, id_dtype)
+        for name, kind in schema.items()
+        if name in df.columns
+    })
+
+
+def lean_tables(employees, skills, certs, projects):
+    """The four search tables converted with one shared employee_id key."""
+    id_dtype = key_dtype(employees, skills, certs, projects)
+    return (
+        apply_schema(employees, "employees", id_dtype),
+        apply_schema(skills, "skills", id_dtype),
+        apply_schema(certs, "certifications", id_dtype),
+        apply_schema(projects, "projects", id_dtype),
+    )
+
+
+def fill_missing(df, value=""):
+    """df.fillna(value) that also works on category columns lacking `value`."""
+    df = df.copy()
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, pd.CategoricalDtype) and column.isna().any():
+            if value not in column.cat.categories:
+                column = column.cat.add_categories([value])
+            df[name] = column.fillna(value)
+    return df.fillna(value)
+
+
+def memory_bytes(df):
+    """Deep memory footprint of a DataFrame, index included."""
+    return int(df.memory_usage(deep=True, index=True).sum())
@@ -0,0 +1,106 @@
+"""
+Per-stage latency tracing for the search pipeline.
+
+`span(name)` times a block of code. Inside a request started with
+`start_trace()` the timing is recorded on that request's Trace (held in a
+contextvar, so concurrent requests never mix), and registered observers - e.g.
+metrics histograms - see every span whether or not a trace is active.
+
+/search records its stages (load, prefilter, embed, vector_query, rerank,
+llm, enrich, persist, ...) on every request and returns them only when asked:
+with the `X-Trace: 1` request header as a Server-Timing response header, and
+with `"trace": true` in the body also as a `timings` field.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar("benchmatch_trace", default=None)
+_observers = []
+
+
+class Trace:
+    """Spans recorded for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+
+    def add(self, name, start, duration):
+        self.spans.append((name, start - self.started, duration))
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        """{stage: {"ms": total ms, "count": n}} in first-seen order, plus total."""
+        stages = {}
+        for name, _, duration in self.spans:
+            stage = stages.setdefault(name, {"ms": 0.0, "count": 0})
+            stage["ms"] += duration * 1000
+            stage["count"] += 1
+        for stage in stages.values():
+            stage["ms"] = round(stage["ms"], 2)
+        stages["total"] = {"ms": round(self.total() * 1000, 2), "count": 1}
+        return stages
+
+    def server_timing(self):
+        """Server-Timing header value (repeated stages are summed)."""
+        return ", ".join(
+            f"{name};dur={stage['ms']:.2f}" for name, stage in self.summary().items()
+        )
+
+
+def add_observer(observer):
+    """Call observer(name, seconds) for every finished span."""
+    _observers.append(observer)
+
+
+def current_trace():
+    return _current.get()
+
+
+@contextmanager
+def start_trace():
+    """Record spans of the enclosed block on a new Trace."""
+    trace = Trace()
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+class Span:
+    """A running stage timer; call end() when the stage finishes."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+
+    def end(self):
+        duration = time.perf_counter() - self.start
+        trace = _current.get()
+        if trace is not None:
+            trace.add(self.name, self.start, duration)
+        for observer in _observers:
+            observer(self.name, duration)
+        return duration
+
+
+def begin(name):
+    """Start timing stage `name` (for stages too long to wrap in `with`)."""
+    return Span(name)
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block as stage `name`."""
+    running = Span(name)
+    try:
+        yield running
+    finally:
+        running.end()
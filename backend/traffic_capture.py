@@ -0,0 +1,107 @@
+"""
+Optional capture of /search traffic for offline replay.
+
+With BENCHMATCH_CAPTURE=1 every /search (or a BENCHMATCH_CAPTURE_SAMPLE
+fraction of them) appends one JSON line to BENCHMATCH_CAPTURE_PATH
+(captures/search.jsonl):
+
+    {"ts": ..., "engine_version": "1.0", "data_version": "...", "key": "...",
+     "request": {<normalized search_employees parameters>},
+     "ranks": [["ID_0007", 87], ...], "latency_ms": 123.4, "source": "search"}
+
+`request` is exactly what search_employees received, so
+benchmarks/replay.py can re-run the captured workload against two engine
+configurations and compare latency and rankings. Only parameters, employee
+IDs and fit scores are logged - no names, summaries or LLM output. The file
+is rotated to <name>.1 once it exceeds BENCHMATCH_CAPTURE_MAX_MB (50).
+Capture never fails a request: write errors are logged and dropped.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+from fast_json import dumps
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_ENABLED = os.getenv("BENCHMATCH_CAPTURE", "0") == "1"
+CAPTURE_PATH = Path(os.getenv("BENCHMATCH_CAPTURE_PATH", "captures/search.jsonl"))
+CAPTURE_SAMPLE = float(os.getenv("BENCHMATCH_CAPTURE_SAMPLE", "1.0"))
+CAPTURE_MAX_BYTES = int(float(os.getenv("BENCHMATCH_CAPTURE_MAX_MB", "50")) * 1024 * 1024)
+
+_lock = threading.Lock()
+
+
+def normalize_request(params):
+    """search_employees parameters with stripped strings and empty items dropped."""
+    return {
+        "required_skills": [s.strip() for s in params.get("required_skills") or [] if s and s.strip()],
+        "required_certs": [c.strip() for c in params.get("required_certs") or [] if c and c.strip()],
+        "min_experience": int(params.get("min_experience") or 0),
+        "role_title": (params.get("role_title") or "").strip(),
+        "requirement_summary": (params.get("requirement_summary") or "").strip(),
+        "top_n": int(params.get("top_n") or 5),
+        "allow_partial": bool(params.get("allow_partial", True)),
+        "hard_constraints": sorted(params.get("hard_constraints") or []),
+    }
+
+
+def ranks_of(results):
+    """[[employee_id, overall_fit_score], ...] in rank order."""
+    return [[str(r.get("employee_id")), int(r.get("overall_fit_score") or 0)] for r in results]
+
+
+def should_capture():
+    return CAPTURE_ENABLED and (CAPTURE_SAMPLE >= 1.0 or random.random() < CAPTURE_SAMPLE)
+
+
+def _rotate():
+    try:
+        if CAPTURE_PATH.stat().st_size >= CAPTURE_MAX_BYTES:
+            os.replace(CAPTURE_PATH, CAPTURE_PATH.with_name(CAPTURE_PATH.name + ".1"))
+    except FileNotFoundError:
+        pass
+
+
+def record(params, results, data_version, latency_ms, source="search"):
+    """Append one captured search (call only when should_capture() said so)."""
+    from precompute import search_key
+    from shortlist_store import ENGINE_VERSION
+
+    try:
+        request = normalize_request(params)
+        line = dumps({
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "engine_version": ENGINE_VERSION,
+            "data_version": data_version,
+            "key": search_key(request),
+            "request": request,
+            "ranks": ranks_of(results),
+            "latency_ms": round(latency_ms, 2),
+            "source": source,
+        }) + b"\n"
+        with _lock:
+            CAPTURE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _rotate()
+            with open(CAPTURE_PATH, "ab") as f:
+                f.write(line)
+    except Exception as e:
+        logger.warning(f"Search capture failed: {e}")
+
+
+def read_capture(path):
+    """Yield captured entries from a capture file (skips malformed lines)."""
+    import json
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and "request" in entry:
+                yield entry
@@ -0,0 +1,222 @@
+"""
+Compact first-pass vector index with full-precision rescoring.
+
+nomic-embed-text-v1.5 is a Matryoshka model: the leading dimensions of an
+embedding carry most of its signal. This index keeps a truncated (e.g. 256-d)
+and optionally int8/float16-quantized copy of every employee vector for a
+brute-force first pass, then rescores the best `rescore_factor * k` candidates
+against the full 768-d float32 vectors. Both arrays are .npy files opened with
+mmap_mode="r", so workers share them through the page cache and only the rows
+being rescored of the full-precision file are ever touched.
+
+Search uses it instead of the Chroma HNSW query when
+BENCHMATCH_VECTOR_INDEX=quantized. Results come back in Chroma's query()
+shape (ids / metadatas / cosine distances), so the ranking code is unchanged.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+VECTOR_INDEX_MODE = os.getenv("BENCHMATCH_VECTOR_INDEX", "chroma")  # chroma | quantized
+INDEX_DIR = Path(os.getenv("BENCHMATCH_VECTOR_INDEX_DIR", "vector_index"))
+INDEX_DIM = int(os.getenv("BENCHMATCH_VECTOR_DIM", "256"))
+INDEX_DTYPE = os.getenv("BENCHMATCH_VECTOR_DTYPE", "int8")  # int8 | float16 | float32
+RESCORE_FACTOR = int(os.getenv("BENCHMATCH_VECTOR_RESCORE", "4"))
+
+DTYPES = ("int8", "float16", "float32")
+# Rows scored per block in the first pass (bounds the float32 temporaries)
+_BLOCK_ROWS = 4096
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def truncate(vectors, dim):
+    """Matryoshka truncation: keep the leading `dim` dimensions, re-normalize."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return _normalize(vectors[..., :dim])
+
+
+def quantize(vectors, dtype):
+    """
+    Quantize unit vectors for the first pass.
+
+    Returns:
+        (codes, scale) - int8 codes use a symmetric per-dimension scale;
+        float16/float32 codes have scale None
+    """
+    if dtype == "float32":
+        return vectors.astype(np.float32), None
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    if dtype == "int8":
+        scale = np.abs(vectors).max(axis=0) / 127.0
+        scale[scale == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scale), -127, 127).astype(np.int8)
+        return codes, scale.astype(np.float32)
+    raise ValueError(f"Unsupported index dtype: {dtype} (expected one of {DTYPES})")
+
+
+# ---------------------------
+# BUILD
+# ---------------------------
+def build_index(ids, vectors, metadatas=None, directory=INDEX_DIR, dim=INDEX_DIM, dtype=INDEX_DTYPE):
+    """
+    Write a compact index for `vectors` (one per id) to `directory`.
+
+    Files are written to a staging directory and swapped in with a rename,
+    so a running worker never maps a half-written index.
+    """
+    full = _normalize(vectors)
+    dim = min(dim, full.shape[1])
+    codes, scale = quantize(truncate(full, dim), dtype)
+
+    directory = Path(directory)
+    staging = directory.with_name(f".{directory.name}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    np.save(staging / "full.npy", full)
+    np.save(staging / "codes.npy", codes)
+    if scale is not None:
+        np.save(staging / "scale.npy", scale)
+    meta = {
+        "ids": [str(i) for i in ids],
+        "metadatas": metadatas or [{} for _ in ids],
+        "dim": dim,
+        "full_dim": int(full.shape[1]),
+        "dtype": dtype,
+        "built_at": time.time(),
+    }
+    (staging / "meta.json").write_text(json.dumps(meta))
+
+    previous = directory.with_name(f".{directory.name}.old")
+    shutil.rmtree(previous, ignore_errors=True)
+    if directory.exists():
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+
+    logger.info(
+        f"✓ Built {dtype} {dim}-d vector index for {len(meta['ids'])} employees in {directory}/"
+    )
+    return directory
+
+
+def build_from_chroma(collection, directory=INDEX_DIR, dim=INDEX_DIM, dtype=INDEX_DTYPE):
+    """Build the compact index from the vectors already stored in Chroma."""
+    data = collection.get(include=["embeddings", "metadatas"])
+    return build_index(data["ids"], data["embeddings"], data["metadatas"], directory, dim, dtype)
+
+
+# ---------------------------
+# QUERY
+# ---------------------------
+class QuantizedIndex:
+    """Memory-mapped compact index loaded from a build_index() directory."""
+
+    def __init__(self, directory=INDEX_DIR):
+        self.directory = Path(directory)
+        meta = json.loads((self.directory / "meta.json").read_text())
+        self.ids = meta["ids"]
+        self.metadatas = meta["metadatas"]
+        self.dim = meta["dim"]
+        self.dtype = meta["dtype"]
+        self.full = np.load(self.directory / "full.npy", mmap_mode="r")
+        self.codes = np.load(self.directory / "codes.npy", mmap_mode="r")
+        scale_path = self.directory / "scale.npy"
+        self.scale = np.load(scale_path) if scale_path.exists() else None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def bytes_per_vector(self):
+        """First-pass bytes per employee (the full vectors stay on disk)."""
+        return self.codes.shape[1] * self.codes.dtype.itemsize
+
+    def _first_pass(self, query):
+        q = truncate(query, self.dim)
+        if self.scale is not None:
+            q = q * self.scale
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        for start in range(0, len(self.ids), _BLOCK_ROWS):
+            block = np.asarray(self.codes[start:start + _BLOCK_ROWS], dtype=np.float32)
+            scores[start:start + len(block)] = block @ q
+        return scores
+
+    def search(self, query, k, rescore_factor=RESCORE_FACTOR, mask=None):
+        """
+        Top-k (row, cosine similarity) pairs for one query vector.
+
+        Args:
+            query: Full-dimension query embedding
+            k: Results to return
+            rescore_factor: First-pass shortlist size as a multiple of k
+            mask: Optional boolean array over rows restricting the search
+        """
+        n = len(self.ids)
+        if n == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        scores = self._first_pass(np.asarray(query, dtype=np.float32))
+        if mask is not None:
+            scores[~mask] = -np.inf
+        shortlist = min(n, max(k * max(rescore_factor, 1), k))
+        rows = np.argpartition(-scores, shortlist - 1)[:shortlist]
+        rows = rows[np.isfinite(scores[rows])]
+
+        # Rescore the shortlist against the full-precision vectors
+        rows.sort()
+        exact = np.asarray(self.full[rows]) @ _normalize(query)
+        order = np.argsort(-exact, kind="stable")[:k]
+        return rows[order], exact[order]
+
+    def query(self, query_embedding, n_results, mask=None):
+        """Chroma-style query() result for one query embedding."""
+        rows, sims = self.search(query_embedding, n_results, mask=mask)
+        return {
+            "ids": [[self.ids[r] for r in rows]],
+            "metadatas": [[self.metadatas[r] for r in rows]],
+            "distances": [[float(1.0 - s) for s in sims]],
+        }
+
+
+_lock = threading.Lock()
+_loaded = {"key": None, "index": None}
+
+
+def get_index(directory=INDEX_DIR):
+    """Process-wide index, reloaded when a new build is swapped in."""
+    meta_path = Path(directory) / "meta.json"
+    key = (str(directory), meta_path.stat().st_mtime_ns)
+    if _loaded["key"] != key:
+        with _lock:
+            if _loaded["key"] != key:
+                _loaded["index"] = QuantizedIndex(directory)
+                _loaded["key"] = key
+    return _loaded["index"]
+
+
+if __name__ == "__main__":
+    # Build the compact index of the active version from its Chroma
+    # collection (no re-embedding)
+    import index_versions
+    from data_ingestion import get_collection
+
+    build_from_chroma(get_collection(), index_versions.vector_index_dir())
@@ -0,0 +1,106 @@
+"""
+Startup warm-up and readiness tracking.
+
+Heavy clients (the vector index, Nomic, Ollama, the SQL pool) are created lazily, so
+the API boots without them. The FastAPI lifespan calls start_warm_up() to
+initialize them ahead of the first request - in a background thread by
+default (BENCHMATCH_WARMUP=background), inline before serving
+(BENCHMATCH_WARMUP=blocking) or not at all (BENCHMATCH_WARMUP=off).
+GET /ready reports which subsystems are warm.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import text
+
+import index_versions
+import vector_index
+from bench_status_index import get_bench_index
+from data_ingestion import get_collection, get_embedder, get_llm, get_engine
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODE = os.getenv("BENCHMATCH_WARMUP", "background")
+
+
+def _warm_vector_store():
+    """Load the index /search queries: the quantized index or the Chroma collection."""
+    if vector_index.VECTOR_INDEX_MODE == "quantized":
+        # Quantized ingest creates no Chroma collection; chromadb may not be installed
+        vector_index.get_index(index_versions.vector_index_dir())
+    else:
+        get_collection()
+
+
+def _warm_database():
+    with get_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+# name -> (initializer, required for readiness)
+SUBSYSTEMS = {
+    "vector_store": (_warm_vector_store, True),
+    "embedder": (get_embedder, True),
+    "database": (_warm_database, True),
+    # Falls back to the CSV statuses when SQL is unreachable
+    "bench_status": (get_bench_index, False),
+    # /search falls back to a template summary without the LLM
+    "llm": (get_llm, False),
+}
+
+_lock = threading.Lock()
+_status = {name: {"state": "cold"} for name in SUBSYSTEMS}
+
+
+def warm_subsystem(name):
+    """Initialize one subsystem and record its outcome."""
+    initializer, _ = SUBSYSTEMS[name]
+    with _lock:
+        _status[name] = {"state": "warming"}
+    start = time.perf_counter()
+    try:
+        initializer()
+        state = {"state": "warm"}
+    except Exception as e:
+        logger.warning(f"Warm-up of {name} failed: {e}")
+        state = {"state": "failed", "error": str(e)}
+    state["seconds"] = round(time.perf_counter() - start, 3)
+    with _lock:
+        _status[name] = state
+
+
+def warm_up():
+    """Initialize every subsystem in turn."""
+    for name in SUBSYSTEMS:
+        warm_subsystem(name)
+    logger.info(f"✓ Warm-up finished: { {n: s['state'] for n, s in status().items()} }")
+
+
+def start_warm_up(mode=WARMUP_MODE):
+    """Run warm-up according to BENCHMATCH_WARMUP."""
+    if mode == "off":
+        return None
+    if mode == "blocking":
+        warm_up()
+        return None
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def status():
+    with _lock:
+        return {name: dict(state) for name, state in _status.items()}
+
+
+def is_ready():
+    """True when every required subsystem is warm."""
+    current = status()
+    return all(
+        current[name]["state"] == "warm"
+        for name, (_, required) in SUBSYSTEMS.items()
+        if required
+    )
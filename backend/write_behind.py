@@ -0,0 +1,266 @@
+"""
+Write-behind persistence for shortlists and match history.
+
+When enabled (BENCHMATCH_WRITE_BEHIND=1), /search returns as soon as results
+are computed and hands the Azure SQL writes to a durable local journal (SQLite
+in WAL mode). A background writer drains the journal to SQL in batches, retries
+failures with exponential backoff and replays anything left over on restart,
+so an accepted shortlist is never lost.
+
+Entries are deleted from the journal only after their SQL transaction commits.
+Writers check whether an entry's primary key already exists, so an entry
+replayed after a crash between commit and delete is skipped, not duplicated.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from data_ingestion import get_engine
+from response_cache import invalidate_requirement
+from shortlist_store import (
+    ENGINE_VERSION,
+    INSERT_MATCH_HISTORY,
+    shortlist_exists,
+    write_shortlist,
+)
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+WRITE_BEHIND_ENABLED = os.getenv("BENCHMATCH_WRITE_BEHIND", "0") == "1"
+JOURNAL_PATH = Path(os.getenv("BENCHMATCH_WRITE_BEHIND_PATH", "storage/write_behind.sqlite3"))
+BATCH_SIZE = int(os.getenv("BENCHMATCH_WRITE_BEHIND_BATCH", "50"))
+FLUSH_INTERVAL = float(os.getenv("BENCHMATCH_WRITE_BEHIND_INTERVAL", "0.5"))
+MAX_ATTEMPTS = int(os.getenv("BENCHMATCH_WRITE_BEHIND_MAX_ATTEMPTS", "10"))
+MAX_BACKOFF = 60.0
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS journal (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL DEFAULT 0,
+        last_error TEXT,
+        dead INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL
+    )
+"""
+
+
+# ---------------------------
+# SQL WRITERS (one per journal kind)
+# ---------------------------
+def _write_shortlist(conn, payload):
+    if shortlist_exists(conn, payload["shortlist_id"]):
+        return
+    write_shortlist(
+        conn,
+        payload["requirement_id"],
+        payload["shortlist_id"],
+        payload["items"],
+        payload.get("update_status", True),
+        # Entries journaled before a deploy keep the version they were ranked with
+        payload.get("engine_version", ENGINE_VERSION),
+    )
+
+
+def _write_match_history(conn, payload):
+    exists = conn.execute(
+        text("SELECT 1 FROM bench.match_history WHERE match_run_id = :match_id"),
+        {"match_id": payload["match_id"]},
+    ).first()
+    if not exists:
+        conn.execute(text(INSERT_MATCH_HISTORY), {"engine_version": ENGINE_VERSION, **payload})
+
+
+def _invalidate(payload):
+    """Drop cached reads for the requirement a flushed entry belongs to."""
+    requirement_id = payload.get("requirement_id") or payload.get("req_id")
+    if requirement_id:
+        invalidate_requirement(requirement_id)
+
+
+WRITERS = {
+    "shortlist": _write_shortlist,
+    "match_history": _write_match_history,
+}
+
+
+# ---------------------------
+# JOURNAL
+# ---------------------------
+class WriteBehindQueue:
+    """Durable SQLite journal drained to Azure SQL by a background thread."""
+
+    def __init__(self, path=JOURNAL_PATH, batch_size=BATCH_SIZE):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def enqueue(self, kind, payload):
+        """Durably record a pending write. Returns once it is on disk."""
+        if kind not in WRITERS:
+            raise ValueError(f"Unknown write-behind kind: {kind}")
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO journal (kind, payload, created_at) VALUES (?, ?, ?)",
+                (kind, json.dumps(payload), time.time()),
+            )
+            self._db.commit()
+        self._wake.set()
+
+    def depth(self):
+        """Number of pending (not dead-lettered) entries."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM journal WHERE dead = 0"
+            ).fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            pending, dead = self._db.execute(
+                "SELECT COALESCE(SUM(dead = 0), 0), COALESCE(SUM(dead = 1), 0) FROM journal"
+            ).fetchone()
+        return {
+            "enabled": True,
+            "pending": pending,
+            "dead_lettered": dead,
+            "running": bool(self._thread and self._thread.is_alive()),
+        }
+
+    def _due_batch(self):
+        with self._lock:
+            return self._db.execute(
+                """
+                SELECT id, kind, payload, attempts FROM journal
+                WHERE dead = 0 AND next_attempt_at <= ?
+                ORDER BY id LIMIT ?
+                """,
+                (time.time(), self.batch_size),
+            ).fetchall()
+
+    def _delete(self, ids):
+        with self._lock:
+            self._db.executemany("DELETE FROM journal WHERE id = ?", [(i,) for i in ids])
+            self._db.commit()
+
+    def _record_failure(self, entry_id, attempts, error):
+        attempts += 1
+        dead = 1 if attempts >= MAX_ATTEMPTS else 0
+        delay = min(2 ** attempts, MAX_BACKOFF)
+        with self._lock:
+            self._db.execute(
+                """
+                UPDATE journal
+                SET attempts = ?, next_attempt_at = ?, last_error = ?, dead = ?
+                WHERE id = ?
+                """,
+                (attempts, time.time() + delay, str(error)[:1000], dead, entry_id),
+            )
+            self._db.commit()
+        if dead:
+            logger.error(f"Write-behind entry {entry_id} dead-lettered after {attempts} attempts: {error}")
+
+    def drain_once(self):
+        """
+        Write one batch to SQL. The whole batch goes in one transaction; if
+        that fails, entries are retried one by one so a single bad entry
+        doesn't block the rest.
+
+        Returns:
+            Number of entries written
+        """
+        batch = self._due_batch()
+        if not batch:
+            return 0
+
+        engine = get_engine()
+        try:
+            payloads = [json.loads(entry[2]) for entry in batch]
+            with engine.begin() as conn:
+                for (_, kind, _, _), payload in zip(batch, payloads):
+                    WRITERS[kind](conn, payload)
+            self._delete([entry[0] for entry in batch])
+            for payload in payloads:
+                _invalidate(payload)
+            return len(batch)
+        except Exception as e:
+            logger.warning(f"Write-behind batch of {len(batch)} failed, retrying individually: {e}")
+
+        written = 0
+        for entry_id, kind, payload, attempts in batch:
+            try:
+                payload = json.loads(payload)
+                with engine.begin() as conn:
+                    WRITERS[kind](conn, payload)
+                self._delete([entry_id])
+                _invalidate(payload)
+                written += 1
+            except Exception as e:
+                self._record_failure(entry_id, attempts, e)
+        return written
+
+    def _run(self):
+        logger.info(f"🔹 Write-behind writer started ({self.depth()} pending in {self.path})")
+        while not self._stop.is_set():
+            try:
+                written = self.drain_once()
+            except Exception as e:
+                logger.error(f"Write-behind writer error: {e}")
+                written = 0
+            if written:
+                logger.info(f"✓ Write-behind flushed {written} entries")
+                continue
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+
+    def start(self):
+        """Start the background writer; pending entries are replayed first."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10.0):
+        """Stop the writer after a final best-effort flush."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        try:
+            while self.drain_once():
+                pass
+        except Exception as e:
+            logger.warning(f"Write-behind final flush failed, entries kept for replay: {e}")
+
+
+_queue = None
+
+
+def get_queue():
+    """Get or create the process-wide write-behind queue."""
+    global _queue
+    if _queue is None:
+        _queue = WriteBehindQueue()
+    return _queue